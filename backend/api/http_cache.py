@@ -0,0 +1,90 @@
+"""
+HTTP validators and caching headers.
+
+Reference data (the text dictionary, loan-type defaults, the contact
+link) only changes with the model bundle or the configuration, so a
+`StaticResource` renders it once per version and serves the bytes with
+a strong ETag and `Cache-Control: public, max-age=...`. A request whose
+`If-None-Match` matches gets a 304 straight away, without the service
+being called. Analytics routes build their ETags from the digest that
+`memoized_analytics_bundle` keeps next to each bundle.
+
+Compressed responses carry the weak form of the ETag (see
+`CompressionMiddleware`); `If-None-Match` uses weak comparison, so both
+forms revalidate.
+"""
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from fastapi import Response
+
+from config.settings import settings
+from services.metrics import ETAG_RESPONSES
+
+
+def strong_etag(*parts: str | bytes) -> str:
+    """A quoted ETag hashed from `parts`."""
+    encoded = b"\0".join(part if isinstance(part, bytes) else part.encode() for part in parts)
+    digest = hashlib.blake2b(encoded, digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of `etag` against an `If-None-Match` list (or `*`)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def not_modified(
+    resource: str, if_none_match: str | None, etag: str, headers: Mapping[str, str]
+) -> Response | None:
+    """
+    A 304 carrying `headers` if `if_none_match` matches `etag`, else None.
+    Counted per `resource` either way, for the 304 rate on /metrics.
+    """
+    if etag_matches(if_none_match, etag):
+        ETAG_RESPONSES.inc(resource, "not_modified")
+        return Response(status_code=304, headers=dict(headers))
+    ETAG_RESPONSES.inc(resource, "full")
+    return None
+
+
+def public_cache_control() -> str:
+    return f"public, max-age={settings.static_cache_max_age_seconds}"
+
+
+class StaticResource:
+    """
+    A JSON body that only changes with a version key (the model bundle
+    version, say): built and serialized once per key, then served from
+    the stored bytes.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._rendered: tuple[str, bytes, str] | None = None  # (key, body, etag)
+
+    def respond(self, if_none_match: str | None, build: Callable[[], Any], key: str = "") -> Response:
+        """The body `build()` returns for `key` (called only on a new key), or a 304."""
+        rendered = self._rendered
+        if rendered is None or rendered[0] != key:
+            with self._lock:
+                rendered = self._rendered
+                if rendered is None or rendered[0] != key:
+                    body = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode()
+                    rendered = self._rendered = (key, body, strong_etag(body))
+        _, body, etag = rendered
+        headers = {"ETag": etag, "Cache-Control": public_cache_control()}
+        return not_modified(self.name, if_none_match, etag, headers) or Response(
+            body, media_type="application/json", headers=headers
+        )
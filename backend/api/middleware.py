@@ -0,0 +1,182 @@
+"""ASGI middleware shared by the whole app."""
+import time
+import zlib
+from functools import cache
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.negotiation import parse_quality_list
+from config.settings import settings
+from services.metrics import COMPRESSION_INPUT_BYTES, COMPRESSION_OUTPUT_BYTES, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """
+    Records every HTTP request's status and latency, labelled by the route
+    template it matched (`/api/v1/predict`, not the raw path) so label
+    cardinality stays bounded; unmatched paths share one label.
+
+    Plain ASGI rather than `BaseHTTPMiddleware`, which adds a task and a
+    memory stream per request and would buffer streamed responses. The
+    timer stops when the last body chunk has been sent, so streamed ZIPs
+    and CSVs are timed end to end.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, route)
+
+
+@cache
+def _brotli():
+    try:
+        import brotli  # optional dependency, see requirements-optional.txt
+    except ImportError:
+        return None
+    return brotli
+
+
+_COMPRESSIBLE_TYPES = {"application/json", "application/x-ndjson", "application/msgpack", "application/x-msgpack"}
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in _COMPRESSIBLE_TYPES
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._brotli = _brotli().Compressor(quality=quality)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with brotli or gzip, whichever the client's
+    `Accept-Encoding` prefers (brotli on a tie, and only when the optional
+    package is installed).
+
+    Only text, JSON, NDJSON and MessagePack bodies are compressed; PDFs
+    and ZIPs are already compressed. A single-message body shorter than
+    `compression_min_bytes` is sent as is. Streamed bodies (CSV scoring)
+    are compressed chunk by chunk, each flushed, so the client can decode
+    every chunk as it arrives. A strong ETag on a compressed response is
+    made weak. Plain ASGI, like `MetricsMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.minimum_size = settings.compression_min_bytes
+        self.encoders = {"gzip": lambda: _GzipEncoder(settings.compression_gzip_level)}
+        if _brotli() is not None:
+            # Listed first, so it wins when the client rates both equally.
+            self.encoders = {"br": lambda: _BrotliEncoder(settings.compression_brotli_quality), **self.encoders}
+
+    def _choose_encoding(self, accept_encoding: str | None) -> str | None:
+        qualities = parse_quality_list(accept_encoding)
+        best, best_q = None, 0.0
+        for encoding in self.encoders:
+            q = qualities.get(encoding, qualities.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body, final = message.get("body", b""), not message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                status = start["status"]
+                if (
+                    status < 200
+                    or status in (204, 304)
+                    or "content-encoding" in headers
+                    or not _compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                else:
+                    headers.add_vary_header("Accept-Encoding")
+                    if final and len(body) < self.minimum_size:
+                        passthrough = True
+                    else:
+                        encoder = self.encoders[encoding]()
+                        headers["Content-Encoding"] = encoding
+                        # The bytes differ from the identity body's, so its strong ETag no longer applies.
+                        etag = headers.get("etag")
+                        if etag is not None and not etag.startswith("W/"):
+                            headers["ETag"] = f"W/{etag}"
+                        if "content-length" in headers:
+                            del headers["content-length"]
+                if passthrough:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+
+            data = encoder.encode(body, final)
+            COMPRESSION_INPUT_BYTES.inc(encoding, amount=len(body))
+            COMPRESSION_OUTPUT_BYTES.inc(encoding, amount=len(data))
+            if start is not None:
+                if final:
+                    MutableHeaders(raw=start["headers"])["Content-Length"] = str(len(data))
+                await send(start)
+                start = None
+            await send({"type": "http.response.body", "body": data, "more_body": not final})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,117 @@
+"""
+Content negotiation for routes that offer the compact layout.
+
+`response_format` reads the request's `Accept` header and picks one of:
+
+    application/json                    the default, full layout
+    application/vnd.slrs.compact+json   compact layout as JSON
+    application/msgpack                 compact layout as MessagePack
+                                        (also `application/x-msgpack`)
+
+The compact layout (services/compact_service.py) sends static text by ID;
+clients resolve IDs with `GET /dictionary`. Anything else in `Accept`,
+or no header at all, gets the default JSON as before. MessagePack needs
+the optional `msgpack` package; without it, a client that accepts
+nothing but MessagePack gets a 406.
+"""
+import json
+from collections.abc import Mapping
+from enum import Enum
+from functools import cache
+from typing import Any
+
+from fastapi import Header, HTTPException, Response
+
+COMPACT_JSON_MEDIA_TYPE = "application/vnd.slrs.compact+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class ResponseFormat(str, Enum):
+    JSON = "json"
+    COMPACT = "compact"
+    MSGPACK = "msgpack"
+
+
+_MEDIA_TYPES = {
+    ResponseFormat.JSON: ("application/json",),
+    ResponseFormat.COMPACT: (COMPACT_JSON_MEDIA_TYPE,),
+    ResponseFormat.MSGPACK: (MSGPACK_MEDIA_TYPE, "application/x-msgpack"),
+}
+
+
+def parse_quality_list(header: str | None) -> dict[str, float]:
+    """
+    `Accept`-style header -> {lower-cased value: q}, e.g. "gzip, br;q=0.5"
+    -> {"gzip": 1.0, "br": 0.5}. Parameters other than q are ignored; a
+    malformed q counts as 0. A value listed twice keeps its highest q.
+    """
+    qualities: dict[str, float] = {}
+    for part in (header or "").split(","):
+        value, *params = part.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = min(max(float(raw), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        qualities[value] = max(q, qualities.get(value, 0.0))
+    return qualities
+
+
+@cache
+def _msgpack():
+    try:
+        import msgpack  # optional dependency, see requirements-optional.txt
+    except ImportError:
+        return None
+    return msgpack
+
+
+def negotiate_format(accept: str | None) -> ResponseFormat:
+    """
+    The format `accept` prefers. Each format's q comes from its most
+    specific match (exact type, then `application/*`, then `*/*`); on
+    equal q an exact match beats a wildcard, then JSON comes first.
+    """
+    if not accept:
+        return ResponseFormat.JSON
+    qualities = parse_quality_list(accept)
+    keys = {}
+    for fmt, media_types in _MEDIA_TYPES.items():
+        exact = [qualities[t] for t in media_types if t in qualities]
+        if exact:
+            keys[fmt] = (max(exact), 2)
+        elif "application/*" in qualities:
+            keys[fmt] = (qualities["application/*"], 1)
+        elif "*/*" in qualities:
+            keys[fmt] = (qualities["*/*"], 0)
+    acceptable = [fmt for fmt, (q, _) in keys.items() if q > 0]
+    if _msgpack() is None and ResponseFormat.MSGPACK in acceptable:
+        acceptable.remove(ResponseFormat.MSGPACK)
+        if not acceptable and keys[ResponseFormat.MSGPACK][1] == 2:
+            raise HTTPException(status_code=406, detail="MessagePack responses aren't available on this server")
+    if not acceptable:
+        # Nothing we serve is acceptable: answer in JSON anyway, as before.
+        return ResponseFormat.JSON
+    # max() keeps the first of equal keys, and `_MEDIA_TYPES` lists JSON first.
+    return max(acceptable, key=keys.__getitem__)
+
+
+def response_format(response: Response, accept: str | None = Header(None)) -> ResponseFormat:
+    """Route dependency: the negotiated format. Marks the response as varying by `Accept`."""
+    response.headers["Vary"] = "Accept"
+    return negotiate_format(accept)
+
+
+def render(content: Any, fmt: ResponseFormat, headers: Mapping[str, str] | None = None) -> Response:
+    """Serialize `content` (plain dicts/lists/scalars) in `fmt`."""
+    if fmt is ResponseFormat.MSGPACK:
+        body = _msgpack().packb(content, use_bin_type=True)
+    else:
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    return Response(body, media_type=_MEDIA_TYPES[fmt][0], headers={**(headers or {}), "Vary": "Accept"})
@@ -0,0 +1,51 @@
+"""
+Model-administration routes: inspect and hot-reload the active model bundle.
+
+Guarded by `settings.admin_token` (sent as `X-Admin-Token`); with no token
+configured these routes answer 404, as if they didn't exist.
+"""
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from api.schemas.admin import ModelReloadRequest, ModelReloadResponse, ModelStatus
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from services.model_lifecycle import ModelReloadError, reload_ml_artifacts
+
+
+def require_admin_token(x_admin_token: str | None = Header(None)) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/model", response_model=ModelStatus)
+def model_status() -> ModelStatus:
+    """The version of the model bundle currently serving requests."""
+    return ModelStatus(model_version=get_ml_artifacts().version)
+
+
+@router.post("/model/reload", response_model=ModelReloadResponse)
+async def reload_model(payload: ModelReloadRequest | None = None) -> ModelReloadResponse:
+    """
+    Load a model bundle, warm it up with synthetic predictions, and swap it
+    in without a restart. Requests already in flight finish on the old
+    version. A bundle that fails to load or warm up is rejected with 409
+    and the current one keeps serving.
+    """
+    version = payload.version if payload is not None else None
+    try:
+        active, previous = await run_in_threadpool(reload_ml_artifacts, version)
+    except ModelReloadError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return ModelReloadResponse(
+        model_version=active.version,
+        previous_version=previous.version if previous is not None else None,
+        reloaded=previous is not None,
+    )
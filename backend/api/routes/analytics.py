@@ -1,21 +1,122 @@
-"""Analytics route — returns structured chart-ready JSON, no rendering."""
-from fastapi import APIRouter
+"""Analytics routes — return structured chart-ready JSON, no rendering."""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
-from api.schemas.analytics import AnalyticsRequest
-from services.analytics_service import build_analytics_bundle
+from api.http_cache import not_modified, strong_etag
+from api.negotiation import ResponseFormat, render, response_format
+from api.schemas.analytics import AmortizationRequest, AnalyticsRequest, PortfolioAnalyticsRequest
+from models.loader import MLArtifacts, get_ml_artifacts
+from services import compact_service, scored_borrower_service
+from services.amortization_service import build_amortization_schedule
+from services.analytics_service import build_portfolio_analytics, memoized_analytics_bundle
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-@router.post("")
-def get_analytics(payload: AnalyticsRequest) -> dict:
-    """Build every chart/insight the dashboard needs from a prior prediction's data."""
-    return build_analytics_bundle(
-        emi_to_income_ratio=payload.emi_to_income_ratio,
-        collateral_coverage=payload.collateral_coverage,
-        loan_tenure=payload.loan_tenure,
-        missed_payments=payload.missed_payments,
-        loan_amount=payload.loan_amount,
-        collateral_value=payload.collateral_value,
+def _bundle_response(
+    inputs: dict,
+    fmt: ResponseFormat,
+    artifacts: MLArtifacts,
+    response: Response,
+    headers: dict[str, str],
+    revalidate: bool = False,
+    if_none_match: str | None = None,
+) -> dict | Response:
+    """
+    The (memoized) bundle for `inputs` in `fmt`, with an ETag that differs
+    per format. With `revalidate`, a matching `if_none_match` gets a 304.
+    """
+    bundle, digest = memoized_analytics_bundle(**inputs)
+    version = None if fmt is ResponseFormat.JSON else compact_service.text_dictionary(artifacts)["version"]
+    etag = strong_etag(digest) if version is None else strong_etag(digest, fmt.value, version)
+    headers = {**headers, "ETag": etag, "Vary": "Accept"}
+    if revalidate and (cached := not_modified("analytics", if_none_match, etag, headers)):
+        return cached
+    if version is None:
+        response.headers.update(headers)
+        return bundle
+    return render(compact_service.compact_analytics(bundle, version), fmt, headers=headers)
+
+
+@router.post("", response_model=dict)
+def get_analytics(
+    payload: AnalyticsRequest,
+    response: Response,
+    fmt: ResponseFormat = Depends(response_format),
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> dict | Response:
+    """
+    Build every chart/insight the dashboard needs from a prior prediction's
+    data. Bundles are memoized by their inputs; the ETag is informational
+    here (a POST can't be answered with a 304).
+    """
+    return _bundle_response(payload.model_dump(), fmt, artifacts, response, headers={})
+
+
+@router.post("/portfolio")
+def get_portfolio_analytics(payload: PortfolioAnalyticsRequest) -> dict:
+    """Build the portfolio dashboard's charts from many already-scored borrowers."""
+    return build_portfolio_analytics(
         risk_score=payload.risk_score,
+        days_past_due=payload.days_past_due,
+        outstanding_loan=payload.outstanding_loan,
+        segment_name=payload.segment_name,
+        histogram_bins=payload.histogram_bins,
+    )
+
+
+@router.post("/amortization")
+def get_amortization_schedule(payload: AmortizationRequest) -> dict:
+    """Month-by-month EMI schedule: each payment's principal and interest, and the balance after it."""
+    return build_amortization_schedule(payload.loan_amount, payload.interest_rate, payload.loan_tenure)
+
+
+@router.get("/borrowers")
+def list_scored_borrowers(
+    risk_category: str | None = None,
+    segment_name: str | None = None,
+    min_days_past_due: int | None = Query(None, ge=0),
+    since: float | None = Query(None, description="Unix timestamp; only borrowers scored at or after it."),
+    limit: int = Query(100, ge=1, le=1_000),
+) -> list[dict]:
+    """Stored scoring results matching the filters, newest first (summary columns only)."""
+    return scored_borrower_service.find_borrowers(
+        risk_category=risk_category,
+        segment_name=segment_name,
+        min_days_past_due=min_days_past_due,
+        since=since,
+        limit=limit,
     )
+
+
+@router.get("/{borrower_id}", response_model=dict)
+def get_borrower_analytics(
+    borrower_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    fmt: ResponseFormat = Depends(response_format),
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> dict | Response:
+    """
+    The dashboard for a borrower scored earlier, loaded by ID instead of
+    sent back. Revalidate with `If-None-Match`: a matching ETag gets a 304.
+    """
+    inputs = scored_borrower_service.analytics_inputs(scored_borrower_service.load_result(borrower_id))
+    return _bundle_response(
+        inputs,
+        fmt,
+        artifacts,
+        response,
+        headers={"Cache-Control": "private, no-cache"},
+        revalidate=True,
+        if_none_match=if_none_match,
+    )
+
+
+@router.get("/{borrower_id}/amortization")
+def get_borrower_amortization(borrower_id: str) -> dict:
+    """The EMI schedule for a borrower scored earlier, on the terms they were scored with."""
+    inputs = scored_borrower_service.report_inputs(scored_borrower_service.load_result(borrower_id))
+    schedule = build_amortization_schedule(inputs["loan_amount"], inputs["interest_rate"], inputs["loan_tenure"])
+    if schedule is None:
+        raise HTTPException(status_code=422, detail="No EMI schedule: the loan's interest rate is zero")
+    return schedule
@@ -1,12 +1,15 @@
 """Contact route — returns the WhatsApp deep link for the frontend's contact button."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Response
 
+from api.http_cache import StaticResource
 from services.contact_service import get_whatsapp_link
 
 router = APIRouter(prefix="/contact", tags=["contact"])
 
+_whatsapp_link = StaticResource("whatsapp_link")
+
 
 @router.get("/whatsapp-link")
-def whatsapp_link() -> dict:
-    """Return the configured WhatsApp contact link."""
-    return {"url": get_whatsapp_link()}
+def whatsapp_link(if_none_match: str | None = Header(None)) -> Response:
+    """Return the configured WhatsApp contact link (cacheable, with an ETag)."""
+    return _whatsapp_link.respond(if_none_match, lambda: {"url": get_whatsapp_link()})
@@ -0,0 +1,24 @@
+"""Dictionary route — the text that compact responses refer to by ID."""
+from fastapi import APIRouter, Depends, Header, Response
+
+from api.http_cache import StaticResource
+from models.loader import MLArtifacts, get_ml_artifacts
+from services.compact_service import text_dictionary
+
+router = APIRouter(prefix="/dictionary", tags=["dictionary"])
+
+_dictionary = StaticResource("dictionary")
+
+
+@router.get("")
+def get_text_dictionary(
+    if_none_match: str | None = Header(None),
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> Response:
+    """
+    Strategy, segment, SHAP feature and collateral insight text by ID, for
+    clients of the compact layout. Fetch it once and again only when a
+    compact response's `dictionary_version` differs from its `version`.
+    Cacheable, with an ETag for revalidation.
+    """
+    return _dictionary.respond(if_none_match, lambda: text_dictionary(artifacts), key=artifacts.version)
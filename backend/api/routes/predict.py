@@ -5,77 +5,218 @@ Per architecture rules: this route only receives the request, delegates to
 services, and shapes the response. No calculation, model call, or business
 rule lives here.
 """
-from fastapi import APIRouter, Depends
+from typing import Literal
 
-from api.schemas.borrower import BorrowerInput, PredictionResult
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from api.negotiation import ResponseFormat, render, response_format
+from api.schemas.borrower import (
+    BatchPredictionItem,
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+    BatchRowError,
+    BorrowerInput,
+    PredictionResult,
+)
+from api.schemas.scenario import ScenarioRequest, ScenarioResponse
+from api.streaming import DuplexStreamingResponse
+from config.settings import settings
 from models.loader import MLArtifacts, get_ml_artifacts
-from services import feature_engineering, prediction_service, segmentation_service, shap_service
+from services import compact_service, csv_scoring_service, metrics, predict_batcher, scored_borrower_service
+from services.prediction_cache import cache_key, get_prediction_cache
+from services.worker_pool import get_worker_pool, score_borrowers_job, score_scenarios_job
 from utils.borrower_id import generate_borrower_id
 
 router = APIRouter(prefix="/predict", tags=["prediction"])
 
 
+def _borrower_id(payload: BorrowerInput) -> str:
+    return generate_borrower_id(payload.loan_type.value, payload.first_name, payload.last_name)
+
+
+def _batch_borrower_ids(payloads: list[BorrowerInput]) -> list[str]:
+    """One ID per borrower, regenerating any repeat: the result store keeps one result per ID."""
+    ids: list[str] = []
+    seen: set[str] = set()
+    for payload in payloads:
+        borrower_id = _borrower_id(payload)
+        while borrower_id in seen:
+            borrower_id = _borrower_id(payload)
+        seen.add(borrower_id)
+        ids.append(borrower_id)
+    return ids
+
+
+def _cache_directives(cache_control: str | None) -> set[str]:
+    return {d.strip().lower() for d in (cache_control or "").split(",") if d.strip()}
+
+
 @router.post("", response_model=PredictionResult)
-def predict_risk(payload: BorrowerInput, artifacts: MLArtifacts = Depends(get_ml_artifacts)) -> PredictionResult:
+async def predict_risk(
+    payload: BorrowerInput,
+    response: Response,
+    cache_control: str | None = Header(None),
+    fmt: ResponseFormat = Depends(response_format),
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> PredictionResult | Response:
     """
     Run the full pipeline for one borrower: feature engineering -> risk
     model -> strategy assignment -> segmentation -> SHAP explainability.
+
+    Concurrent calls are scored together in small batches
+    (services/predict_batcher.py). Results are served from the prediction
+    cache when the same model inputs were scored recently. Send
+    `Cache-Control: no-cache` to force a fresh score, or `no-store` to also
+    keep it out of the cache; the `X-Prediction-Cache` response header
+    says which path was taken. Clients that send a compact type in
+    `Accept` get the compact layout (api/negotiation.py).
+
+    The result is stored under its `borrower_id` (in the background), so
+    `GET /analytics/{borrower_id}` and `GET /report/{borrower_id}` can use it.
+    """
+    borrower = payload.model_dump(mode="json")
+    directives = _cache_directives(cache_control)
+    use_cache = settings.prediction_cache_enabled and "no-store" not in directives
+    cache = get_prediction_cache()
+    key = cache_key(borrower, artifacts.version)
+
+    scored = cache.get(key) if use_cache and "no-cache" not in directives else None
+    if scored is not None:
+        cache_status = "hit"
+    else:
+        scored = await predict_batcher.score_borrower(borrower, artifacts.version)
+        if use_cache:
+            cache.put(key, scored)
+        cache_status = "miss" if use_cache else "bypass"
+    metrics.record_served([scored])
+    borrower_id = _borrower_id(payload)
+    scored_borrower_service.save_results([(borrower_id, borrower, scored)])
+    if fmt is not ResponseFormat.JSON:
+        version = compact_service.text_dictionary(artifacts)["version"]
+        compact = compact_service.compact_prediction(borrower_id, scored, version)
+        return render(compact, fmt, headers={"X-Prediction-Cache": cache_status})
+    response.headers["X-Prediction-Cache"] = cache_status
+    return PredictionResult(borrower_id=borrower_id, input=payload, **scored)
+
+
+@router.get("/cache")
+def prediction_cache_stats() -> dict:
+    """Hit/miss/eviction counters and current size of the prediction cache."""
+    return get_prediction_cache().stats()
+
+
+def _validate_batch_rows(rows: list[dict]) -> tuple[list[BatchPredictionItem], list[tuple[int, BorrowerInput]]]:
+    failed: list[BatchPredictionItem] = []
+    valid: list[tuple[int, BorrowerInput]] = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, BorrowerInput.model_validate(row)))
+        except ValidationError as exc:
+            errors = [BatchRowError(loc=list(e["loc"]), msg=e["msg"], type=e["type"]) for e in exc.errors()]
+            failed.append(BatchPredictionItem(index=index, errors=errors))
+    return failed, valid
+
+
+@router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_risk_batch(
+    payload: BatchPredictionRequest,
+    fmt: ResponseFormat = Depends(response_format),
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> BatchPredictionResponse | Response:
     """
-    engineered = feature_engineering.engineer_features(
-        loan_type=payload.loan_type.value,
-        loan_amount=payload.loan_amount,
-        collateral_value=payload.collateral_value,
-        monthly_income=payload.monthly_income,
-        missed_payments=payload.missed_payments,
-        days_past_due=payload.days_past_due,
-        collection_attempts=payload.collection_attempts,
-        interest_rate=payload.interest_rate,
-        loan_tenure=payload.loan_tenure,
+    Score a whole portfolio in one request.
+
+    Each row is validated independently; valid rows are scored together as
+    one N-row pass through the pipeline, invalid rows carry their
+    validation errors. Results come back in input order, and are stored
+    under their borrower IDs like `/predict` results. The compact layout
+    returns the results as columns.
+    """
+    items, valid = await run_in_threadpool(_validate_batch_rows, payload.borrowers)
+    borrowers = [borrower.model_dump(mode="json") for _, borrower in valid]
+    scored_rows = await get_worker_pool().run(score_borrowers_job, borrowers, artifacts.version)
+    metrics.record_served(scored_rows)
+    borrower_ids = _batch_borrower_ids([borrower for _, borrower in valid])
+    stored = list(zip(borrower_ids, borrowers, scored_rows))
+    scored_borrower_service.save_results(stored)
+
+    if fmt is not ResponseFormat.JSON:
+        compact = compact_service.compact_batch(
+            ((index, borrower_id, scored) for (index, _), (borrower_id, _, scored) in zip(valid, stored)),
+            [item.model_dump(exclude_none=True) for item in items],
+            total=len(valid) + len(items),
+            version=compact_service.text_dictionary(artifacts)["version"],
+        )
+        return render(compact, fmt)
+    for (index, borrower), (borrower_id, _, scored) in zip(valid, stored):
+        result = PredictionResult(borrower_id=borrower_id, input=borrower, **scored)
+        items.append(BatchPredictionItem(index=index, result=result))
+    items.sort(key=lambda item: item.index)
+    return BatchPredictionResponse(
+        total=len(items),
+        succeeded=len(valid),
+        failed=len(items) - len(valid),
+        results=items,
     )
 
-    model_vector = prediction_service.build_model_feature_vector(
-        age=payload.age,
-        monthly_income=payload.monthly_income,
-        num_dependents=payload.num_dependents,
-        engineered=engineered,
-        outstanding_loan=payload.outstanding_loan,
+
+@router.post("/scenarios", response_model=ScenarioResponse)
+async def predict_scenarios(
+    payload: ScenarioRequest,
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> dict:
+    """
+    What-if restructuring: score one borrower under many variants of
+    `interest_rate`, `loan_tenure` and `outstanding_loan` in one pass.
+
+    Returns every variant's EMI, risk score and category (as columns), the
+    risk surface over the grid, and the cheapest variant that brings the
+    borrower out of the high-risk tiers. Scenario results aren't stored or
+    cached: they're hypotheticals, not the borrower's score.
+    """
+    return await get_worker_pool().run(
+        score_scenarios_job,
+        payload.base.model_dump(mode="json"),
+        payload.grid.model_dump() if payload.grid is not None else None,
+        [variant.model_dump() for variant in payload.variants],
+        artifacts.version,
     )
-    risk_score = prediction_service.predict_risk_score(artifacts, model_vector)
-    strategy_info = prediction_service.assign_recovery_strategy(risk_score, engineered.days_past_due)
-
-    segmentation_vector = segmentation_service.build_segmentation_feature_vector(
-    age=payload.age,
-    monthly_income=payload.monthly_income,
-    num_dependents=payload.num_dependents,
-    outstanding_loan=payload.outstanding_loan,
-    engineered=engineered,
+
+
+_CSV_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@router.post("/csv")
+async def predict_csv(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    artifacts: MLArtifacts = Depends(get_ml_artifacts),
+) -> DuplexStreamingResponse:
+    """
+    Score a portfolio CSV (the `Dataset/loan-recovery.csv` schema) sent as
+    the raw request body, streaming back a scored CSV or NDJSON.
+
+    The body is read and scored in fixed-size chunks, so results start
+    flowing before the upload finishes and memory stays bounded. Send the
+    file as-is, e.g. `curl --data-binary @portfolio.csv -H 'Content-Type: text/csv'`.
+    """
+    scored = csv_scoring_service.astream_scored_records(
+        get_worker_pool(), artifacts.version, request.stream(), format, settings.csv_chunk_rows
     )
-    segment = segmentation_service.assign_segment(artifacts, segmentation_vector)
-
-    shap_top_features = shap_service.compute_shap_top_features(artifacts, model_vector)
-
-    borrower_id = generate_borrower_id(payload.loan_type.value, payload.first_name, payload.last_name)
-
-    return PredictionResult(
-        borrower_id=borrower_id,
-        risk_score=risk_score,
-        risk_category=strategy_info["label"],
-        strategy=strategy_info["strategy"],
-        calculated={
-            "monthly_emi": engineered.monthly_emi or 0.0,
-            "days_past_due": engineered.days_past_due,
-            "collection_attempts": engineered.collection_attempts,
-            "emi_to_income_ratio": engineered.emi_to_income_ratio or 0.0,
-            "collateral_coverage": engineered.collateral_coverage or 0.0,
-            "default_severity": engineered.default_severity,
-            "interest_rate_used": engineered.interest_rate_used,
-            "loan_tenure_used": engineered.loan_tenure_used,
-        },
-        segment={
-            "segment_id": segment["segment_id"],
-            "segment_name": segment["segment_name"],
-            "description": segment["description"],
-        },
-        shap_top_features=shap_top_features,
-        input=payload,
+    try:
+        output_header = await anext(scored)
+    except csv_scoring_service.CSVSchemaError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def body():
+        yield output_header
+        async for part in scored:
+            yield part
+
+    return DuplexStreamingResponse(
+        body(),
+        media_type=_CSV_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="scored_portfolio.{format}"'},
     )
@@ -0,0 +1,20 @@
+"""Reference data routes — constants the frontend would otherwise have to mirror."""
+from fastapi import APIRouter, Header, Response
+
+from api.http_cache import StaticResource
+from repository.constants import LOAN_TYPE_DEFAULTS
+
+router = APIRouter(prefix="/reference", tags=["reference"])
+
+_loan_types = StaticResource("loan_types")
+
+
+@router.get("/loan-types")
+def loan_type_defaults(if_none_match: str | None = Header(None)) -> Response:
+    """
+    The interest rate and tenure applied when a borrower's are left blank,
+    per loan type (cacheable, with an ETag).
+    """
+    return _loan_types.respond(
+        if_none_match, lambda: {loan_type: terms._asdict() for loan_type, terms in LOAN_TYPE_DEFAULTS.items()}
+    )
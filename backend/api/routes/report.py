@@ -1,20 +1,72 @@
-"""PDF report route — streams a generated PDF back to the client."""
+"""PDF report routes — stream generated PDFs back to the client."""
 from fastapi import APIRouter
-from fastapi.responses import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 
-from api.schemas.report import ReportRequest
-from services.pdf_service import generate_borrower_report_pdf
+from api.schemas.report import BatchReportRequest, ReportRequest
+from services import report_batch_service, scored_borrower_service
+from services.worker_pool import get_worker_pool, render_report_pdf_job
 
 router = APIRouter(prefix="/report", tags=["report"])
 
 
 @router.post("")
-def download_report(payload: ReportRequest) -> Response:
+async def download_report(payload: ReportRequest) -> Response:
     """Generate the borrower's PDF report and return it as a downloadable file."""
-    pdf_bytes = generate_borrower_report_pdf(payload.model_dump())
+    return await _render_report(payload)
+
+
+@router.get("/{borrower_id}")
+async def download_stored_report(borrower_id: str, amortization: bool = False) -> Response:
+    """
+    The PDF report for a borrower scored earlier, loaded by ID instead of
+    sent back. `?amortization=true` adds the EMI schedule pages.
+    """
+    result = await run_in_threadpool(scored_borrower_service.load_result, borrower_id)
+    inputs = scored_borrower_service.report_inputs(result)
+    return await _render_report(ReportRequest.model_validate({**inputs, "include_amortization": amortization}))
+
+
+async def _render_report(payload: ReportRequest) -> Response:
+    pdf_bytes = await get_worker_pool().run(render_report_pdf_job, payload.model_dump())
     filename = f"borrower_report_{payload.borrower_id}.pdf"
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
+
+
+@router.post("/batch")
+async def download_report_batch(payload: BatchReportRequest) -> Response:
+    """
+    Generate many borrowers' reports in one download.
+
+    `format="zip"` (default) streams a ZIP with one PDF per borrower; the
+    first PDF is sent as soon as it renders. `format="pdf"` returns one
+    merged PDF, which is only sent once every page is built.
+    """
+    pool = get_worker_pool()
+    reports = [report.model_dump() for report in payload.reports]
+
+    if payload.format == "pdf":
+        pdf_bytes = await report_batch_service.render_merged_pdf(pool, reports)
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="borrower_reports.pdf"'},
+        )
+
+    archive = report_batch_service.stream_reports_zip(pool, reports)
+    first_part = await anext(archive)
+
+    async def body():
+        yield first_part
+        async for part in archive:
+            yield part
+
+    return StreamingResponse(
+        body(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="borrower_reports.zip"'},
+    )
@@ -0,0 +1,18 @@
+"""Schemas for the model-administration endpoints."""
+from pydantic import BaseModel
+
+
+class ModelReloadRequest(BaseModel):
+    """Which bundle to activate; omit `version` to use whatever `CURRENT` names."""
+
+    version: str | None = None
+
+
+class ModelStatus(BaseModel):
+    model_version: str
+
+
+class ModelReloadResponse(BaseModel):
+    model_version: str
+    previous_version: str | None
+    reloaded: bool
@@ -1,5 +1,9 @@
-"""Schema for the analytics dashboard request."""
-from pydantic import BaseModel, Field
+"""Schemas for the analytics dashboard requests."""
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_validator
+
+from config.settings import settings
 
 
 class AnalyticsRequest(BaseModel):
@@ -19,3 +23,38 @@ class AnalyticsRequest(BaseModel):
     loan_amount: float = Field(..., ge=0)
     collateral_value: float = Field(..., ge=0)
     risk_score: float = Field(..., ge=0, le=1)
+
+
+class AmortizationRequest(BaseModel):
+    """Loan terms for an EMI amortization schedule (same bounds as `BorrowerInput`)."""
+
+    loan_amount: float = Field(..., gt=0)
+    interest_rate: float = Field(..., gt=0, le=100)
+    loan_tenure: int = Field(..., ge=1, le=360)
+
+
+class PortfolioAnalyticsRequest(BaseModel):
+    """
+    Already-scored borrowers for the portfolio dashboard, as columns: the
+    i-th entry of every list belongs to the same borrower. The values come
+    straight from `/predict` or `/predict/batch` results (`risk_score`,
+    `calculated.days_past_due`, `input.outstanding_loan`,
+    `segment.segment_name`), so nothing is re-scored here.
+    """
+
+    risk_score: list[Annotated[float, Field(ge=0, le=1)]] = Field(
+        ..., min_length=1, max_length=settings.portfolio_max_borrowers
+    )
+    days_past_due: list[Annotated[int, Field(ge=0)]]
+    outstanding_loan: list[Annotated[float, Field(ge=0)]]
+    segment_name: list[str]
+    # Equal-width risk-score bins over 0-100%.
+    histogram_bins: int = Field(20, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def _same_length(self) -> "PortfolioAnalyticsRequest":
+        n = len(self.risk_score)
+        for name in ("days_past_due", "outstanding_loan", "segment_name"):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"{name} has {len(getattr(self, name))} entries, risk_score has {n}")
+        return self
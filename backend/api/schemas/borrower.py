@@ -1,8 +1,11 @@
 """Pydantic schemas for the borrower risk-prediction endpoint."""
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
 
+from config.settings import settings
+
 
 class Gender(str, Enum):
     male = "Male"
@@ -87,6 +90,11 @@ class SegmentInfo(BaseModel):
     segment_id: int
     segment_name: str
     description: str
+    # Distance (in scaled feature units) to the segment's centroid, and how
+    # much further away the next-nearest segment is: a small margin means
+    # the borrower sits near a segment boundary.
+    centroid_distance: float
+    next_segment_margin: float
 
 
 class ShapFeatureImpact(BaseModel):
@@ -105,4 +113,39 @@ class PredictionResult(BaseModel):
     calculated: CalculatedFields
     segment: SegmentInfo
     shap_top_features: list[ShapFeatureImpact]
+    # Version of the model bundle that produced this result.
+    model_version: str
     input: BorrowerInput
+
+
+class BatchPredictionRequest(BaseModel):
+    """
+    A portfolio of borrowers to score in one call.
+
+    Rows are accepted as raw objects and validated one by one against
+    `BorrowerInput`, so a single malformed row is reported in its own slot
+    instead of rejecting the whole batch with a 422.
+    """
+
+    borrowers: list[dict[str, Any]] = Field(..., min_length=1, max_length=settings.batch_max_rows)
+
+
+class BatchRowError(BaseModel):
+    loc: list[str | int]
+    msg: str
+    type: str
+
+
+class BatchPredictionItem(BaseModel):
+    """Outcome for one input row: either `result` or `errors` is set."""
+
+    index: int
+    result: PredictionResult | None = None
+    errors: list[BatchRowError] | None = None
+
+
+class BatchPredictionResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchPredictionItem]
@@ -1,5 +1,9 @@
-"""Schema for the PDF report generation request."""
-from pydantic import BaseModel
+"""Schemas for the PDF report generation requests."""
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from config.settings import settings
 
 
 class ReportRequest(BaseModel):
@@ -37,3 +41,23 @@ class ReportRequest(BaseModel):
     strategy: str
     segment_name: str
     segment_description: str
+    # Add the EMI amortization schedule on the following page(s).
+    include_amortization: bool = False
+
+
+class BatchReportRequest(BaseModel):
+    """
+    Several borrowers' reports in one download: a ZIP with one PDF per
+    borrower (streamed as they render), or a single merged PDF.
+    """
+
+    reports: list[ReportRequest] = Field(min_length=1, max_length=settings.report_batch_max)
+    format: Literal["zip", "pdf"] = "zip"
+
+    @model_validator(mode="after")
+    def _check_merge_size(self) -> "BatchReportRequest":
+        if self.format == "pdf" and len(self.reports) > settings.report_merge_max:
+            raise ValueError(
+                f"a merged PDF is limited to {settings.report_merge_max} reports; use format='zip' for more"
+            )
+        return self
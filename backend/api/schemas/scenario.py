@@ -0,0 +1,101 @@
+"""Schemas for the what-if scenario endpoint."""
+import math
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_validator
+
+from api.schemas.borrower import BorrowerInput
+from config.settings import settings
+
+
+class ScenarioOverrides(BaseModel):
+    """One restructuring offer: the terms it changes. Unset fields keep the base borrower's value."""
+
+    interest_rate: float | None = Field(None, ge=0, le=100)
+    loan_tenure: int | None = Field(None, ge=1, le=360)
+    outstanding_loan: float | None = Field(None, ge=0)
+
+
+class ScenarioGrid(BaseModel):
+    """Values to try per term; every combination becomes a variant. Omitted terms aren't varied."""
+
+    interest_rate: list[Annotated[float, Field(ge=0, le=100)]] | None = Field(None, min_length=1)
+    loan_tenure: list[Annotated[int, Field(ge=1, le=360)]] | None = Field(None, min_length=1)
+    outstanding_loan: list[Annotated[float, Field(ge=0)]] | None = Field(None, min_length=1)
+
+
+class ScenarioRequest(BaseModel):
+    """
+    A borrower and the restructuring offers to score against it. Variants
+    are the `grid` combinations (terms in field order, the first varying
+    slowest) followed by the explicit `variants`, numbered in that order.
+    """
+
+    base: BorrowerInput
+    grid: ScenarioGrid | None = None
+    variants: list[ScenarioOverrides] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _variant_count(self) -> "ScenarioRequest":
+        axes = self.grid.model_dump(exclude_none=True).values() if self.grid is not None else []
+        grid_size = math.prod(len(values) for values in axes) if axes else 0
+        total = grid_size + len(self.variants)
+        if total == 0:
+            raise ValueError("give a grid with at least one term, or at least one variant")
+        if total > settings.scenario_max_variants:
+            raise ValueError(f"{total} variants requested; the limit is {settings.scenario_max_variants}")
+        return self
+
+
+class ScenarioOutcome(BaseModel):
+    """One scored variant (or the unchanged base borrower, with `index` None)."""
+
+    index: int | None
+    interest_rate: float
+    loan_tenure: int
+    outstanding_loan: float
+    monthly_emi: float
+    emi_to_income_ratio: float
+    risk_score: float
+    risk_category: str
+    strategy: str
+    # Concession against the base terms, in INR: principal written off plus
+    # the fall in the EMI schedule's value discounted at the base rate.
+    restructuring_cost: float
+
+
+class ScenarioVariants(BaseModel):
+    """Every variant's result as columns: the i-th entry of each list is variant i."""
+
+    interest_rate: list[float]
+    loan_tenure: list[int]
+    outstanding_loan: list[float]
+    monthly_emi: list[float]
+    emi_to_income_ratio: list[float]
+    risk_score: list[float]
+    risk_category: list[str]
+    restructuring_cost: list[float]
+
+
+class SurfaceAxis(BaseModel):
+    field: str
+    values: list[float]
+
+
+class RiskSurface(BaseModel):
+    """Risk score over the grid: `risk_score` nests one list level per axis, in `axes` order."""
+
+    axes: list[SurfaceAxis]
+    risk_score: list
+
+
+class ScenarioResponse(BaseModel):
+    model_version: str
+    # Variants at or below this risk score are out of the high-risk tiers.
+    high_risk_threshold: float
+    base: ScenarioOutcome
+    variants: ScenarioVariants
+    surface: RiskSurface | None
+    # Lowest `restructuring_cost` variant at or below `high_risk_threshold`
+    # (ties: lower risk, then lower index); None if no variant gets there.
+    cheapest_below_threshold: ScenarioOutcome | None
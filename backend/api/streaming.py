@@ -0,0 +1,21 @@
+"""Response helpers shared by routes that stream their output."""
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    A `StreamingResponse` whose body is produced while the request body is
+    still being read.
+
+    For ASGI servers below spec 2.4 (uvicorn included), Starlette's
+    `StreamingResponse` runs a disconnect listener that consumes `receive()`
+    messages, which would steal request-body chunks from a handler that
+    streams its upload. This variant only sends; a client disconnect still
+    surfaces as `ClientDisconnect` from the body read or as a failed send.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
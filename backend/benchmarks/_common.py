@@ -0,0 +1,151 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run from the backend root (`python -m benchmarks.<name>`) so
+they import the app exactly the way uvicorn does. Borrower payloads are
+built from the real dataset rather than invented, so latency numbers
+reflect the model's actual tree paths.
+"""
+import csv
+import os
+import resource
+import statistics
+import warnings
+from pathlib import Path
+
+DATASET_PATH = Path(__file__).resolve().parent.parent.parent / "Dataset" / "loan-recovery.csv"
+
+# The committed pickles were written by a newer scikit-learn; the warning is
+# irrelevant to timing and would otherwise drown the benchmark output.
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def dataset_borrowers(limit: int | None = None) -> list[dict]:
+    """Dataset rows converted to `BorrowerInput`-shaped JSON payloads."""
+    borrowers = []
+    with open(DATASET_PATH, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            if limit is not None and i >= limit:
+                break
+            borrowers.append(
+                {
+                    "first_name": "Bench",
+                    "last_name": row["Borrower_ID"],
+                    "gender": row["Gender"],
+                    "age": int(row["Age"]),
+                    "monthly_income": float(row["Monthly_Income"]),
+                    "num_dependents": int(row["Num_Dependents"]),
+                    "loan_type": row["Loan_Type"],
+                    "loan_amount": float(row["Loan_Amount"]),
+                    "collateral_value": float(row["Collateral_Value"]),
+                    "outstanding_loan": float(row["Outstanding_Loan_Amount"]),
+                    "missed_payments": int(row["Num_Missed_Payments"]),
+                    "days_past_due": int(row["Days_Past_Due"]),
+                    "collection_attempts": int(row["Collection_Attempts"]),
+                    "interest_rate": float(row["Interest_Rate"]),
+                    "loan_tenure": int(row["Loan_Tenure"]),
+                }
+            )
+    return borrowers
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile; `samples` need not be sorted."""
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize_ms(samples: list[float]) -> dict:
+    """p50/p95/p99/mean of a list of durations in seconds, reported in ms."""
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def rss_mb() -> dict:
+    """This process's resident set size now and at its peak, in MB (Linux)."""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return {
+        "rss_mb": round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def dataset_model_matrix():
+    """The full dataset as the N x 10 model feature matrix the API would score."""
+    from services.feature_engineering import engineer_features_batch
+    from services.prediction_service import build_model_feature_matrix
+    from services.scoring_pipeline import borrower_columns
+
+    columns = borrower_columns(dataset_borrowers())
+    return build_model_feature_matrix(
+        age=columns["age"],
+        monthly_income=columns["monthly_income"],
+        num_dependents=columns["num_dependents"],
+        engineered=engineer_features_batch(columns),
+        outstanding_loan=columns["outstanding_loan"],
+    )
+
+
+def dataset_segmentation_matrix():
+    """The full dataset as the N x 10 raw (unscaled) segmentation feature matrix."""
+    from services.feature_engineering import engineer_features_batch
+    from services.scoring_pipeline import borrower_columns
+    from services.segmentation_service import build_segmentation_feature_matrix
+
+    columns = borrower_columns(dataset_borrowers())
+    return build_segmentation_feature_matrix(
+        age=columns["age"],
+        monthly_income=columns["monthly_income"],
+        num_dependents=columns["num_dependents"],
+        outstanding_loan=columns["outstanding_loan"],
+        engineered=engineer_features_batch(columns),
+    )
+
+
+def report_payload(borrower: dict, scored: dict, borrower_id: str = "BENCH-0001") -> dict:
+    """A `ReportRequest`-shaped dict for one borrower and its scoring result."""
+    calculated = scored["calculated"]
+    return {
+        "borrower_id": borrower_id,
+        "first_name": borrower["first_name"],
+        "last_name": borrower["last_name"],
+        "gender": borrower["gender"],
+        "age": borrower["age"],
+        "loan_type": borrower["loan_type"],
+        "custom_scheme": True,
+        "monthly_income": borrower["monthly_income"],
+        "loan_amount": borrower["loan_amount"],
+        "outstanding_loan": borrower["outstanding_loan"],
+        "loan_tenure": calculated["loan_tenure_used"],
+        "interest_rate": calculated["interest_rate_used"],
+        "collateral_value": borrower["collateral_value"],
+        "missed_payments": borrower["missed_payments"],
+        "days_past_due": calculated["days_past_due"],
+        "collection_attempts": calculated["collection_attempts"],
+        "monthly_emi": calculated["monthly_emi"],
+        "emi_to_income": calculated["emi_to_income_ratio"],
+        "collateral_coverage": calculated["collateral_coverage"],
+        "default_severity": calculated["default_severity"],
+        "risk_score": scored["risk_score"],
+        "risk_category": scored["risk_category"],
+        "strategy": scored["strategy"],
+        "segment_name": scored["segment"]["segment_name"],
+        "segment_description": scored["segment"]["description"],
+    }
+
+
+def dataset_report_payloads(limit: int | None = None) -> list[dict]:
+    """`ReportRequest` payloads for dataset borrowers, scored with the live pipeline."""
+    from models.loader import get_ml_artifacts
+    from services.scoring_pipeline import score_borrowers
+
+    borrowers = dataset_borrowers(limit)
+    scored = score_borrowers(get_ml_artifacts(), borrowers)
+    return [report_payload(b, s, f"BENCH-{i:05d}") for i, (b, s) in enumerate(zip(borrowers, scored))]
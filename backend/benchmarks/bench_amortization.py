@@ -0,0 +1,130 @@
+"""
+EMI and amortization schedules: parity and cost.
+
+Usage (from backend/):
+    python -m benchmarks.bench_amortization --loans 2000
+
+Checks `calculate_emi` (one power per call now, not two) against the
+formula as it was, over random loans and the zero-input guard cases:
+results must be identical, None included. Then it builds `--loans`
+random schedules (rates up to 100%, tenures up to 360 months), plus
+loans at extreme rates where the rounded EMI's error compounds the
+most, and checks that:
+- each row's principal and interest add up to its payment;
+- no payment, principal, interest or balance is ever negative, and the
+  balance never grows;
+- every payment but the last is the EMI, and the last is no more than
+  the balance before it plus its interest;
+- the principal column adds up to the loan amount;
+- the balance ends at zero, and only the last row is zero.
+
+Times `calculate_emi` against the old formula on the loan-type default
+terms, and one schedule on the home-loan terms. Exits non-zero on any
+mismatch.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from benchmarks._common import summarize_ms
+from repository.constants import LOAN_TYPE_DEFAULTS
+from services.amortization_service import build_amortization_schedule
+from services.feature_engineering import calculate_emi
+
+
+def _reference_emi(principal: float, annual_rate: float, tenure_months: int) -> float | None:
+    """`calculate_emi` as it was, computing the power twice."""
+    if not principal or not annual_rate or not tenure_months:
+        return None
+    r = annual_rate / (12 * 100)
+    emi = (principal * r * (1 + r) ** tenure_months) / ((1 + r) ** tenure_months - 1)
+    return round(emi, 2)
+
+
+# Long tenures at high rates: the rounded EMI's error grows by (1 + r)^k.
+_EXTREME_LOANS = [
+    (10_000.0, 40.0, 360),
+    (10_000.0, 100.0, 360),
+    (750_000.0, 24.0, 360),
+    (4_978_322.0, 98.62, 293),
+    (5_000_000.0, 100.0, 1),
+    (1.0, 0.01, 360),
+]
+
+
+def _random_loan(rng: random.Random, max_rate: float = 30) -> tuple[float, float, int]:
+    return float(rng.randrange(10_000, 5_000_000)), round(rng.uniform(0.5, max_rate), 2), rng.randint(1, 360)
+
+
+def _emi_mismatches(rng: random.Random, n: int) -> int:
+    loans = [_random_loan(rng) for _ in range(n)]
+    loans += [(0.0, 12.0, 60), (100_000.0, 0.0, 60), (100_000.0, 12.0, 0)]
+    return sum(calculate_emi(*loan) != _reference_emi(*loan) for loan in loans)
+
+
+def _schedule_mismatches(loan: tuple[float, float, int]) -> list[str]:
+    schedule = build_amortization_schedule(*loan)
+    columns, emi, found = schedule["schedule"], schedule["monthly_emi"], []
+    rows = list(zip(columns["month"], columns["payment"], columns["principal"], columns["interest"]))
+    previous = loan[0]
+    for (month, payment, principal, interest), balance in zip(rows, columns["balance"]):
+        if abs(payment - principal - interest) > 0.005:
+            found.append(f"month {month}: {payment} != {principal} + {interest}")
+        if min(payment, principal, interest, balance) < 0:
+            found.append(f"month {month}: negative value in {payment}, {principal}, {interest}, {balance}")
+        if balance > previous:
+            found.append(f"month {month}: balance grows from {previous} to {balance}")
+        if month < len(rows) and payment != emi:
+            found.append(f"month {month}: payment {payment} isn't the EMI {emi}")
+        if month == len(rows) and payment > round(previous + interest, 2):
+            found.append(f"month {month}: last payment {payment} exceeds {previous} plus interest")
+        previous = balance
+    if round(sum(columns["principal"]), 2) != loan[0]:
+        found.append(f"principal adds up to {sum(columns['principal'])}, not {loan[0]}")
+    if columns["balance"][-1] != 0.0 or 0.0 in columns["balance"][:-1]:
+        found.append("balance doesn't reach zero exactly at the last row")
+    return [f"{loan}: {m}" for m in found]
+
+
+def _time(fn, repeats: int) -> list[float]:
+    samples = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - begin)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=2000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    emi_mismatches = _emi_mismatches(rng, 200_000)
+    loans = [_random_loan(rng, max_rate=100) for _ in range(args.loans)] + _EXTREME_LOANS
+    schedule_mismatches = [m for loan in loans for m in _schedule_mismatches(loan)]
+
+    terms = [(1_000_000.0, t.interest_rate, t.tenure_months) for t in LOAN_TYPE_DEFAULTS.values()]
+    two_powers = lambda: [_reference_emi(*loan) for loan in terms * 250]  # noqa: E731
+    one_power = lambda: [calculate_emi(*loan) for loan in terms * 250]  # noqa: E731
+    home = (5_000_000.0, LOAN_TYPE_DEFAULTS["home"].interest_rate, LOAN_TYPE_DEFAULTS["home"].tenure_months)
+
+    report = {
+        "emi_mismatches": emi_mismatches,
+        "schedule_mismatches": schedule_mismatches[:10],
+        "calculate_emi_x1000": {
+            "two_powers": summarize_ms(_time(two_powers, 200)),
+            "one_power": summarize_ms(_time(one_power, 200)),
+        },
+        f"schedule_{home[2]}_months": summarize_ms(_time(lambda: build_amortization_schedule(*home), 500)),
+    }
+    print(json.dumps(report, indent=2))
+    if emi_mismatches or schedule_mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
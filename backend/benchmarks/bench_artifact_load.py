@@ -0,0 +1,56 @@
+"""
+Artifact loading: legacy pickles versus the versioned model bundle.
+
+Usage (from backend/):
+    python -m benchmarks.bench_artifact_load --repeats 5
+
+Times both loaders (imports already warm, so this is the load itself),
+then scores the whole dataset with each set of artifacts and exits
+non-zero unless risk scores, segments and SHAP drivers are identical.
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+from models.loader import _load_legacy_pickles, load_ml_artifacts
+from services.scoring_pipeline import score_borrowers
+
+
+def _time_loader(loader, repeats: int) -> dict:
+    loader()  # warm imports and the page cache
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader()
+        timings.append(time.perf_counter() - start)
+    return summarize_ms(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {
+        "legacy_pickles": _time_loader(_load_legacy_pickles, args.repeats),
+        "bundle": _time_loader(load_ml_artifacts, args.repeats),
+    }
+
+    borrowers = dataset_borrowers()
+    legacy = score_borrowers(_load_legacy_pickles(), borrowers)
+    bundled = score_borrowers(load_ml_artifacts(), borrowers)
+    results["parity"] = {
+        "rows": len(borrowers),
+        "identical": legacy == bundled,
+        "max_abs_risk_diff": max(abs(a["risk_score"] - b["risk_score"]) for a, b in zip(legacy, bundled)),
+    }
+
+    print(json.dumps(results, indent=2))
+    if not results["parity"]["identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cold start: process start to ready, and the first /predict after it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cold_start --runs 3 --max-ready-ms 1500 --max-first-predict-ms 250
+
+Each run is a fresh interpreter that imports the app, runs its startup
+hook (through Starlette's TestClient), sends one /predict and reads
+GET /health/startup. Reported per run: wall-clock time to ready, the
+app's own phase breakdown, and first-request latency. Exits non-zero if
+the median time to ready or to the first prediction exceeds its threshold,
+so it can gate a deploy (the repo has no test suite to put it in).
+Run it on the deployment hardware for meaningful absolute numbers.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import json, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+import main
+from benchmarks._common import dataset_borrowers
+borrower = dataset_borrowers(1)[0]
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    client.post("/api/v1/predict", json=borrower)
+    first = time.perf_counter()
+    profile = client.get("/health/startup").json()
+print(json.dumps({
+    "import_and_startup_ms": round((ready - start) * 1000, 1),
+    "first_predict_ms": round((first - ready) * 1000, 1),
+    "profile": profile,
+}))
+"""
+
+
+def _run_once(env: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--mode", choices=["fast", "eager"], default="fast")
+    parser.add_argument("--max-ready-ms", type=float, default=1500.0)
+    parser.add_argument("--max-first-predict-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    env = {**os.environ, "STARTUP_MODE": args.mode, "PREDICTION_CACHE_ENABLED": "false"}
+    runs = [_run_once(env) for _ in range(args.runs)]
+    ready_ms = [
+        r["profile"]["process_start_to_ready_ms"] or r["import_and_startup_ms"] for r in runs
+    ]
+    first_ms = [r["first_predict_ms"] for r in runs]
+    summary = {
+        "mode": args.mode,
+        "median_process_start_to_ready_ms": statistics.median(ready_ms),
+        "median_first_predict_ms": statistics.median(first_ms),
+        "thresholds": {"ready_ms": args.max_ready_ms, "first_predict_ms": args.max_first_predict_ms},
+        "runs": runs,
+    }
+    print(json.dumps(summary, indent=2))
+
+    failures = []
+    if summary["median_process_start_to_ready_ms"] > args.max_ready_ms:
+        failures.append("time to ready")
+    if summary["median_first_predict_ms"] > args.max_first_predict_ms:
+        failures.append("first prediction")
+    if failures:
+        print(f"Cold start regressed: {', '.join(failures)} over threshold", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
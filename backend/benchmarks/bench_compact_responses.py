@@ -0,0 +1,155 @@
+"""
+Compact responses and compression: bytes on the wire, latency, and parity.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compact_responses --borrowers 1000 --repeats 10
+
+Sends one `POST /predict/batch` of `--borrowers` dataset rows in every
+combination of `Accept` (JSON, compact JSON, MessagePack) and
+`Accept-Encoding` (identity, gzip, br), and reports the response size
+and latency of each. Then rebuilds the default JSON results from the
+compact ones and `GET /dictionary`: everything but the input echo and
+the (random) borrower ID must match exactly. Formats whose optional
+package isn't installed are skipped. The result store is switched off
+for the run. Exits non-zero on any mismatch.
+"""
+import argparse
+import json
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from api.negotiation import COMPACT_JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from benchmarks._common import dataset_borrowers, summarize_ms
+from config.settings import settings
+
+_SHAP_COLUMNS = {"feature": "shap_feature", "value": "shap_feature_value", "shap_value": "shap_value"}
+_SEGMENT_COLUMNS = ("segment_id", "centroid_distance", "next_segment_margin")
+_COMPACT_COLUMNS = {"index", "borrower_id", "risk_score", "strategy_id", *_SEGMENT_COLUMNS, *_SHAP_COLUMNS.values()}
+
+
+def _available(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _expand(compact: dict, dictionary: dict) -> list[dict]:
+    """The default layout's results (minus `input` and `borrower_id`), rebuilt from a compact batch."""
+    columns = compact["results"]
+    calculated = [name for name in columns if name not in _COMPACT_COLUMNS]
+    shap_fallback = dictionary["shap_feature_fallback"]
+    results = []
+    for i, strategy_id in enumerate(columns["strategy_id"]):
+        segment_name = dictionary["segment_names"][str(columns["segment_id"][i])]
+        shap = []
+        for j, feature in enumerate(columns["shap_feature"][i]):
+            shap_value = columns["shap_value"][i][j]
+            shap.append(
+                {
+                    "feature": feature,
+                    "value": columns["shap_feature_value"][i][j],
+                    "shap_value": shap_value,
+                    "direction": "increased" if shap_value > 0 else "decreased",
+                    "description": dictionary["shap_feature_descriptions"].get(
+                        feature, shap_fallback.replace("{feature}", feature)
+                    ),
+                }
+            )
+        results.append(
+            {
+                "index": columns["index"][i],
+                "risk_score": columns["risk_score"][i],
+                "risk_category": dictionary["strategies"][strategy_id]["label"],
+                "strategy": dictionary["strategies"][strategy_id]["strategy"],
+                "calculated": {name: columns[name][i] for name in calculated},
+                "segment": {
+                    "segment_id": columns["segment_id"][i],
+                    "segment_name": segment_name,
+                    "description": dictionary["segment_descriptions"][segment_name],
+                    "centroid_distance": columns["centroid_distance"][i],
+                    "next_segment_margin": columns["next_segment_margin"][i],
+                },
+                "shap_top_features": shap,
+                "model_version": compact["model_version"],
+            }
+        )
+    return results
+
+
+def _mismatches(full: dict, compact: dict, dictionary: dict) -> list[str]:
+    found = []
+    if compact["dictionary_version"] != dictionary["version"]:
+        found.append(f"dictionary version {compact['dictionary_version']} != {dictionary['version']}")
+    for key in ("total", "succeeded", "failed"):
+        if full[key] != compact[key]:
+            found.append(f"{key}: {full[key]} != {compact[key]}")
+    expected = []
+    for item in full["results"]:
+        if item["result"] is not None:
+            result = {k: v for k, v in item["result"].items() if k not in ("input", "borrower_id")}
+            expected.append({"index": item["index"], **result})
+    for want, got in zip(expected, _expand(compact, dictionary)):
+        if want != got:
+            found.append(f"row {want['index']}: {json.dumps(got)[:200]} != {json.dumps(want)[:200]}")
+    if len(expected) != compact["succeeded"]:
+        found.append(f"{compact['succeeded']} compact results, expected {len(expected)}")
+    errors = [item for item in full["results"] if item["result"] is None]
+    if [{"index": e["index"], "errors": e["errors"]} for e in errors] != compact["errors"]:
+        found.append("failed rows differ")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--borrowers", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.result_store_enabled = False
+    from main import app
+
+    accepts = {"json": "application/json", "compact": COMPACT_JSON_MEDIA_TYPE}
+    if _available("msgpack"):
+        accepts["msgpack"] = MSGPACK_MEDIA_TYPE
+    encodings = ["identity", "gzip"] + (["br"] if _available("brotli") else [])
+    rows = dataset_borrowers(args.borrowers) + [{"first_name": "Invalid", "age": "not a number"}]
+    url = f"{settings.api_v1_prefix}/predict/batch"
+
+    report = {}
+    with TestClient(app) as client:
+        for name, accept in accepts.items():
+            for encoding in encodings:
+                headers = {"Accept": accept, "Accept-Encoding": encoding}
+                times = []
+                for _ in range(args.repeats):
+                    begin = time.perf_counter()
+                    response = client.post(url, json={"borrowers": rows}, headers=headers)
+                    times.append(time.perf_counter() - begin)
+                    response.raise_for_status()
+                wire_bytes = int(response.headers.get("content-length", len(response.content)))
+                report[f"{name}/{encoding}"] = {"bytes": wire_bytes, **summarize_ms(times)}
+
+        full = client.post(url, json={"borrowers": rows}).json()
+        compact = client.post(url, json={"borrowers": rows}, headers={"Accept": COMPACT_JSON_MEDIA_TYPE}).json()
+        dictionary = client.get(f"{settings.api_v1_prefix}/dictionary")
+    mismatches = _mismatches(full, compact, dictionary.json())
+
+    baseline = report["json/identity"]["bytes"]
+    for name, entry in report.items():
+        entry["ratio"] = round(entry["bytes"] / baseline, 4)
+    print(json.dumps(report, indent=2))
+    print(f"dictionary: {len(dictionary.content)} bytes, fetched once per version")
+    print(f"parity: {compact['succeeded']} results, {len(mismatches)} mismatches")
+    for line in mismatches[:10]:
+        print("  " + line)
+    if mismatches:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Streaming CSV scoring: record-splitting parity and throughput.
+
+Usage (from backend/):
+    python -m benchmarks.bench_csv_scoring --rows 20000 --chunk-rows 2000
+
+Record splitting: for a set of awkward inputs (quoted newlines, CRLF
+and lone CR line ends, a UTF-8 BOM, and characters `str.splitlines`
+breaks on but `csv` keeps inside a field: form feed, "\\x1c"-"\\x1e",
+"\\x85", "\\u2028"), the records `iter_record_chunks` and
+`aiter_record_chunks` produce must parse to exactly the rows
+`csv.reader` reads from the whole text. Every input is fed split at
+every character (text) and every byte (bytes), so boundaries land
+inside line breaks and multi-byte characters too.
+
+Empty input: `stream_scored_records` (the CLI) and `POST /predict/csv`
+must both reject it, with `CSVSchemaError` and a 400.
+
+Scoring: the sample dataset, resampled to `--rows`, is scored through
+`stream_scored_records` in `--chunk-rows` chunks and in one chunk; the
+outputs must be identical. Reports rows per second. Exits non-zero on
+any mismatch.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+import time
+
+from benchmarks._common import DATASET_PATH
+from models.loader import get_ml_artifacts
+from services.csv_scoring_service import (
+    CSVSchemaError,
+    aiter_record_chunks,
+    iter_record_chunks,
+    stream_scored_records,
+)
+
+_AWKWARD_INPUTS = [
+    "a,b\x0cc,d\nx,y\u2028z,w\n",
+    "a,b\x1cc\x1dd\x1ee\nf,g\x85h\n",
+    'a,"quoted\nnewline",b\r\nc,"crlf\r\ninside",d\r\n',
+    "lone,cr\rline,ends\rlast,row",
+    '"only\x0cquoted fields","x"\n"y","z"',
+    "\n\nblank,lines\n\n\nbetween\n",
+]
+
+
+def _rows(records: list[str]) -> list[list[str]]:
+    return list(csv.reader(records))
+
+
+def _splitter_mismatches() -> list[str]:
+    found = []
+    for text in _AWKWARD_INPUTS:
+        expected = [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+        for cut in range(len(text) + 1):
+            records = [r for chunk in iter_record_chunks([text[:cut], text[cut:]], 2) for r in chunk]
+            if _rows(records) != expected:
+                found.append(f"text {text!r} cut at {cut}: {_rows(records)}")
+        data = ("\ufeff" + text).encode()
+        for cut in range(len(data) + 1):
+
+            async def parts(cut=cut):
+                yield data[:cut]
+                yield data[cut:]
+
+            async def collect() -> list[str]:
+                return [r async for chunk in aiter_record_chunks(parts(), 2) for r in chunk]
+
+            records = asyncio.run(collect())
+            if _rows(records) != expected:
+                found.append(f"bytes {data!r} cut at {cut}: {_rows(records)}")
+    return found
+
+
+def _empty_input_mismatches() -> list[str]:
+    from fastapi.testclient import TestClient
+
+    from config.settings import settings
+
+    settings.result_store_enabled = False
+    from main import app
+
+    found = []
+    try:
+        list(stream_scored_records(get_ml_artifacts(), [""], "csv", 10))
+        found.append("stream_scored_records accepted an empty input")
+    except CSVSchemaError:
+        pass
+    with TestClient(app) as client:
+        response = client.post(f"{settings.api_v1_prefix}/predict/csv", content=b"")
+    if response.status_code != 400:
+        found.append(f"POST /predict/csv of an empty body: {response.status_code}, expected 400")
+    return found
+
+
+def _portfolio(rows: int) -> list[str]:
+    with open(DATASET_PATH, newline="") as f:
+        lines = f.read().splitlines(keepends=True)
+    header, body = lines[0], lines[1:]
+    return [header] + [body[i % len(body)] for i in range(rows)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--chunk-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    mismatches = _splitter_mismatches()
+    print(f"record splitting: {len(_AWKWARD_INPUTS)} inputs, {len(mismatches)} mismatches")
+    mismatches += _empty_input_mismatches()
+
+    artifacts = get_ml_artifacts()
+    portfolio = _portfolio(args.rows)
+    begin = time.perf_counter()
+    chunked = "".join(stream_scored_records(artifacts, portfolio, "csv", args.chunk_rows))
+    elapsed = time.perf_counter() - begin
+    whole = "".join(stream_scored_records(artifacts, portfolio, "csv", args.rows + 1))
+    if chunked != whole:
+        mismatches.append(f"{args.chunk_rows}-row chunks score differently from one chunk")
+
+    print(json.dumps({"rows": args.rows, "chunk_rows": args.chunk_rows, "rows_per_s": round(args.rows / elapsed)}))
+    for line in mismatches[:10]:
+        print("  " + line)
+    if mismatches:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
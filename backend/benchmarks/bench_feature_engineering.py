@@ -0,0 +1,109 @@
+"""
+Columnar feature-engineering benchmark and scalar-parity check.
+
+Usage (from backend/):
+    python -m benchmarks.bench_feature_engineering --rows 1000000
+
+Times `engineer_features_batch` over synthetic columns of the requested
+size, then checks it against the scalar `calculate_*` reference helpers on
+a random sample that includes the None/zero guard cases. Exits non-zero on
+any mismatch.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from repository.constants import LOAN_TYPES
+from services.feature_engineering import (
+    calculate_collateral_coverage,
+    calculate_default_severity,
+    calculate_emi,
+    calculate_emi_to_income,
+    engineer_features_batch,
+    get_default_loan_terms,
+)
+
+
+def _synthetic_columns(n_rows: int, seed: int, with_guards: bool) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    columns = {
+        "loan_type": rng.choice(LOAN_TYPES, n_rows),
+        "loan_amount": rng.uniform(10_000, 2_000_000, n_rows).round(0),
+        "collateral_value": rng.uniform(0, 3_000_000, n_rows).round(0),
+        "monthly_income": rng.uniform(10_000, 250_000, n_rows).round(0),
+        "missed_payments": rng.integers(0, 13, n_rows).astype(float),
+        "days_past_due": rng.integers(0, 181, n_rows).astype(float),
+        "collection_attempts": rng.integers(0, 11, n_rows).astype(float),
+        "interest_rate": rng.uniform(1, 20, n_rows).round(2),
+        "loan_tenure": rng.integers(1, 361, n_rows).astype(float),
+    }
+    if with_guards:
+        for name in ("interest_rate", "loan_tenure"):
+            columns[name][rng.random(n_rows) < 0.2] = np.nan
+        for name in ("interest_rate", "collateral_value", "monthly_income", "loan_amount"):
+            columns[name][rng.random(n_rows) < 0.05] = 0.0
+    return columns
+
+
+def _same(batch_value: float, scalar_value: float | None) -> bool:
+    if scalar_value is None:
+        return math.isnan(batch_value)
+    return batch_value == scalar_value
+
+
+def _parity_mismatches(n_rows: int) -> int:
+    columns = _synthetic_columns(n_rows, seed=1, with_guards=True)
+    batch = engineer_features_batch(columns)
+    mismatches = 0
+    for i in range(n_rows):
+        rate, tenure = columns["interest_rate"][i], columns["loan_tenure"][i]
+        default_rate, default_tenure = get_default_loan_terms(str(columns["loan_type"][i]))
+        rate = default_rate if math.isnan(rate) else float(rate)
+        tenure = default_tenure if math.isnan(tenure) else int(tenure)
+        emi = calculate_emi(float(columns["loan_amount"][i]), rate, tenure)
+        expected = {
+            "monthly_emi": emi,
+            "emi_to_income_ratio": calculate_emi_to_income(emi, float(columns["monthly_income"][i])),
+            "collateral_coverage": calculate_collateral_coverage(
+                float(columns["collateral_value"][i]), float(columns["loan_amount"][i])
+            ),
+            "default_severity": calculate_default_severity(
+                columns["missed_payments"][i], columns["days_past_due"][i]
+            ),
+            "interest_rate_used": rate,
+            "loan_tenure_used": tenure,
+        }
+        if not all(_same(float(batch[name][i]), value) for name, value in expected.items()):
+            mismatches += 1
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--parity-rows", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for label, with_guards in (("explicit_terms", False), ("20pct_default_terms", True)):
+        columns = _synthetic_columns(args.rows, seed=0, with_guards=with_guards)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            engineer_features_batch(columns)
+            timings.append(time.perf_counter() - start)
+        results[label] = {"rows": args.rows, "best_s": round(min(timings), 4)}
+
+    mismatches = _parity_mismatches(args.parity_rows)
+    results["scalar_parity"] = {"rows": args.parity_rows, "mismatches": mismatches}
+    print(json.dumps(results, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+HTTP caching: analytics memoization and ETag revalidation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_http_cache --borrowers 500 --repeats 5
+
+Parity: for every dataset borrower, the memoized Recovery Insights
+bundle must equal a fresh `build_analytics_bundle`, on the first call
+and on the memo hit. Then it scores the borrowers (stored in a
+temporary result store) and times:
+- `POST /analytics`, memo cold vs warm;
+- `GET /analytics/{id}` with and without a matching `If-None-Match`;
+- the reference endpoints with and without one.
+Every revalidation must come back 304 with an empty body. Exits non-zero
+on any mismatch.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from repository.result_store import get_result_store
+from services import analytics_service, scored_borrower_service
+from services.scoring_pipeline import score_borrowers
+
+_REFERENCE_PATHS = ("/dictionary", "/reference/loan-types", "/contact/whatsapp-link")
+
+
+def _analytics_inputs(borrowers: list[dict]) -> list[dict]:
+    scored = score_borrowers(get_ml_artifacts(), borrowers)
+    return [
+        scored_borrower_service.analytics_inputs({**result, "input": borrower})
+        for borrower, result in zip(borrowers, scored)
+    ]
+
+
+def _mismatches(inputs: list[dict]) -> list[str]:
+    found = []
+    for i, kwargs in enumerate(inputs):
+        expected = analytics_service.build_analytics_bundle(**kwargs)
+        for attempt in ("miss", "hit"):
+            bundle, _ = analytics_service.memoized_analytics_bundle(**kwargs)
+            if bundle != expected:
+                found.append(f"borrower {i} ({attempt}): memoized bundle differs")
+    return found
+
+
+def _timed(client: TestClient, method: str, url: str, expect: int, **kwargs) -> tuple[float, list[str]]:
+    begin = time.perf_counter()
+    response = client.request(method, url, **kwargs)
+    elapsed = time.perf_counter() - begin
+    problems = []
+    if response.status_code != expect:
+        problems.append(f"{method} {url}: {response.status_code}, expected {expect}")
+    elif expect == 304 and response.content:
+        problems.append(f"{method} {url}: 304 with a body")
+    return elapsed, problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--borrowers", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    borrowers = dataset_borrowers(args.borrowers)
+    inputs = _analytics_inputs(borrowers)
+    mismatches = _mismatches(inputs)
+    print(f"parity: {len(inputs)} bundles, {len(mismatches)} mismatches")
+
+    settings.result_store_path = Path(tempfile.mkdtemp()) / "scored_borrowers.sqlite3"
+    from main import app
+
+    prefix = settings.api_v1_prefix
+    times: dict[str, list[float]] = {}
+
+    def record(name: str, sample: tuple[float, list[str]]) -> None:
+        times.setdefault(name, []).append(sample[0])
+        mismatches.extend(sample[1])
+
+    with TestClient(app) as client:
+        # POST /analytics: memo cold, then warm.
+        analytics_service._bundle_cache.clear()
+        for kwargs in inputs:
+            record("post_analytics_cold", _timed(client, "POST", f"{prefix}/analytics", 200, json=kwargs))
+        for _ in range(args.repeats):
+            for kwargs in inputs:
+                record("post_analytics_warm", _timed(client, "POST", f"{prefix}/analytics", 200, json=kwargs))
+
+        batch = client.post(f"{prefix}/predict/batch", json={"borrowers": borrowers}).json()
+        borrower_ids = [item["result"]["borrower_id"] for item in batch["results"]]
+        get_result_store().flush()
+        etags = {}
+        for borrower_id in borrower_ids:
+            url = f"{prefix}/analytics/{borrower_id}"
+            etags[url] = client.get(url).headers["etag"]
+        for _ in range(args.repeats):
+            for url, etag in etags.items():
+                record("get_analytics_full", _timed(client, "GET", url, 200))
+                record("get_analytics_304", _timed(client, "GET", url, 304, headers={"If-None-Match": etag}))
+
+        for path in _REFERENCE_PATHS:
+            url = f"{prefix}{path}"
+            name, etag = path.rsplit("/", 1)[-1], client.get(url).headers["etag"]
+            for _ in range(args.repeats * 100):
+                record(f"get_{name}_full", _timed(client, "GET", url, 200))
+                record(f"get_{name}_304", _timed(client, "GET", url, 304, headers={"If-None-Match": etag}))
+
+    report = {name: summarize_ms(samples) for name, samples in times.items()}
+    report["analytics_cache"] = analytics_service.analytics_cache_stats()
+    print(json.dumps(report, indent=2))
+    for line in mismatches[:10]:
+        print("  " + line)
+    if mismatches:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cost of the /metrics instrumentation relative to a `/predict` request.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metrics_overhead --requests 500 --max-overhead-pct 1.0
+
+Times everything one uncached single-borrower `/predict` records (six
+pipeline stage laps, the row counter, the request counter and latency
+histogram, the served tier/segment counters) in a tight loop, and divides
+it by the median end-to-end `/predict` latency measured through the ASGI
+app. Exits non-zero if that share exceeds `--max-overhead-pct`.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+
+_STAGES = (
+    "engineer_features",
+    "build_feature_matrices",
+    "predict_risk_scores",
+    "assign_segments",
+    "compute_shap_top_features",
+    "shape_results",
+)
+
+
+def _instrumentation_seconds(scored: dict, iterations: int) -> float:
+    """Per-request cost of the recording calls, averaged over `iterations`."""
+    from services import metrics
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        request_start = time.perf_counter()
+        timer = metrics.StageTimer()
+        for stage in _STAGES:
+            timer.lap(stage)
+        metrics.SCORING_ROWS.inc(amount=1)
+        metrics.record_served([scored])
+        metrics.HTTP_REQUESTS.inc("POST", "/api/v1/predict", "200")
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - request_start, "POST", "/api/v1/predict")
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--max-overhead-pct", type=float, default=1.0)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+
+    borrowers = dataset_borrowers(200)
+    samples = []
+    with TestClient(app_main.app) as client:
+        scored = client.post("/api/v1/predict", json=borrowers[0]).json()
+        for i in range(args.requests):
+            start = time.perf_counter()
+            response = client.post(
+                "/api/v1/predict", json=borrowers[i % len(borrowers)], headers={"Cache-Control": "no-store"}
+            )
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+        metrics_body = client.get("/metrics").text
+
+    per_request = _instrumentation_seconds(scored, args.iterations)
+    overhead_pct = per_request / statistics.median(samples) * 100
+    print(
+        json.dumps(
+            {
+                "predict": summarize_ms(samples),
+                "instrumentation_us_per_request": round(per_request * 1e6, 2),
+                "overhead_pct_of_median_predict": round(overhead_pct, 3),
+                "metrics_body_bytes": len(metrics_body),
+            },
+            indent=2,
+        )
+    )
+    if overhead_pct > args.max_overhead_pct:
+        print(f"Instrumentation overhead {overhead_pct:.2f}% exceeds {args.max_overhead_pct}%", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+PDF report rendering: precompiled template vs. platypus flow layout.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_render --reports 1000 --min-speedup 5
+
+Renders the same reports (dataset borrowers, cycled to `--reports`) with
+both renderers and reports throughput. Parity is checked on every report:
+the page content stream (every drawing operator and coordinate) must be
+identical, and so must the text pypdf extracts. A merged multi-borrower PDF
+is checked the same way. Exits non-zero on any mismatch, on a report the
+template had to hand to platypus, or if the template isn't `--min-speedup`
+times faster. Needs pypdf (requirements-optional.txt).
+"""
+import argparse
+import io
+import json
+import sys
+import time
+
+from pypdf import PdfReader
+
+from benchmarks._common import dataset_report_payloads
+from services import pdf_service
+
+
+def _pages(pdf: bytes) -> list[tuple[bytes, str]]:
+    return [(page.get_contents().get_data(), page.extract_text()) for page in PdfReader(io.BytesIO(pdf)).pages]
+
+
+def _time_renders(render, reports: list[dict]) -> tuple[float, list[bytes]]:
+    start = time.perf_counter()
+    pdfs = [render(report) for report in reports]
+    return time.perf_counter() - start, pdfs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=1000)
+    parser.add_argument("--min-speedup", type=float, default=5.0)
+    args = parser.parse_args()
+
+    dataset = dataset_report_payloads()
+    reports = [
+        {**dataset[i % len(dataset)], "borrower_id": f"BENCH-{i:05d}"} for i in range(args.reports)
+    ]
+    template = pdf_service.report_template()
+
+    def render_template(report: dict) -> bytes:
+        pdf = template.render([report])
+        if pdf is None:
+            raise SystemExit(f"template fell back to platypus for {report['borrower_id']}")
+        return pdf
+
+    def render_platypus(report: dict) -> bytes:
+        return pdf_service._build_pdf(pdf_service._report_elements(report))
+
+    render_template(reports[0]), render_platypus(reports[0])
+    platypus_s, platypus_pdfs = _time_renders(render_platypus, reports)
+    template_s, template_pdfs = _time_renders(render_template, reports)
+
+    mismatches = [
+        report["borrower_id"]
+        for report, ours, theirs in zip(reports, template_pdfs, platypus_pdfs)
+        if _pages(ours) != _pages(theirs)
+    ]
+    merged = reports[:50]
+    elements = []
+    for i, report in enumerate(merged):
+        elements += ([pdf_service.PageBreak()] if i else []) + pdf_service._report_elements(report)
+    merged_parity = _pages(template.render(merged)) == _pages(pdf_service._build_pdf(elements))
+
+    speedup = platypus_s / template_s
+    print(
+        json.dumps(
+            {
+                "reports": len(reports),
+                "platypus": {"total_s": round(platypus_s, 3), "reports_per_s": round(len(reports) / platypus_s, 1)},
+                "template": {"total_s": round(template_s, 3), "reports_per_s": round(len(reports) / template_s, 1)},
+                "speedup": round(speedup, 2),
+                "mean_bytes": {
+                    "platypus": sum(map(len, platypus_pdfs)) // len(reports),
+                    "template": sum(map(len, template_pdfs)) // len(reports),
+                },
+                "parity_mismatches": mismatches[:10],
+                "merged_parity": merged_parity,
+            },
+            indent=2,
+        )
+    )
+    if mismatches or not merged_parity:
+        print("Template output differs from platypus", file=sys.stderr)
+        sys.exit(1)
+    if speedup < args.min_speedup:
+        print(f"Speedup {speedup:.2f}x is below {args.min_speedup}x", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Portfolio analytics: parity with per-borrower Python aggregation and
+latency at portfolio scale.
+
+Usage (from backend/):
+    python -m benchmarks.bench_portfolio_analytics --borrowers 50000
+
+Scores the dataset once, then cycles the scored rows up to `--borrowers`.
+Every aggregate from `build_portfolio_analytics` is recomputed with a
+plain loop over rows (tiers from `assign_recovery_strategy` itself) and
+must match. Reports the aggregation time alone and the end-to-end time of
+`POST /api/v1/analytics/portfolio` (JSON parsing and validation included).
+Exits non-zero on any mismatch.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from services.analytics_service import build_portfolio_analytics
+from services.prediction_service import assign_recovery_strategy
+from services.scoring_pipeline import score_borrowers
+
+
+def _portfolio(n: int) -> dict[str, list]:
+    borrowers = dataset_borrowers()
+    scored = score_borrowers(get_ml_artifacts(), borrowers)
+    rows = [(s["risk_score"], s["calculated"]["days_past_due"], b["outstanding_loan"], s["segment"]["segment_name"])
+            for b, s in zip(borrowers, scored)]
+    picked = [rows[i % len(rows)] for i in range(n)]
+    return {
+        name: [row[j] for row in picked]
+        for j, name in enumerate(("risk_score", "days_past_due", "outstanding_loan", "segment_name"))
+    }
+
+
+def _reference(portfolio: dict[str, list], bins: int) -> dict:
+    """The same aggregates, one borrower at a time."""
+    tiers, exposure, dpd, histogram = Counter(), Counter(), Counter(), Counter()
+    for score, days, outstanding in zip(
+        portfolio["risk_score"], portfolio["days_past_due"], portfolio["outstanding_loan"]
+    ):
+        label = assign_recovery_strategy(score, days)["label"]
+        tiers[label] += 1
+        exposure[label] += outstanding
+        dpd[0 if days < 1 else 1 if days < 30 else 2 if days < 60 else 3 if days < 90 else 4] += 1
+        histogram[min(math.floor(score * bins), bins - 1)] += 1
+    return {
+        "tiers": dict(tiers),
+        "exposure": dict(exposure),
+        "dpd": [dpd[i] for i in range(5)],
+        "histogram": [histogram[i] for i in range(bins)],
+        "segments": dict(Counter(portfolio["segment_name"])),
+    }
+
+
+def _mismatches(result: dict, expected: dict) -> list[str]:
+    found = []
+    tiers = {item["label"]: item["value"] for item in result["tier_counts_chart"]["data"]}
+    if {k: v for k, v in tiers.items() if v} != expected["tiers"]:
+        found.append(f"tier counts {tiers} != {expected['tiers']}")
+    for item in result["exposure_by_tier_chart"]["data"]:
+        if abs(item["value"] - expected["exposure"].get(item["label"], 0.0)) > 0.01:
+            found.append(f"exposure for {item['label']}")
+    if [item["value"] for item in result["dpd_buckets_chart"]["data"]] != expected["dpd"]:
+        found.append("dpd buckets")
+    if [item["value"] for item in result["risk_histogram"]["data"]] != expected["histogram"]:
+        found.append("risk histogram")
+    if {item["label"]: item["count"] for item in result["segment_mix_chart"]["data"]} != expected["segments"]:
+        found.append("segment mix")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--borrowers", type=int, default=50_000)
+    parser.add_argument("--bins", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    portfolio = _portfolio(args.borrowers)
+    start = time.perf_counter()
+    expected = _reference(portfolio, args.bins)
+    reference_s = time.perf_counter() - start
+
+    aggregate_samples = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        result = build_portfolio_analytics(**portfolio, histogram_bins=args.bins)
+        aggregate_samples.append(time.perf_counter() - start)
+    mismatches = _mismatches(result, expected)
+
+    from main import app
+
+    body = {**portfolio, "histogram_bins": args.bins}
+    request_samples = []
+    with TestClient(app) as client:
+        for _ in range(max(args.repeats // 4, 1)):
+            start = time.perf_counter()
+            response = client.post(f"{settings.api_v1_prefix}/analytics/portfolio", json=body)
+            request_samples.append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json() != json.loads(json.dumps(result)):
+                mismatches.append(f"endpoint returned {response.status_code} or a different body")
+                break
+
+    print(
+        json.dumps(
+            {
+                "borrowers": args.borrowers,
+                "python_loop_s": round(reference_s, 4),
+                "aggregate": summarize_ms(aggregate_samples),
+                "endpoint": summarize_ms(request_samples),
+                "summary": result["summary"],
+                "mismatches": mismatches,
+            },
+            indent=2,
+        )
+    )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Load test for `/predict` micro-batching: throughput and tail latency with
+batching on vs. the per-request path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_predict_batching --requests 2000 --concurrency 1 8 32 64
+
+Drives the real ASGI app in-process (httpx's ASGI transport, no network)
+with `--concurrency` requests in flight at a time, all sent with
+`Cache-Control: no-store` so every one is scored. For each concurrency it
+runs the per-request path (`predict_batching_enabled = False`) and the
+micro-batched path, and reports requests/second, p50/p95/p99 latency
+and the mean batch size. Results are also checked: every response must
+carry the risk score the per-request path produced for that borrower.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+from config.settings import settings
+from services import metrics
+
+
+async def _load(client: httpx.AsyncClient, borrowers: list[dict], n_requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+    scores: dict[int, float] = {}
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/v1/predict", json=borrowers[i % len(borrowers)], headers={"Cache-Control": "no-store"}
+            )
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+            scores[i % len(borrowers)] = response.json()["risk_score"]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    return samples, time.perf_counter() - start, scores
+
+
+async def _run(args) -> dict:
+    import main as app_main
+
+    # Eager, so the deferred imports don't compete with the first run for CPU.
+    settings.startup_mode = "eager"
+    app_main.load_models_on_startup()
+    borrowers = dataset_borrowers(500)
+    transport = httpx.ASGITransport(app=app_main.app)
+    results = {}
+    reference: dict[int, float] | None = None
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _load(client, borrowers, 50, 4)  # warm-up
+        for concurrency in args.concurrency:
+            row = {}
+            for mode, batching in (("per_request", False), ("micro_batched", True)):
+                settings.predict_batching_enabled = batching
+                batches_before = metrics.PREDICT_MICROBATCH_SIZE.count()
+                samples, elapsed, scores = await _load(client, borrowers, args.requests, concurrency)
+                if reference is None:
+                    reference = scores
+                mismatched = sum(abs(score - reference[i]) > 1e-12 for i, score in scores.items() if i in reference)
+                n_batches = metrics.PREDICT_MICROBATCH_SIZE.count() - batches_before
+                row[mode] = {
+                    "requests_per_s": round(len(samples) / elapsed, 1),
+                    **summarize_ms(samples),
+                    "mean_batch_rows": round(len(samples) / n_batches, 2) if n_batches else 1.0,
+                    "score_mismatches": mismatched,
+                }
+            row["throughput_gain"] = round(
+                row["micro_batched"]["requests_per_s"] / row["per_request"]["requests_per_s"], 2
+            )
+            results[f"concurrency_{concurrency}"] = row
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+`/predict` latency benchmark: cached SHAP explainer vs. per-request rebuild.
+
+Usage (from backend/):
+    python -m benchmarks.bench_predict_latency --requests 300
+
+The "rebuild" run reproduces the old behaviour by swapping in a
+`get_shap_explainer` that constructs a fresh `shap.TreeExplainer` on every
+call; the "cached" run uses the explainer held by `models.loader`.
+"""
+import argparse
+import json
+import time
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+
+
+def _time_requests(client, borrowers: list[dict], n_requests: int) -> list[float]:
+    samples = []
+    for i in range(n_requests):
+        payload = borrowers[i % len(borrowers)]
+        start = time.perf_counter()
+        response = client.post("/api/v1/predict", json=payload)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+
+    import shap
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+    from services import shap_service
+
+    borrowers = dataset_borrowers()
+    results = {}
+    with TestClient(app_main.app) as client:
+        cached_getter = shap_service.get_shap_explainer
+        shap_service.get_shap_explainer = lambda artifacts: shap.TreeExplainer(artifacts.xgb_model)
+        try:
+            _time_requests(client, borrowers, args.warmup)
+            results["rebuild_per_request"] = summarize_ms(_time_requests(client, borrowers, args.requests))
+        finally:
+            shap_service.get_shap_explainer = cached_getter
+
+        _time_requests(client, borrowers, args.warmup)
+        results["cached_explainer"] = summarize_ms(_time_requests(client, borrowers, args.requests))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
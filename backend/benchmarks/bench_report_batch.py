@@ -0,0 +1,84 @@
+"""
+Bulk report generation: time to first byte and total time for a streamed
+ZIP versus rendering every report before sending anything.
+
+Usage (from backend/):
+    python -m benchmarks.bench_report_batch --reports 200 --processes 0 2
+
+"sequential" is the pre-batch baseline: one `generate_borrower_report_pdf`
+call per borrower, then zip. "streamed_zip" drives
+`report_batch_service.stream_reports_zip` on a `WorkerPool`. The archive
+is checked to hold every report, in order, and the script exits non-zero
+if it doesn't.
+"""
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+import zipfile
+
+from benchmarks._common import dataset_report_payloads
+from services import report_batch_service
+from services.pdf_service import generate_borrower_report_pdf, generate_merged_report_pdf
+from services.worker_pool import WorkerPool
+
+
+def _sequential(reports: list[dict]) -> dict:
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for report in reports:
+            name = report_batch_service.report_filename(report["borrower_id"])
+            archive.writestr(name, generate_borrower_report_pdf(report))
+    total = time.perf_counter() - start
+    return {"first_byte_s": round(total, 3), "total_s": round(total, 3)}
+
+
+async def _streamed(reports: list[dict], processes: int) -> tuple[dict, bytes]:
+    pool = WorkerPool(processes=processes, queue_size=64)
+    pool.warm_up()
+    try:
+        parts = []
+        start = time.perf_counter()
+        first_byte = None
+        async for part in report_batch_service.stream_reports_zip(pool, reports):
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            parts.append(part)
+        total = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return {"first_byte_s": round(first_byte, 3), "total_s": round(total, 3)}, b"".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+", default=[0])
+    args = parser.parse_args()
+
+    reports = dataset_report_payloads(args.reports)
+    results = {"reports": len(reports), "sequential": _sequential(reports)}
+
+    start = time.perf_counter()
+    merged = generate_merged_report_pdf(reports)
+    results["merged_pdf"] = {"total_s": round(time.perf_counter() - start, 3), "bytes": len(merged)}
+
+    ok = True
+    for processes in args.processes:
+        timings, archive_bytes = asyncio.run(_streamed(reports, processes))
+        names = zipfile.ZipFile(io.BytesIO(archive_bytes)).namelist()
+        expected = [report_batch_service.report_filename(r["borrower_id"]) for r in reports]
+        timings["complete_and_ordered"] = names == expected
+        ok = ok and names == expected
+        results[f"streamed_zip_{processes}_processes"] = timings
+
+    print(json.dumps(results, indent=2))
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
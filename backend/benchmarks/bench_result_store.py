@@ -0,0 +1,105 @@
+"""
+Scored-borrower store: /predict latency with and without it, writer
+throughput, and lookup latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_result_store --requests 2000 --max-p50-overhead-ms 0.2
+
+Uses a throwaway database. /predict is timed in alternating blocks with
+the store on and off (prediction cache bypassed, so every call scores).
+The writer is then fed `--rows` results at once and timed until they're
+committed, and `get` is timed for committed IDs. Exits non-zero if the
+store adds more than `--max-p50-overhead-ms` to /predict's median, or if
+any queued result fails to round-trip.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from benchmarks._common import dataset_borrowers, percentile, summarize_ms
+from config.settings import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--max-p50-overhead-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    settings.result_store_path = Path(tempfile.mkdtemp()) / "scored_borrowers.sqlite3"
+    from main import app
+    from repository.result_store import get_result_store
+
+    borrowers = dataset_borrowers()
+    samples: dict[str, list[float]] = {"store_off": [], "store_on": []}
+    stored_ids = []
+    with TestClient(app) as client:
+        block = 100
+        for start in range(0, args.requests, block):
+            for label in ("store_off", "store_on"):
+                settings.result_store_enabled = label == "store_on"
+                for i in range(start, min(start + block, args.requests)):
+                    begin = time.perf_counter()
+                    response = client.post(
+                        f"{settings.api_v1_prefix}/predict",
+                        json=borrowers[i % len(borrowers)],
+                        headers={"Cache-Control": "no-store"},
+                    )
+                    samples[label].append(time.perf_counter() - begin)
+                    if label == "store_on":
+                        stored_ids.append(response.json()["borrower_id"])
+
+        store = get_result_store()
+        store.flush()
+        template = client.post(f"{settings.api_v1_prefix}/predict", json=borrowers[0]).json()
+        results = [{**template, "borrower_id": f"BENCH-{i:06d}"} for i in range(args.rows)]
+        begin = time.perf_counter()
+        store.put_many(results)
+        queued_s = time.perf_counter() - begin
+        store.flush()
+        committed_s = time.perf_counter() - begin
+
+        lookups = []
+        for i in range(2000):
+            begin = time.perf_counter()
+            found = store.get(f"BENCH-{(i * 7919) % args.rows:06d}")
+            lookups.append(time.perf_counter() - begin)
+        missing = [bid for bid in stored_ids if store.get(bid) is None]
+        round_trip_ok = found == results[(1999 * 7919) % args.rows] and not missing
+        stats = store.stats()
+
+    overhead_ms = (percentile(samples["store_on"], 50) - percentile(samples["store_off"], 50)) * 1000
+    print(
+        json.dumps(
+            {
+                "predict": {label: summarize_ms(values) for label, values in samples.items()},
+                "p50_overhead_ms": round(overhead_ms, 3),
+                "writer": {
+                    "rows": args.rows,
+                    "queue_s": round(queued_s, 3),
+                    "commit_s": round(committed_s, 3),
+                    "rows_per_s": round(args.rows / committed_s),
+                },
+                "get": summarize_ms(lookups),
+                "store": stats,
+                "round_trip_ok": round_trip_ok,
+            },
+            indent=2,
+        )
+    )
+    if not round_trip_ok or stats["dropped"] or stats["failed"]:
+        print("Stored results did not round-trip", file=sys.stderr)
+        sys.exit(1)
+    if overhead_ms > args.max_p50_overhead_ms:
+        print(f"Store adds {overhead_ms:.3f} ms to /predict p50", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+What-if scenarios: parity with per-variant scoring, and one
+`/predict/scenarios` call against the `/predict` round trips it replaces.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scenarios --borrowers 20 --min-speedup 5
+
+For each of `--borrowers` dataset borrowers, a grid of interest rates x
+tenures x write-downs is scored with `score_scenarios`, and every variant
+is also built as a full borrower and run through `score_borrowers`: the
+EMI must match exactly, the risk score to float32 precision, and the
+risk category exactly (unless the score sits within that precision of a
+threshold). Then the grid is timed as one `POST /predict/scenarios`
+against one `POST /predict` per variant (prediction cache bypassed).
+The result store is switched off for the run. Exits non-zero on any
+mismatch or if the speedup is below `--min-speedup`.
+"""
+import argparse
+import itertools
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks._common import dataset_borrowers, summarize_ms
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from repository.constants import CRITICAL_RISK_THRESHOLD, HIGH_RISK_THRESHOLD, MEDIUM_RISK_THRESHOLD
+from services.scenario_service import score_scenarios
+from services.scoring_pipeline import score_borrowers
+
+_RATES = [6.0, 8.0, 10.0, 12.0, 14.0]
+_TENURES = [24, 48, 72, 96, 120]
+_WRITE_DOWNS = [1.0, 0.75, 0.5, 0.25]
+_SCORE_TOLERANCE = 1e-6
+
+
+def _grid(borrower: dict) -> dict:
+    return {
+        "interest_rate": _RATES,
+        "loan_tenure": _TENURES,
+        "outstanding_loan": [round(borrower["outstanding_loan"] * f, 2) for f in _WRITE_DOWNS],
+    }
+
+
+def _mismatches(borrower: dict) -> list[str]:
+    grid = _grid(borrower)
+    result = score_scenarios(get_ml_artifacts(), borrower, grid, [])
+    expanded = [
+        {**borrower, "interest_rate": rate, "loan_tenure": tenure, "outstanding_loan": outstanding}
+        for rate, tenure, outstanding in itertools.product(*grid.values())
+    ]
+    reference = score_borrowers(get_ml_artifacts(), expanded)
+    variants = result["variants"]
+    found = []
+    for i, expected in enumerate(reference):
+        score = variants["risk_score"][i]
+        if variants["monthly_emi"][i] != expected["calculated"]["monthly_emi"]:
+            found.append(f"variant {i}: EMI {variants['monthly_emi'][i]} != {expected['calculated']['monthly_emi']}")
+        if abs(score - expected["risk_score"]) > _SCORE_TOLERANCE:
+            found.append(f"variant {i}: risk {score} != {expected['risk_score']}")
+        near_threshold = any(
+            abs(score - t) <= _SCORE_TOLERANCE for t in (CRITICAL_RISK_THRESHOLD, HIGH_RISK_THRESHOLD, MEDIUM_RISK_THRESHOLD)
+        )
+        if variants["risk_category"][i] != expected["risk_category"] and not near_threshold:
+            found.append(f"variant {i}: {variants['risk_category'][i]} != {expected['risk_category']}")
+    flat = [score for plane in result["surface"]["risk_score"] for row in plane for score in row]
+    if flat != variants["risk_score"]:
+        found.append("surface doesn't match the variant scores")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--borrowers", type=int, default=20)
+    parser.add_argument("--min-speedup", type=float, default=5.0)
+    args = parser.parse_args()
+
+    borrowers = dataset_borrowers(args.borrowers)
+    mismatches = [f"borrower {i}: {m}" for i, b in enumerate(borrowers) for m in _mismatches(b)]
+    n_variants = len(_RATES) * len(_TENURES) * len(_WRITE_DOWNS)
+    print(f"parity: {len(borrowers)} borrowers x {n_variants} variants, {len(mismatches)} mismatches")
+    for line in mismatches[:10]:
+        print("  " + line)
+
+    settings.result_store_enabled = False  # the /predict loop shouldn't fill the local store
+    from main import app
+
+    scenario_times, predict_times = [], []
+    with TestClient(app) as client:
+        for borrower in borrowers:
+            grid = _grid(borrower)
+            begin = time.perf_counter()
+            response = client.post(f"{settings.api_v1_prefix}/predict/scenarios", json={"base": borrower, "grid": grid})
+            scenario_times.append(time.perf_counter() - begin)
+            response.raise_for_status()
+
+            begin = time.perf_counter()
+            for rate, tenure, outstanding in itertools.product(*grid.values()):
+                client.post(
+                    f"{settings.api_v1_prefix}/predict",
+                    json={**borrower, "interest_rate": rate, "loan_tenure": tenure, "outstanding_loan": outstanding},
+                    headers={"Cache-Control": "no-store"},
+                ).raise_for_status()
+            predict_times.append(time.perf_counter() - begin)
+
+    scenarios, predicts = summarize_ms(scenario_times), summarize_ms(predict_times)
+    speedup = predicts["p50_ms"] / scenarios["p50_ms"]
+    print(f"POST /predict/scenarios ({n_variants} variants): {scenarios}")
+    print(f"{n_variants} x POST /predict:                    {predicts}")
+    print(f"speedup (p50): x{speedup:.1f} (min x{args.min_speedup})")
+    if mismatches or speedup < args.min_speedup:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
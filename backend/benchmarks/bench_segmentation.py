@@ -0,0 +1,90 @@
+"""
+Fused nearest-centroid segmentation: parity with sklearn's
+`KMeans.predict(StandardScaler.transform(X))` and latency against it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_segmentation
+
+Parity is checked on the full dataset against the fitted sklearn pickles
+(`scaler.pkl`, `kmeans.pkl`) and against the segmenter the app loads from
+its model bundle: segment ids must match on every row, and the distance
+and margin must match `KMeans.transform` (distance to every centroid) to
+within --tolerance. Exits non-zero on any mismatch.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks._common import dataset_segmentation_matrix, summarize_ms
+from config.settings import settings
+from models.centroid_segmenter import CentroidSegmenter
+from models.loader import _load_pickle, get_ml_artifacts
+
+
+def _latency(fn, X: np.ndarray, repeats: int) -> dict:
+    samples = []
+    for i in range(repeats):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - start)
+    return summarize_ms(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    scaler, kmeans = _load_pickle(settings.scaler_path), _load_pickle(settings.kmeans_path)
+    X = dataset_segmentation_matrix()
+
+    def sklearn_assign(matrix: np.ndarray) -> np.ndarray:
+        return kmeans.predict(scaler.transform(matrix))
+
+    expected_ids = sklearn_assign(X)
+    sorted_distances = np.sort(kmeans.transform(scaler.transform(X)), axis=1)
+    expected_distance, expected_margin = sorted_distances[:, 0], sorted_distances[:, 1] - sorted_distances[:, 0]
+
+    parity = {}
+    segmenters = {"sklearn_pickles": CentroidSegmenter.from_fitted(scaler, kmeans), "bundle": get_ml_artifacts().segmenter}
+    for label, segmenter in segmenters.items():
+        assigned = segmenter.assign(X)
+        parity[label] = {
+            "rows": len(X),
+            "segment_mismatches": int((assigned.segment_ids != expected_ids).sum()),
+            "max_distance_diff": float(np.max(np.abs(assigned.distances - expected_distance))),
+            "max_margin_diff": float(np.max(np.abs(assigned.margins - expected_margin))),
+        }
+
+    segmenter = segmenters["bundle"]
+    big = np.repeat(X, 20, axis=0)
+    batch = {}
+    for label, fn in (("sklearn", sklearn_assign), ("fused", segmenter.assign)):
+        start = time.perf_counter()
+        fn(big)
+        batch[label] = {"rows": len(big), "seconds": round(time.perf_counter() - start, 4)}
+
+    results = {
+        "parity": parity,
+        "closest_margin": float(expected_margin.min()),
+        "single_row": {
+            "sklearn": _latency(sklearn_assign, X, args.repeats),
+            "fused": _latency(segmenter.assign, X, args.repeats),
+        },
+        "batch": batch,
+    }
+    print(json.dumps(results, indent=2))
+    ok = all(
+        p["segment_mismatches"] == 0 and max(p["max_distance_diff"], p["max_margin_diff"]) <= args.tolerance
+        for p in parity.values()
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
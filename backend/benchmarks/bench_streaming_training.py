@@ -0,0 +1,98 @@
+"""
+Out-of-core retraining: peak RSS against dataset size.
+
+Usage (from backend/):
+    python -m benchmarks.bench_streaming_training --rows 50000 400000 --max-rss-growth 1.25
+
+Builds synthetic loan books of each size by resampling the sample
+dataset (fresh Borrower_IDs, so the hash split stays balanced), runs
+`retrain.py --streaming` on each in a child process with a throwaway
+bundles directory, and reads the child's peak RSS from `wait4`. Exits
+non-zero if the largest run's peak RSS is more than `--max-rss-growth`
+times the smallest run's, or if any run's test ROC AUC falls below
+`--min-auc`. Resampled rows repeat across the splits, so that AUC is
+optimistic: the floor only catches a broken model, it doesn't measure one.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings
+
+
+def write_synthetic_dataset(path: Path, rows: int, seed: int = 0, block: int = 50_000) -> None:
+    source = pd.read_csv(settings.training_dataset_path)
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(path, "w", newline="") as f:
+        while written < rows:
+            n = min(block, rows - written)
+            frame = source.iloc[rng.integers(0, len(source), n)].copy()
+            frame["Borrower_ID"] = [f"SYN{i:09d}" for i in range(written, written + n)]
+            frame.to_csv(f, header=written == 0, index=False)
+            written += n
+
+
+def run_streaming(dataset: Path, work: Path, chunk_rows: int) -> dict:
+    metrics_path = work / "metrics.json"
+    command = [
+        sys.executable, "retrain.py", "--streaming", "--no-activate",
+        "--dataset", str(dataset), "--cache-dir", str(work), "--bundles-dir", str(work / "bundles"),
+        "--metrics-out", str(metrics_path), "--chunk-rows", str(chunk_rows),
+    ]
+    begin = time.perf_counter()
+    child = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, status, usage = os.wait4(child.pid, 0)
+    seconds = time.perf_counter() - begin
+    stderr = child.stderr.read().decode()
+    child.stderr.close()
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"streaming retrain failed:\n{stderr[-4000:]}")
+    metrics = json.loads(metrics_path.read_text())
+    return {
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),  # Linux reports KiB
+        "test_roc_auc": round(metrics["test"]["roc_auc"], 4),
+        "test_n": metrics["test"]["n"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 400_000])
+    parser.add_argument("--chunk-rows", type=int, default=settings.training_chunk_rows)
+    parser.add_argument("--max-rss-growth", type=float, default=1.25)
+    parser.add_argument("--min-auc", type=float, default=0.7)
+    args = parser.parse_args()
+
+    results = {}
+    for rows in sorted(args.rows):
+        with tempfile.TemporaryDirectory() as tmp:
+            work = Path(tmp)
+            dataset = work / "loans.csv"
+            write_synthetic_dataset(dataset, rows)
+            results[rows] = {"csv_mb": round(dataset.stat().st_size / 2**20, 1), **run_streaming(dataset, work, args.chunk_rows)}
+        print(f"{rows:>9} rows: {json.dumps(results[rows])}")
+
+    smallest, largest = results[min(results)], results[max(results)]
+    growth = largest["peak_rss_mb"] / smallest["peak_rss_mb"]
+    print(f"peak RSS growth {min(results)} -> {max(results)} rows: x{growth:.2f} (limit x{args.max_rss_growth})")
+    failures = []
+    if growth > args.max_rss_growth:
+        failures.append(f"peak RSS grew x{growth:.2f}")
+    failures += [f"{rows} rows: test ROC AUC {r['test_roc_auc']}" for rows, r in results.items() if r["test_roc_auc"] < args.min_auc]
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
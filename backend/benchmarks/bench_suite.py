@@ -0,0 +1,317 @@
+"""
+Benchmark suite: per-service micro-benchmarks plus an in-process load
+test of the main routes, saved as JSON and checked against a baseline.
+
+Usage (from backend/):
+    python -m benchmarks.bench_suite --output suite.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baselines/suite.json
+
+Micro-benchmarks time each service function on one borrower (what
+/predict runs) and on the whole dataset (what /predict/batch runs):
+    feature_engineering   engineer_features_batch
+    model_scoring         predict_risk_scores
+    segmentation          assign_segments
+    shap                  compute_shap_top_features_batch
+    scoring_pipeline      score_borrowers (all of the above)
+    pdf_render            generate_borrower_report_pdf, one report
+
+The load test drives `POST /predict` (with `Cache-Control: no-store`, so
+every request is scored), `POST /analytics` and `POST /report` through
+the real ASGI app in-process (httpx's ASGI transport, no network):
+`--requests` per route at each `--concurrency`, reporting requests per
+second, p50/p95/p99 latency, failed requests and the process RSS after
+the run. `/analytics` bodies cycle through the dataset, so after the
+first pass they come from the bundle memo, as repeat dashboard views do.
+The result store is switched off for the run.
+
+With `--baseline`, every entry is compared with the baseline's: p50,
+p95 and peak RSS may grow, and requests per second may drop, by at most
+`--threshold` (a fraction; the default 50% sits above the up to ~35%
+spread seen between runs on a shared single-core host, and still
+catches a 2x slowdown); latency changes under `--min-delta-ms` are
+ignored as timer noise. p99 is reported but not compared. Exits non-zero
+on any regression or failed request. A baseline only means something on
+the machine that recorded it (see its `meta`); record a new one with
+`--output` after an intended change.
+
+Many hosts run a core faster for its first second or so of load, then
+settle; the suite keeps the CPU busy for `--warmup-seconds` first so
+every run is measured in the settled state. It then runs everything
+`--rounds` times and reports each metric's median over the rounds, which
+keeps a burst of noise from a neighbour out of the comparison.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+
+from benchmarks._common import (
+    dataset_borrowers,
+    dataset_model_matrix,
+    dataset_report_payloads,
+    dataset_segmentation_matrix,
+    rss_mb,
+    summarize_ms,
+)
+from config.settings import settings
+
+_LOWER_IS_BETTER = ("p50_ms", "p95_ms")
+_HIGHER_IS_BETTER = ("requests_per_s",)
+
+
+def _time(fn: Callable[[], object], repeats: int, warmup: int = 3) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - begin)
+    return summarize_ms(samples)
+
+
+def spin(seconds: float) -> None:
+    """Score borrowers for `seconds` (warm caches, settled CPU clock)."""
+    from models.loader import get_ml_artifacts
+    from services.scoring_pipeline import score_borrowers
+
+    borrowers, artifacts = dataset_borrowers(16), get_ml_artifacts()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        score_borrowers(artifacts, borrowers)
+
+
+def run_micro(repeats: int) -> dict:
+    from models.loader import get_ml_artifacts
+    from services import pdf_service
+    from services.feature_engineering import engineer_features_batch
+    from services.prediction_service import predict_risk_scores
+    from services.scoring_pipeline import borrower_columns, score_borrowers
+    from services.segmentation_service import assign_segments
+    from services.shap_service import compute_shap_top_features_batch
+
+    artifacts = get_ml_artifacts()
+    borrowers = dataset_borrowers()
+    columns = borrower_columns(borrowers)
+    one_row = borrower_columns(borrowers[:1])
+    model_matrix = dataset_model_matrix()
+    segmentation_matrix = dataset_segmentation_matrix()
+    report = dataset_report_payloads(1)[0]
+    n = len(borrowers)
+    # The dataset-sized runs take milliseconds, not microseconds: fewer repeats.
+    batch_repeats = max(repeats // 20, 5)
+
+    cases = {
+        "feature_engineering": (lambda: engineer_features_batch(one_row), lambda: engineer_features_batch(columns)),
+        "model_scoring": (
+            lambda: predict_risk_scores(artifacts, model_matrix[:1]),
+            lambda: predict_risk_scores(artifacts, model_matrix),
+        ),
+        "segmentation": (
+            lambda: assign_segments(artifacts, segmentation_matrix[:1]),
+            lambda: assign_segments(artifacts, segmentation_matrix),
+        ),
+        "shap": (
+            lambda: compute_shap_top_features_batch(artifacts, model_matrix[:1]),
+            lambda: compute_shap_top_features_batch(artifacts, model_matrix),
+        ),
+        "scoring_pipeline": (
+            lambda: score_borrowers(artifacts, borrowers[:1]),
+            lambda: score_borrowers(artifacts, borrowers),
+        ),
+    }
+    results = {}
+    for name, (single, batch) in cases.items():
+        results[f"{name}/1_row"] = _time(single, repeats)
+        results[f"{name}/{n}_rows"] = _time(batch, batch_repeats)
+    results["pdf_render/1_report"] = _time(lambda: pdf_service.generate_borrower_report_pdf(report), batch_repeats * 4)
+    return results
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    url: str,
+    payloads: list[dict],
+    n_requests: int,
+    concurrency: int,
+    headers: dict | None = None,
+) -> dict:
+    """`n_requests` POSTs to `url`, cycling through `payloads`, `concurrency` at a time."""
+    samples: list[float] = []
+    failed = 0
+    sent = 0
+
+    async def worker() -> None:
+        nonlocal failed, sent
+        while sent < n_requests:
+            payload = payloads[sent % len(payloads)]
+            sent += 1
+            begin = time.perf_counter()
+            response = await client.post(url, json=payload, headers=headers)
+            samples.append(time.perf_counter() - begin)
+            failed += response.status_code >= 400
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - begin
+    return {"requests_per_s": round(len(samples) / elapsed, 1), **summarize_ms(samples), "failed": failed, **rss_mb()}
+
+
+async def run_load(n_requests: int, concurrency_levels: list[int]) -> dict:
+    import main as app_main
+    from models.loader import get_ml_artifacts
+    from services.scored_borrower_service import analytics_inputs
+    from services.scoring_pipeline import score_borrowers
+
+    borrowers = dataset_borrowers()
+    scored = score_borrowers(get_ml_artifacts(), borrowers)
+    routes = {
+        "predict": (borrowers, {"Cache-Control": "no-store"}),
+        "analytics": ([analytics_inputs({**s, "input": b}) for b, s in zip(borrowers, scored)], None),
+        "report": (dataset_report_payloads(), None),
+    }
+    results = {}
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route, (payloads, headers) in routes.items():
+            url = f"{settings.api_v1_prefix}/{route}"
+            await _drive(client, url, payloads, 20, 2, headers)  # warm-up
+            for concurrency in concurrency_levels:
+                results[f"{route}/c{concurrency}"] = await _drive(
+                    client, url, payloads, n_requests, concurrency, headers
+                )
+    return results
+
+
+def median_of_rounds(rounds: list[dict]) -> dict:
+    """
+    {entry: {metric: median over rounds}} from one results dict per round;
+    failed requests are summed instead, so no failure is hidden.
+    """
+    merged = {}
+    for name, entry in rounds[0].items():
+        values = {metric: [r[name][metric] for r in rounds] for metric in entry}
+        merged[name] = {
+            metric: sum(v) if metric == "failed" else statistics.median(v) for metric, v in values.items()
+        }
+    return merged
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Regressions of `current` against `baseline`, as readable lines."""
+    regressions = []
+    for section in ("micro", "load"):
+        for name, before in baseline.get(section, {}).items():
+            after = current.get(section, {}).get(name)
+            if after is None:
+                continue
+            for metric in _LOWER_IS_BETTER:
+                old, new = before.get(metric), after.get(metric)
+                if old and new > old * (1 + threshold) and new - old >= min_delta_ms:
+                    regressions.append(f"{section} {name} {metric}: {old:g} -> {new:g} (+{new / old - 1:.0%})")
+            for metric in _HIGHER_IS_BETTER:
+                old, new = before.get(metric), after.get(metric)
+                if old and new < old * (1 - threshold):
+                    regressions.append(f"{section} {name} {metric}: {old:g} -> {new:g} ({new / old - 1:.0%})")
+    old, new = baseline.get("memory", {}).get("peak_rss_mb"), current["memory"]["peak_rss_mb"]
+    if old and new > old * (1 + threshold):
+        regressions.append(f"memory peak_rss_mb: {old:g} -> {new:g} (+{new / old - 1:.0%})")
+    return regressions
+
+
+def _meta(args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "inference_backend": settings.inference_backend,
+            "shap_backend": settings.shap_backend,
+            "pdf_renderer": settings.pdf_renderer,
+            "worker_processes": settings.worker_processes,
+            "predict_batching_enabled": settings.predict_batching_enabled,
+        },
+        "args": {
+            "repeats": args.repeats,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup_seconds": args.warmup_seconds,
+            "rounds": args.rounds,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=500, help="Micro-benchmark runs per single-row case.")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per route and concurrency level.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--warmup-seconds", type=float, default=3.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--output", type=Path, help="Write the results here as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--min-delta-ms", type=float, default=0.1)
+    args = parser.parse_args()
+
+    settings.result_store_enabled = False
+    # Eager, so the deferred imports don't land inside the first measurements.
+    settings.startup_mode = "eager"
+    import main as app_main
+
+    app_main.load_models_on_startup()
+    spin(args.warmup_seconds)
+
+    results = {"meta": _meta(args)}
+    micro_rounds, load_rounds = [], []
+    for _ in range(args.rounds):
+        if not args.skip_micro:
+            micro_rounds.append(run_micro(args.repeats))
+        if not args.skip_load:
+            load_rounds.append(asyncio.run(run_load(args.requests, args.concurrency)))
+    if micro_rounds:
+        results["micro"] = median_of_rounds(micro_rounds)
+    if load_rounds:
+        results["load"] = median_of_rounds(load_rounds)
+    results["memory"] = rss_mb()
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    failed = [
+        f"load {name}: {entry['failed']} failed requests"
+        for name, entry in results.get("load", {}).items()
+        if entry["failed"]
+    ]
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold, args.min_delta_ms)
+        print(f"against {args.baseline} (threshold {args.threshold:.0%}): {len(regressions)} regressions")
+    for line in failed + regressions:
+        print("  " + line)
+    if failed or regressions:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Native NumPy tree engine: parity with `XGBClassifier.predict_proba` and
+latency against it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tree_ensemble
+
+Parity is checked on the full dataset, plus a stress matrix that injects
+missing values (default-direction routing) and values sitting exactly on
+split thresholds (tie routing). Exits non-zero if any probability differs
+by more than --tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks._common import dataset_model_matrix, summarize_ms
+from models.loader import get_ml_artifacts
+
+
+def _stress_matrix(X: np.ndarray, ensemble, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    stressed = X.copy()
+    stressed[rng.random(X.shape) < 0.1] = np.nan
+    splits = ensemble.feature >= 0
+    split_features, split_thresholds = ensemble.feature[splits], ensemble.threshold[splits]
+    picks = rng.integers(0, len(split_features), size=len(X))
+    stressed[np.arange(len(X)), split_features[picks]] = split_thresholds[picks]
+    return stressed
+
+
+def _latency(fn, X: np.ndarray, repeats: int) -> dict:
+    samples = []
+    for i in range(repeats):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - start)
+    return summarize_ms(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    artifacts = get_ml_artifacts()
+    ensemble, xgb_model = artifacts.tree_ensemble, artifacts.xgb_model
+    X = dataset_model_matrix()
+
+    parity = {}
+    for label, matrix in (("dataset", X), ("stress_nan_and_ties", _stress_matrix(X, ensemble))):
+        expected = xgb_model.predict_proba(matrix)[:, 1]
+        actual = ensemble.predict_proba(matrix)[:, 1]
+        parity[label] = {"rows": len(matrix), "max_abs_diff": float(np.max(np.abs(expected - actual)))}
+
+    big = np.repeat(X, 20, axis=0)
+    batch = {}
+    for label, fn in (("xgboost", xgb_model.predict_proba), ("native", ensemble.predict_proba)):
+        start = time.perf_counter()
+        fn(big)
+        batch[label] = {"rows": len(big), "seconds": round(time.perf_counter() - start, 4)}
+
+    results = {
+        "parity": parity,
+        "single_row": {
+            "xgboost": _latency(xgb_model.predict_proba, X, args.repeats),
+            "native": _latency(ensemble.predict_proba, X, args.repeats),
+        },
+        "batch": batch,
+    }
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(p["max_abs_diff"] <= args.tolerance for p in parity.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Native TreeSHAP: parity with `shap.TreeExplainer` and latency against it.
+
+Usage (from backend/, needs requirements-optional.txt for shap):
+    python -m benchmarks.bench_tree_shap
+
+Parity covers the full dataset plus the NaN/threshold-tie stress matrix
+from bench_tree_ensemble, and additivity (SHAP values + expected value ==
+model margin). Exits non-zero if any SHAP value differs by more than
+--tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks._common import dataset_model_matrix
+from benchmarks.bench_tree_ensemble import _stress_matrix
+from models.loader import get_ml_artifacts
+
+
+def _best_ms(fn, X: np.ndarray, repeats: int) -> float:
+    fn(X)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    import shap
+
+    shap_import_s = time.perf_counter() - start
+
+    artifacts = get_ml_artifacts()
+    native = artifacts.tree_explainer
+    reference = shap.TreeExplainer(artifacts.xgb_model)
+    X = dataset_model_matrix()
+
+    parity = {}
+    for label, matrix in (("dataset", X), ("stress_nan_and_ties", _stress_matrix(X, artifacts.tree_ensemble))):
+        expected = np.asarray(reference.shap_values(matrix))
+        actual = native.shap_values(matrix)
+        additivity = actual.sum(axis=1) + native.expected_value - artifacts.tree_ensemble.predict_margin(matrix)
+        parity[label] = {
+            "rows": len(matrix),
+            "max_abs_diff": float(np.max(np.abs(expected - actual))),
+            "max_additivity_error": float(np.max(np.abs(additivity))),
+        }
+
+    latency = {}
+    for n_rows in (1, 500, 5000):
+        matrix = np.resize(X, (n_rows, X.shape[1]))
+        latency[f"{n_rows}_rows_ms"] = {
+            "shap": _best_ms(reference.shap_values, matrix, args.repeats),
+            "native": _best_ms(native.shap_values, matrix, args.repeats),
+        }
+
+    results = {
+        "parity": parity,
+        "latency": latency,
+        "cold_start": {"import_shap_s": round(shap_import_s, 3)},
+    }
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(p["max_abs_diff"] <= args.tolerance for p in parity.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
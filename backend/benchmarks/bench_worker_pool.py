@@ -0,0 +1,75 @@
+"""
+Worker-pool throughput by process count, plus the backpressure check.
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_pool --processes 0 1 2 4 --jobs 400
+
+For each process count (0 = in-process thread pool) it drives single-
+borrower scoring jobs and PDF render jobs through `WorkerPool.run` at a
+fixed concurrency and reports jobs/second. Then it floods a pool past its
+capacity and counts `PoolSaturatedError` rejections (the 503 path).
+Scaling is bounded by the cores available: run it on the deployment
+hardware for meaningful numbers.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks._common import dataset_borrowers, dataset_report_payloads
+from services.worker_pool import PoolSaturatedError, WorkerPool, render_report_pdf_job, score_borrowers_job
+
+
+async def _throughput(pool: WorkerPool, fn, payloads: list, n_jobs: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await pool.run(fn, payloads[i % len(payloads)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_jobs)))
+    return round(n_jobs / (time.perf_counter() - start), 1)
+
+
+async def _saturation(borrowers: list[dict], queue_size: int) -> dict:
+    pool = WorkerPool(processes=0, queue_size=queue_size)
+    n_jobs = pool.capacity * 4
+    outcomes = await asyncio.gather(
+        *(pool.run(score_borrowers_job, [borrowers[i % len(borrowers)]]) for i in range(n_jobs)),
+        return_exceptions=True,
+    )
+    rejected = sum(isinstance(o, PoolSaturatedError) for o in outcomes)
+    return {"submitted": n_jobs, "capacity": pool.capacity, "rejected_503": rejected}
+
+
+async def _run(args) -> dict:
+    borrowers = [[b] for b in dataset_borrowers(200)]
+    reports = dataset_report_payloads(50)
+    results = {"cpu_count": os.cpu_count(), "throughput_jobs_per_s": {}}
+    for processes in args.processes:
+        pool = WorkerPool(processes=processes, queue_size=args.jobs)
+        pool.warm_up()
+        try:
+            results["throughput_jobs_per_s"][f"{processes}_processes"] = {
+                "predict": await _throughput(pool, score_borrowers_job, borrowers, args.jobs, args.concurrency),
+                "pdf": await _throughput(pool, render_report_pdf_job, reports, args.jobs // 4, args.concurrency),
+            }
+        finally:
+            pool.shutdown()
+    results["backpressure"] = await _saturation([b[0] for b in borrowers], queue_size=8)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
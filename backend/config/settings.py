@@ -34,6 +34,139 @@ class Settings(BaseSettings):
     kmeans_path: Path = ml_artifacts_dir / "kmeans.pkl"
     segment_names_path: Path = ml_artifacts_dir / "segment_names.pkl"
     gender_map_path: Path = ml_artifacts_dir / "gender_map.pkl"
+    # Versioned model bundles (models/bundle.py); `CURRENT` in this
+    # directory names the active one. The pickle paths above are only read
+    # when no bundle exists.
+    model_bundles_dir: Path = ml_artifacts_dir / "bundles"
+    # Check every bundle file against its manifest sha256 before loading.
+    model_bundle_verify: bool = True
+    # Poll `CURRENT` this often (seconds) and hot-reload when it names a new
+    # bundle; 0 disables the watcher (POST /admin/model/reload still works).
+    model_watch_interval_seconds: float = 0
+    # Shared secret for the /admin endpoints, sent as `X-Admin-Token`.
+    # Unset disables them.
+    admin_token: str | None = None
+
+    # --- Retraining (retrain.py) ---
+    training_dataset_path: Path = Path(__file__).resolve().parent.parent.parent / "Dataset" / "loan-recovery.csv"
+    # Engineered feature matrices and search checkpoints, keyed by content.
+    training_cache_dir: Path = Path(__file__).resolve().parent.parent / "data" / "training_cache"
+    # CSV rows read at a time by `retrain.py --streaming` (training/streaming.py).
+    training_chunk_rows: int = 50_000
+
+    # --- Inference ---
+    # Which engine scores the XGBoost model: "native" evaluates the exported
+    # trees with NumPy (models/tree_ensemble.py), "xgboost" calls
+    # XGBClassifier.predict_proba. Outputs agree to float32 precision.
+    inference_backend: str = "native"  # native | xgboost
+    # The native engine wins on per-call overhead for a handful of rows;
+    # XGBoost's threaded C++ wins on larger matrices. Batches above this
+    # size always go to XGBoost.
+    native_inference_max_rows: int = 16
+    # Which engine computes SHAP explanations: "native" uses the precomputed
+    # TreeSHAP tables (models/tree_shap.py), "shap" uses shap.TreeExplainer
+    # and needs the optional shap package.
+    shap_backend: str = "native"  # native | shap
+
+    # --- Startup ---
+    # "fast": serve as soon as the single-borrower path is loaded and warm,
+    # then import XGBoost (large batches) and ReportLab (PDFs) on a
+    # background thread. "eager": do both before serving.
+    startup_mode: str = "fast"  # fast | eager
+
+    # --- Observability ---
+    # Serve GET /metrics (Prometheus text format) and time every request.
+    # Pipeline and PDF timers are recorded regardless; they cost about a
+    # microsecond each.
+    metrics_enabled: bool = True
+
+    # --- Response compression ---
+    # gzip or brotli (when the optional brotli package is installed),
+    # negotiated by Accept-Encoding, for JSON, CSV/NDJSON and MessagePack
+    # bodies of at least `compression_min_bytes`. PDFs and ZIPs are sent
+    # as they are. Turn off when a proxy in front already compresses.
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1_024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # --- /predict micro-batching ---
+    # While a scoring call is running, single-borrower /predict calls
+    # arriving within this many milliseconds of each other are scored as
+    # one batch of at most `predict_batch_max_rows` rows (keep it within
+    # `native_inference_max_rows` so batches stay on the native engine).
+    predict_batching_enabled: bool = True
+    predict_batch_max_wait_ms: float = 2.0
+    predict_batch_max_rows: int = 16
+
+    # --- Batch scoring ---
+    # Upper bound on rows accepted by POST /predict/batch in one request.
+    batch_max_rows: int = 50_000
+    # Rows parsed and scored per step by the streaming CSV scorer
+    # (POST /predict/csv and score_csv.py); bounds its memory use.
+    csv_chunk_rows: int = 2_000
+
+    # --- What-if scenarios ---
+    # Upper bound on variants (grid combinations plus listed overrides)
+    # scored by one POST /predict/scenarios request.
+    scenario_max_variants: int = 10_000
+
+    # --- HTTP caching ---
+    # `Cache-Control: max-age` for reference data (GET /dictionary,
+    # /reference/loan-types, /contact/whatsapp-link); after that, clients
+    # revalidate with the ETag and usually get a 304.
+    static_cache_max_age_seconds: int = 86_400
+    # Recovery Insights bundles memoized by a hash of their inputs
+    # (services/analytics_service.memoized_analytics_bundle).
+    analytics_cache_max_entries: int = 4_096
+    analytics_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # --- Portfolio analytics ---
+    # Upper bound on scored borrowers accepted by POST /analytics/portfolio.
+    portfolio_max_borrowers: int = 200_000
+
+    # --- Worker pool ---
+    # Processes for CPU-bound jobs (scoring, SHAP, PDF rendering). 0 runs
+    # them in-process on the thread pool, which suits a single-core host;
+    # on multi-core hosts set this to roughly the core count.
+    worker_processes: int = 0
+    # Jobs allowed to wait for a busy worker before requests get a 503.
+    worker_queue_size: int = 64
+
+    # --- Prediction cache ---
+    # Single-borrower /predict results, keyed by the model inputs and the
+    # artifact version. Clients opt out per request with
+    # `Cache-Control: no-cache` (recompute) or `no-store` (don't cache).
+    prediction_cache_enabled: bool = True
+    prediction_cache_max_entries: int = 10_000
+    # Approximate bound on the memory held by cached results.
+    prediction_cache_max_bytes: int = 32 * 1024 * 1024
+    prediction_cache_ttl_seconds: float = 3_600
+
+    # --- Scored-borrower store ---
+    # Persist every /predict and /predict/batch result by borrower ID
+    # (repository/result_store.py), so /analytics and /report can be
+    # called with just the ID.
+    result_store_enabled: bool = True
+    result_store_path: Path = Path(__file__).resolve().parent.parent / "data" / "scored_borrowers.sqlite3"
+    # The background writer commits up to this many rows per transaction,
+    # waiting at most `result_store_flush_ms` for a batch to fill.
+    result_store_batch_rows: int = 1_000
+    result_store_flush_ms: float = 50.0
+    # Results waiting for the writer; beyond this, new ones are dropped
+    # (and counted) rather than slowing scoring down.
+    result_store_queue_size: int = 100_000
+
+    # --- Bulk reports ---
+    # Upper bound on reports in one POST /report/batch request.
+    report_batch_max: int = 1_000
+    # Merged-PDF mode builds the whole document in memory before sending it,
+    # so it gets a tighter cap than the streamed ZIP.
+    report_merge_max: int = 200
+    # "template" draws reports from a precompiled page layout and falls
+    # back to platypus for any report it can't lay out identically;
+    # "platypus" always uses ReportLab's flow layout.
+    pdf_renderer: str = "template"  # template | platypus
 
     # --- Contact ---
     whatsapp_number: str = "919004001598"  # international format, no '+' or spaces
@@ -0,0 +1,45 @@
+"""
+Convert the legacy pickle artifacts into a versioned model bundle.
+
+    python export_bundle.py                # write and activate a bundle
+    python export_bundle.py --no-activate  # write it, leave CURRENT alone
+
+Reads `xgb_tuned.pkl`, `scaler.pkl`, `kmeans.pkl`, `segment_names.pkl` and
+`gender_map.pkl` from `settings.ml_artifacts_dir` and writes them in the
+bundle format (models/bundle.py) under `settings.model_bundles_dir`.
+Only needed once per set of pickles; `retrain.py` writes bundles directly.
+"""
+import argparse
+import sys
+
+from config.settings import settings
+from models.bundle import write_bundle
+from models.loader import _load_pickle
+from repository.constants import MODEL_FEATURE_ORDER, SEGMENTATION_FEATURE_ORDER
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convert legacy pickle artifacts into a model bundle.")
+    parser.add_argument("--no-activate", action="store_true", help="don't point CURRENT at the new bundle")
+    args = parser.parse_args()
+
+    scaler = _load_pickle(settings.scaler_path)
+    kmeans = _load_pickle(settings.kmeans_path)
+    path = write_bundle(
+        settings.model_bundles_dir,
+        xgb_model=_load_pickle(settings.xgb_model_path),
+        scaler_mean=scaler.mean_,
+        scaler_scale=scaler.scale_,
+        kmeans_centers=kmeans.cluster_centers_,
+        segment_names=_load_pickle(settings.segment_names_path),
+        gender_map=_load_pickle(settings.gender_map_path),
+        model_features=MODEL_FEATURE_ORDER,
+        segmentation_features=SEGMENTATION_FEATURE_ORDER,
+        make_current=not args.no_activate,
+    )
+    print(f"Wrote bundle {path.name} to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
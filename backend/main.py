@@ -1,17 +1,25 @@
 """
 Application entrypoint.
 
-Wires up CORS, route registration, and the startup hook that loads every
-ML artifact exactly once before the app starts serving requests.
+Wires up CORS, response compression, request metrics, route
+registration, and the startup hook that loads every ML artifact exactly
+once, starts the CPU worker pool and warms the prediction path before
+the app starts serving requests (see services/startup_service.py).
 """
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from api.routes import analytics, contact, predict, report
+from api.middleware import CompressionMiddleware, MetricsMiddleware
+from api.routes import admin, analytics, contact, dictionary, predict, reference, report
 from config.settings import settings
-from models.loader import get_ml_artifacts
+from repository.result_store import close_result_store
+from services import metrics, startup_service
+from services.model_lifecycle import stop_bundle_watcher
+from services.scored_borrower_service import BorrowerNotFoundError
+from services.worker_pool import PoolSaturatedError, shutdown_worker_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,21 +33,66 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+if settings.metrics_enabled:
+    # Added last so it is outermost and times everything, CORS included.
+    app.add_middleware(MetricsMiddleware)
 
 
 @app.on_event("startup")
 def load_models_on_startup() -> None:
     """Load all ML artifacts once, at process startup, never per-request."""
-    get_ml_artifacts()
+    startup_service.run_startup()
     logger.info("Startup complete — all ML artifacts loaded.")
 
 
+@app.on_event("shutdown")
+def stop_background_work() -> None:
+    stop_bundle_watcher()
+    shutdown_worker_pool()
+    close_result_store()
+
+
+@app.exception_handler(BorrowerNotFoundError)
+def borrower_not_found_handler(request: Request, exc: BorrowerNotFoundError) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(PoolSaturatedError)
+def pool_saturated_handler(request: Request, exc: PoolSaturatedError) -> JSONResponse:
+    """Backpressure: tell clients to retry instead of queueing without bound."""
+    logger.warning("Rejecting %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/health")
 def health_check() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/health/startup")
+def startup_profile() -> dict:
+    """How long each startup phase took, for diagnosing cold starts."""
+    return startup_service.profile.as_dict()
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    """Request, pipeline, PDF and cache metrics in the Prometheus text format."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 app.include_router(predict.router, prefix=settings.api_v1_prefix)
 app.include_router(analytics.router, prefix=settings.api_v1_prefix)
 app.include_router(report.router, prefix=settings.api_v1_prefix)
 app.include_router(contact.router, prefix=settings.api_v1_prefix)
+app.include_router(admin.router, prefix=settings.api_v1_prefix)
+app.include_router(dictionary.router, prefix=settings.api_v1_prefix)
+app.include_router(reference.router, prefix=settings.api_v1_prefix)
@@ -0,0 +1,311 @@
+"""
+Versioned model bundle: the on-disk format for every ML artifact.
+
+A bundle is one directory:
+
+    manifest.json         format version, bundle version, feature orders,
+                          segment names, gender map, per-file sha256
+    booster.ubj           XGBoost's native UBJSON model (no pickle)
+    scaler_mean.npy       StandardScaler mean_, float64
+    scaler_scale.npy      StandardScaler scale_, float64
+    kmeans_centers.npy    KMeans cluster_centers_, float64
+    tree.*.npy            the booster precompiled for the native engine
+    shap.*.npy            (models/tree_ensemble.py, models/tree_shap.py);
+                          omitted if the model can't be exported
+
+Bundles live side by side under `settings.model_bundles_dir`, each in a
+directory named after its version, and the one-line `CURRENT` file names
+the active one. `write_bundle` only flips `CURRENT` (with an atomic
+rename) once the new bundle is complete, so readers see either the old
+bundle or the new one, never half of each.
+
+The `.npy` arrays are opened with `np.load(mmap_mode="r")`: every worker
+process maps the same page-cache pages instead of holding a private
+unpickled copy. Nothing in a bundle is executable, unlike a pickle.
+
+Because the native engine's arrays are precompiled, opening a bundle
+doesn't need XGBoost at all: `read_bundle` returns the booster's path and
+the caller decides when to pay for `import xgboost` (see `load_booster`).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from models.tree_ensemble import TreeEnsemble, UnsupportedModelError
+from models.tree_shap import PathTreeExplainer
+
+BUNDLE_FORMAT = "slrs-model-bundle"
+BUNDLE_FORMAT_VERSION = 1
+CURRENT_POINTER = "CURRENT"
+MANIFEST_NAME = "manifest.json"
+
+_BOOSTER_FILE = "booster.ubj"
+_ARRAY_FILES = {
+    "scaler_mean": "scaler_mean.npy",
+    "scaler_scale": "scaler_scale.npy",
+    "kmeans_centers": "kmeans_centers.npy",
+}
+
+
+class BundleError(ValueError):
+    """The bundle is missing, incomplete, corrupt, or of an unknown format."""
+
+
+@dataclass(frozen=True)
+class StandardScalerParams:
+    """`StandardScaler.transform` from its fitted mean and scale."""
+
+    mean: np.ndarray
+    scale: np.ndarray
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+
+@dataclass(frozen=True)
+class NearestCentroids:
+    """`KMeans.predict` from its fitted cluster centers."""
+
+    centers: np.ndarray
+
+    @property
+    def n_clusters(self) -> int:
+        return self.centers.shape[0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        squared_distances = ((X[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2)
+        return squared_distances.argmin(axis=1).astype(np.int32)
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything read from one bundle directory."""
+
+    path: Path
+    version: str
+    booster_path: Path
+    scaler: StandardScalerParams
+    kmeans: NearestCentroids
+    segment_names: dict[int, str]
+    gender_map: dict[str, int]
+    model_features: list[str]
+    segmentation_features: list[str]
+    tree_ensemble: TreeEnsemble | None = None
+    tree_explainer: PathTreeExplainer | None = None
+
+
+def load_booster(path: Path) -> Any:
+    """Load a bundle's `booster.ubj` as an `XGBClassifier` (this imports xgboost)."""
+    from xgboost import XGBClassifier
+
+    xgb_model = XGBClassifier()
+    xgb_model.load_model(path)
+    return xgb_model
+
+
+def _save_native(staging: Path, prefix: str, obj: Any) -> dict:
+    """Save a frozen dataclass's array fields as `<prefix>.<field>.npy`; returns its scalar fields."""
+    scalars = {}
+    for field in fields(obj):
+        value = getattr(obj, field.name)
+        if isinstance(value, np.ndarray):
+            np.save(staging / f"{prefix}.{field.name}.npy", value)
+        else:
+            scalars[field.name] = value
+    return scalars
+
+
+def _load_native(path: Path, prefix: str, cls: type, scalars: dict) -> Any:
+    arrays = {
+        field.name: np.load(path / f"{prefix}.{field.name}.npy", mmap_mode="r")
+        for field in fields(cls)
+        if field.name not in scalars
+    }
+    return cls(**arrays, **scalars)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bundle_version(manifest: dict) -> str:
+    """Content hash over the file checksums and metadata (not the timestamp)."""
+    content = {k: v for k, v in manifest.items() if k not in ("version", "created_at")}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def write_bundle(
+    bundles_dir: Path,
+    *,
+    xgb_model: Any,
+    scaler_mean: np.ndarray,
+    scaler_scale: np.ndarray,
+    kmeans_centers: np.ndarray,
+    segment_names: dict[int, str],
+    gender_map: dict[str, int],
+    model_features: list[str],
+    segmentation_features: list[str],
+    make_current: bool = True,
+) -> Path:
+    """
+    Write a new bundle under `bundles_dir` and (by default) make it current.
+
+    `xgb_model` is an `XGBClassifier`; its `save_model` output keeps the
+    sklearn wrapper's attributes, so it loads back as the same classifier.
+    Returns the bundle's directory.
+    """
+    bundles_dir = Path(bundles_dir)
+    bundles_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=bundles_dir))
+    try:
+        staging.chmod(0o755)  # mkdtemp creates it private to this user
+        xgb_model.save_model(staging / _BOOSTER_FILE)
+        arrays = {"scaler_mean": scaler_mean, "scaler_scale": scaler_scale, "kmeans_centers": kmeans_centers}
+        for name, filename in _ARRAY_FILES.items():
+            np.save(staging / filename, np.ascontiguousarray(arrays[name], dtype=np.float64))
+        native = _precompile_native(staging, xgb_model)
+
+        manifest: dict[str, Any] = {
+            "format": BUNDLE_FORMAT,
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "model_features": list(model_features),
+            "segmentation_features": list(segmentation_features),
+            "segment_names": {str(k): v for k, v in sorted(segment_names.items())},
+            "gender_map": dict(gender_map),
+            "native": native,
+            "files": {
+                p.name: {"sha256": _sha256(p), "bytes": p.stat().st_size}
+                for p in sorted(staging.iterdir())
+            },
+        }
+        manifest["version"] = _bundle_version(manifest)
+        manifest["created_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+        target = bundles_dir / manifest["version"]
+        if target.exists():
+            shutil.rmtree(staging)  # identical content already written earlier
+        else:
+            os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if make_current:
+        set_current_bundle(bundles_dir, target.name)
+    return target
+
+
+def _precompile_native(staging: Path, xgb_model: Any) -> dict:
+    """Export the native engine's arrays; returns their scalar fields for the manifest."""
+    native: dict[str, Any] = {"tree_ensemble": None, "tree_explainer": None}
+    try:
+        ensemble = TreeEnsemble.from_booster(xgb_model)
+    except UnsupportedModelError:
+        return native
+    native["tree_ensemble"] = _save_native(staging, "tree", ensemble)
+    try:
+        native["tree_explainer"] = _save_native(staging, "shap", PathTreeExplainer.from_ensemble(ensemble))
+    except UnsupportedModelError:
+        pass
+    return native
+
+
+def version_dir(bundles_dir: Path, version: str) -> Path:
+    """
+    The directory of bundle `version` in `bundles_dir`. Raises
+    `BundleError` unless `version` is a plain directory name there (no
+    separators, `..` or absolute paths), since it can come from a request.
+    """
+    bundles_dir = Path(bundles_dir)
+    path = bundles_dir / version
+    if (
+        not version
+        or version in (".", "..")
+        or "/" in version
+        or "\\" in version
+        or Path(version).is_absolute()
+        or path.resolve().parent != bundles_dir.resolve()
+    ):
+        raise BundleError(f"invalid bundle version {version!r}")
+    return path
+
+
+def set_current_bundle(bundles_dir: Path, version: str) -> None:
+    """Point `CURRENT` at `version`, atomically."""
+    bundles_dir = Path(bundles_dir)
+    if not (version_dir(bundles_dir, version) / MANIFEST_NAME).is_file():
+        raise BundleError(f"no bundle {version!r} in {bundles_dir}")
+    pointer_tmp = bundles_dir / f".{CURRENT_POINTER}.tmp"
+    pointer_tmp.write_text(version + "\n")
+    os.replace(pointer_tmp, bundles_dir / CURRENT_POINTER)
+
+
+def current_bundle_dir(bundles_dir: Path) -> Path | None:
+    """The directory `CURRENT` points at, or None if there is no bundle yet."""
+    pointer = Path(bundles_dir) / CURRENT_POINTER
+    if not pointer.is_file():
+        return None
+    return Path(bundles_dir) / pointer.read_text().strip()
+
+
+def read_bundle(path: Path, verify: bool = True) -> ModelBundle:
+    """
+    Open the bundle in `path`.
+
+    With `verify`, every file's sha256 is checked against the manifest
+    first. Arrays are memory-mapped read-only; the booster itself is left
+    on disk for `load_booster`.
+    """
+    path = Path(path)
+    try:
+        manifest = json.loads((path / MANIFEST_NAME).read_text())
+    except (OSError, json.JSONDecodeError) as exc:
+        raise BundleError(f"cannot read {path / MANIFEST_NAME}: {exc}") from exc
+    if manifest.get("format") != BUNDLE_FORMAT or manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise BundleError(
+            f"{path} is format {manifest.get('format')!r} v{manifest.get('format_version')}, "
+            f"expected {BUNDLE_FORMAT!r} v{BUNDLE_FORMAT_VERSION}"
+        )
+
+    for filename, entry in manifest["files"].items():
+        file_path = path / filename
+        if not file_path.is_file():
+            raise BundleError(f"{file_path} is missing")
+        if verify and _sha256(file_path) != entry["sha256"]:
+            raise BundleError(f"{file_path} does not match its manifest checksum")
+
+    arrays = {name: np.load(path / filename, mmap_mode="r") for name, filename in _ARRAY_FILES.items()}
+    native = manifest.get("native", {})
+    tree_ensemble = tree_explainer = None
+    if native.get("tree_ensemble") is not None:
+        tree_ensemble = _load_native(path, "tree", TreeEnsemble, native["tree_ensemble"])
+    if native.get("tree_explainer") is not None:
+        tree_explainer = _load_native(path, "shap", PathTreeExplainer, native["tree_explainer"])
+
+    return ModelBundle(
+        path=path,
+        version=manifest["version"],
+        booster_path=path / _BOOSTER_FILE,
+        scaler=StandardScalerParams(mean=arrays["scaler_mean"], scale=arrays["scaler_scale"]),
+        kmeans=NearestCentroids(centers=arrays["kmeans_centers"]),
+        segment_names={int(k): v for k, v in manifest["segment_names"].items()},
+        gender_map=dict(manifest["gender_map"]),
+        model_features=list(manifest["model_features"]),
+        segmentation_features=list(manifest["segmentation_features"]),
+        tree_ensemble=tree_ensemble,
+        tree_explainer=tree_explainer,
+    )
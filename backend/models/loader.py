@@ -1,30 +1,100 @@
 """
 Centralized ML artifact loader.
 
-All pickle files are loaded exactly once, at application startup, and held
-in memory for the lifetime of the process. No service or route ever opens a
-pickle file directly — they all go through `get_ml_artifacts()`.
+All artifacts are loaded exactly once, at application startup, and held in
+memory for the lifetime of the process. No service or route ever opens an
+artifact file directly — they all go through `get_ml_artifacts()`.
+
+Artifacts come from the current versioned bundle under
+`settings.model_bundles_dir` (see models/bundle.py). The loose pickle files
+the app originally shipped with are only read when no bundle exists yet;
+`export_bundle.py` converts them.
+
+A new bundle can be swapped in while the app is serving (see
+services/model_lifecycle.py). The swap replaces one reference, so a
+request keeps whichever `MLArtifacts` it started with until it finishes.
 """
+import hashlib
 import logging
 import pickle
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from config.settings import settings
+from models.bundle import MANIFEST_NAME, BundleError, current_bundle_dir, load_booster, read_bundle, version_dir
+from models.centroid_segmenter import CentroidSegmenter
+from models.tree_ensemble import TreeEnsemble, UnsupportedModelError
+from models.tree_shap import PathTreeExplainer
+from repository.constants import MODEL_FEATURE_ORDER, SEGMENTATION_FEATURE_ORDER
 
 logger = logging.getLogger(__name__)
 
 
+class LazyModel:
+    """
+    The XGBoost classifier, loaded on first use.
+
+    Single-row scoring and SHAP run on the precompiled native arrays, so
+    `import xgboost` (and the sklearn/pandas/scipy it pulls in, about a
+    second) is kept off the startup path until something needs the
+    booster itself: a large batch, the shap package, or a deliberate
+    preload. Thread-safe.
+    """
+
+    def __init__(self, load: Callable[[], Any]) -> None:
+        self._load = load
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, model: Any) -> "LazyModel":
+        """An already-loaded model."""
+        lazy = cls(lambda: model)
+        lazy._model = model
+        return lazy
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> Any:
+        model = self._model
+        if model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+                model = self._model
+        return model
+
+
 @dataclass(frozen=True)
 class MLArtifacts:
     """Bundle of every ML artifact the app needs, loaded once."""
 
-    xgb_model: Any
+    xgb_model_source: LazyModel
     scaler: Any
     kmeans: Any
     segment_names: dict[int, str]
     gender_map: dict[str, int]
+    # Bundle version (a content hash), so anything derived from a
+    # particular model (e.g. cached predictions) can tell versions apart.
+    version: str = ""
+    # Native NumPy export of xgb_model (see models/tree_ensemble.py); None
+    # if the model uses something the native engine doesn't support.
+    tree_ensemble: TreeEnsemble | None = None
+    # Precomputed TreeSHAP tables over tree_ensemble (see models/tree_shap.py).
+    tree_explainer: PathTreeExplainer | None = None
+    # scaler + kmeans folded into one nearest-centroid step
+    # (see models/centroid_segmenter.py); always set by `_assemble_artifacts`.
+    segmenter: CentroidSegmenter | None = None
+
+    @property
+    def xgb_model(self) -> Any:
+        """The `XGBClassifier`, loaded on first access (see `LazyModel`)."""
+        return self.xgb_model_source.get()
 
 
 def _load_pickle(path) -> Any:
@@ -32,35 +102,249 @@ def _load_pickle(path) -> Any:
         return pickle.load(f)
 
 
-@lru_cache
+def _legacy_pickle_version(paths) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# The active artifacts, plus the version(s) they recently replaced: jobs
+# routed to a version just before a swap can still find it and finish on
+# the model they were sent to.
+_RECENT_VERSIONS = 2
+_artifacts_lock = threading.Lock()
+_current: MLArtifacts | None = None
+_recent: OrderedDict[str, MLArtifacts] = OrderedDict()
+# Set in worker processes only (see `follow_routed_versions`).
+_follow_routed_versions = False
+
+
+def _remember(artifacts: MLArtifacts) -> None:
+    _recent[artifacts.version] = artifacts
+    _recent.move_to_end(artifacts.version)
+    while len(_recent) > _RECENT_VERSIONS:
+        _recent.popitem(last=False)
+
+
+def _install(artifacts: MLArtifacts) -> None:
+    global _current
+    _remember(artifacts)
+    _current = artifacts
+
+
+def follow_routed_versions() -> None:
+    """
+    Make `get_ml_artifacts_version` activate the versions it loads. Only
+    worker processes call this (services/worker_pool.py): their active
+    version should follow the app's, which they learn from the jobs
+    routed to them. In the app process a reload is the only way to
+    change the active version.
+    """
+    global _follow_routed_versions
+    _follow_routed_versions = True
+
+
 def get_ml_artifacts() -> MLArtifacts:
     """
-    Load and cache all ML artifacts.
+    The active ML artifacts.
+
+    Effectively a singleton: the first call (triggered from the FastAPI
+    startup hook) does the real disk I/O, every subsequent call across the
+    app just returns the same objects until a reload swaps in new ones.
+    """
+    artifacts = _current
+    if artifacts is None:
+        with _artifacts_lock:
+            if _current is None:
+                _install(load_ml_artifacts())
+            artifacts = _current
+    return artifacts
+
 
-    Cached with lru_cache so this is effectively a singleton: the first
-    call (triggered from the FastAPI startup hook) does the real disk I/O,
-    every subsequent call across the app just returns the same objects.
+def get_ml_artifacts_version(version: str) -> MLArtifacts:
     """
+    The artifacts for a specific version: the active one, one it recently
+    replaced, or else that bundle loaded from disk. Jobs use this to score
+    on the version the app routed them to. A bundle loaded here is only
+    made active in worker processes (see `follow_routed_versions`); in the
+    app it is kept with the recent versions, and the active one stays.
+    """
+    artifacts = _recent.get(version)
+    if artifacts is not None:
+        return artifacts
+    with _artifacts_lock:
+        artifacts = _recent.get(version)
+        bundle_dir = version_dir(settings.model_bundles_dir, version)
+        if artifacts is None and (bundle_dir / MANIFEST_NAME).is_file():
+            artifacts = load_ml_artifacts(bundle_dir)
+            if _follow_routed_versions:
+                _install(artifacts)
+            else:
+                _remember(artifacts)
+    return artifacts if artifacts is not None else get_ml_artifacts()
+
+
+def swap_ml_artifacts(artifacts: MLArtifacts) -> MLArtifacts | None:
+    """Make `artifacts` the active set; returns the set it replaced."""
+    with _artifacts_lock:
+        previous = _current
+        _install(artifacts)
+    return previous
+
+
+def load_ml_artifacts(bundle_dir: Path | None = None) -> MLArtifacts:
+    """
+    Load a fresh `MLArtifacts` from `bundle_dir`, or from the current
+    bundle if not given (falling back to the legacy pickles if there is
+    none). Uncached; the app goes through `get_ml_artifacts()`.
+    """
+    if bundle_dir is None:
+        bundle_dir = current_bundle_dir(settings.model_bundles_dir)
+    if bundle_dir is None:
+        logger.warning(
+            "No model bundle in %s; loading legacy pickles. Run export_bundle.py to convert them.",
+            settings.model_bundles_dir,
+        )
+        return _load_legacy_pickles()
+
+    logger.info("Loading ML artifacts from bundle %s", bundle_dir)
+    bundle = read_bundle(bundle_dir, verify=settings.model_bundle_verify)
+    if bundle.model_features != MODEL_FEATURE_ORDER:
+        raise BundleError(f"bundle {bundle.version} was trained on features {bundle.model_features}")
+    if bundle.segmentation_features != SEGMENTATION_FEATURE_ORDER:
+        raise BundleError(f"bundle {bundle.version} segments on features {bundle.segmentation_features}")
+    return _assemble_artifacts(
+        xgb_model_source=LazyModel(lambda: load_booster(bundle.booster_path)),
+        scaler=bundle.scaler,
+        kmeans=bundle.kmeans,
+        segment_names=bundle.segment_names,
+        gender_map=bundle.gender_map,
+        version=bundle.version,
+        tree_ensemble=bundle.tree_ensemble,
+        tree_explainer=bundle.tree_explainer,
+    )
+
+
+def _load_legacy_pickles() -> MLArtifacts:
     logger.info("Loading ML artifacts from %s", settings.ml_artifacts_dir)
+    paths = [
+        settings.xgb_model_path,
+        settings.scaler_path,
+        settings.kmeans_path,
+        settings.segment_names_path,
+        settings.gender_map_path,
+    ]
+    xgb_model, scaler, kmeans, segment_names, gender_map = (_load_pickle(path) for path in paths)
+    return _assemble_artifacts(
+        xgb_model_source=LazyModel.of(xgb_model),
+        scaler=scaler,
+        kmeans=kmeans,
+        segment_names=segment_names,
+        gender_map=gender_map,
+        version=_legacy_pickle_version(paths),
+    )
+
 
-    xgb_model = _load_pickle(settings.xgb_model_path)
-    scaler = _load_pickle(settings.scaler_path)
-    kmeans = _load_pickle(settings.kmeans_path)
-    segment_names = _load_pickle(settings.segment_names_path)
-    gender_map = _load_pickle(settings.gender_map_path)
+def _assemble_artifacts(
+    *,
+    xgb_model_source: LazyModel,
+    scaler: Any,
+    kmeans: Any,
+    segment_names: dict[int, str],
+    gender_map: dict[str, int],
+    version: str,
+    tree_ensemble: TreeEnsemble | None = None,
+    tree_explainer: PathTreeExplainer | None = None,
+) -> MLArtifacts:
+    # Bundles ship these precompiled; otherwise they're built from the booster.
+    if tree_ensemble is None:
+        tree_ensemble = _export_tree_ensemble(xgb_model_source.get())
+    if tree_explainer is None:
+        tree_explainer = _build_tree_explainer(tree_ensemble)
 
     logger.info(
-        "ML artifacts loaded: model=%s, scaler=%s, kmeans(k=%s), %d segments",
-        type(xgb_model).__name__,
+        "ML artifacts loaded (version %s): booster %s, scaler=%s, kmeans(k=%s), %d segments",
+        version,
+        "loaded" if xgb_model_source.is_loaded else "deferred",
         type(scaler).__name__,
         getattr(kmeans, "n_clusters", "?"),
         len(segment_names),
     )
 
     return MLArtifacts(
-        xgb_model=xgb_model,
+        xgb_model_source=xgb_model_source,
         scaler=scaler,
         kmeans=kmeans,
         segment_names=segment_names,
         gender_map=gender_map,
+        version=version,
+        tree_ensemble=tree_ensemble,
+        tree_explainer=tree_explainer,
+        segmenter=CentroidSegmenter.from_fitted(scaler, kmeans),
     )
+
+
+def _export_tree_ensemble(xgb_model: Any) -> TreeEnsemble | None:
+    try:
+        return TreeEnsemble.from_booster(xgb_model)
+    except UnsupportedModelError as exc:
+        logger.warning("Native tree engine unavailable (%s); scoring falls back to XGBoost.", exc)
+        return None
+
+
+def _build_tree_explainer(tree_ensemble: TreeEnsemble | None) -> PathTreeExplainer | None:
+    if tree_ensemble is None:
+        return None
+    try:
+        return PathTreeExplainer.from_ensemble(tree_ensemble)
+    except UnsupportedModelError as exc:
+        logger.warning("Native TreeSHAP unavailable (%s); explanations fall back to the shap package.", exc)
+        return None
+
+
+# When the shap package is used, its TreeExplainer walks the whole tree
+# ensemble when it is built, so it is built once per model object and
+# reused. The slot holds the model it was built from, so a different
+# `xgb_model` (e.g. after a retrain) gets a fresh explainer instead of a
+# stale one.
+_explainer_lock = threading.Lock()
+_explainer_slot: tuple[Any, Any] | None = None
+
+
+def get_shap_explainer(artifacts: MLArtifacts) -> Any:
+    """
+    Return the explainer used for `artifacts.xgb_model`.
+
+    With `settings.shap_backend == "native"` (the default) this is the
+    precomputed `PathTreeExplainer` built at load time, so the `shap`
+    package is never imported. Otherwise, or if the model couldn't be
+    exported, it is a `shap.TreeExplainer` built lazily on first use and
+    rebuilt only when the model object changes. Thread-safe: concurrent
+    first requests build it once.
+    """
+    global _explainer_slot
+
+    if settings.shap_backend == "native" and artifacts.tree_explainer is not None:
+        return artifacts.tree_explainer
+
+    slot = _explainer_slot
+    if slot is not None and slot[0] is artifacts.xgb_model:
+        return slot[1]
+
+    with _explainer_lock:
+        slot = _explainer_slot
+        if slot is None or slot[0] is not artifacts.xgb_model:
+            try:
+                import shap  # optional dependency, see requirements-optional.txt
+            except ImportError as exc:
+                raise RuntimeError(
+                    "The shap package is required for SHAP_BACKEND=shap or for models the native "
+                    "TreeSHAP engine can't export; install requirements-optional.txt."
+                ) from exc
+
+            logger.info("Building SHAP TreeExplainer for %s", type(artifacts.xgb_model).__name__)
+            slot = (artifacts.xgb_model, shap.TreeExplainer(artifacts.xgb_model))
+            _explainer_slot = slot
+    return slot[1]
@@ -0,0 +1,157 @@
+"""
+Native NumPy inference for the XGBoost risk model.
+
+`XGBClassifier.predict_proba` pays for the sklearn wrapper, a DMatrix
+build and XGBoost's thread pool on every call — fixed overhead that
+dominates when scoring one 1x10 row. `TreeEnsemble` exports the booster
+once into flat, padded per-node arrays (feature index, threshold,
+left/right child, default direction, leaf value, cover) and evaluates all
+trees for all rows together with vectorized NumPy traversal.
+
+Only what this app's model uses is supported: a `gbtree` booster with the
+`binary:logistic` objective and numerical splits. `from_booster` raises
+`UnsupportedModelError` for anything else, and the loader then falls back
+to XGBoost itself.
+"""
+import json
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+class UnsupportedModelError(ValueError):
+    """The booster uses a feature the native engine does not implement."""
+
+
+@dataclass(frozen=True)
+class TreeEnsemble:
+    """
+    Flat array form of a binary-logistic tree ensemble.
+
+    Every per-node array has shape (n_trees, max_nodes); trees smaller than
+    `max_nodes` are padded with leaf nodes that are never reached. Leaves
+    have `feature == -1` and their output in `value`.
+    """
+
+    feature: np.ndarray  # int32, split feature index, -1 for leaves
+    threshold: np.ndarray  # float32, go left when x < threshold
+    left: np.ndarray  # int32
+    right: np.ndarray  # int32
+    default_left: np.ndarray  # bool, direction taken by missing (NaN) values
+    value: np.ndarray  # float32, leaf output (0 for internal nodes)
+    cover: np.ndarray  # float32, sum of hessians reaching the node
+    base_margin: float
+    max_depth: int
+    n_features: int
+
+    @property
+    def n_trees(self) -> int:
+        return self.feature.shape[0]
+
+    @classmethod
+    def from_booster(cls, booster: Any) -> "TreeEnsemble":
+        """Export an `xgboost.Booster` (or an `XGBClassifier`) into flat arrays."""
+        if hasattr(booster, "get_booster"):
+            booster = booster.get_booster()
+        learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise UnsupportedModelError(f"objective {objective!r} is not supported")
+        gradient_booster = learner["gradient_booster"]
+        if gradient_booster["name"] != "gbtree":
+            raise UnsupportedModelError(f"booster {gradient_booster['name']!r} is not supported")
+
+        trees = gradient_booster["model"]["trees"]
+        if not trees:
+            raise UnsupportedModelError("booster has no trees")
+        if any(any(tree["split_type"]) for tree in trees):
+            raise UnsupportedModelError("categorical splits are not supported")
+
+        n_trees = len(trees)
+        max_nodes = max(len(tree["left_children"]) for tree in trees)
+        feature = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        left = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        right = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        default_left = np.zeros((n_trees, max_nodes), dtype=bool)
+        value = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        cover = np.zeros((n_trees, max_nodes), dtype=np.float32)
+
+        for t, tree in enumerate(trees):
+            n_nodes = len(tree["left_children"])
+            left_children = np.asarray(tree["left_children"], dtype=np.int32)
+            is_leaf = left_children == -1
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+
+            feature[t, :n_nodes] = np.where(is_leaf, -1, tree["split_indices"])
+            threshold[t, :n_nodes] = np.where(is_leaf, 0.0, conditions)
+            left[t, :n_nodes] = np.where(is_leaf, 0, left_children)
+            right[t, :n_nodes] = np.where(is_leaf, 0, tree["right_children"])
+            default_left[t, :n_nodes] = np.asarray(tree["default_left"], dtype=bool)
+            value[t, :n_nodes] = np.where(is_leaf, conditions, 0.0)
+            cover[t, :n_nodes] = tree["sum_hessian"]
+
+        base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            left=left,
+            right=right,
+            default_left=default_left,
+            value=value,
+            cover=cover,
+            base_margin=math.log(base_score / (1 - base_score)),
+            max_depth=_max_depth(feature, left, right),
+            n_features=int(learner["learner_model_param"]["num_feature"]),
+        )
+
+    def leaf_indices(self, X: np.ndarray) -> np.ndarray:
+        """(N, n_trees) index of the leaf each row lands in, per tree."""
+        # XGBoost compares in float32; matching that keeps threshold ties identical.
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features)
+        n_rows, max_nodes = X.shape[0], self.feature.shape[1]
+        tree_offsets = np.arange(self.n_trees, dtype=np.intp) * max_nodes
+        feature, threshold = self.feature.ravel(), self.threshold.ravel()
+        left, right, default_left = self.left.ravel(), self.right.ravel(), self.default_left.ravel()
+        row_offsets = np.arange(n_rows, dtype=np.intp)[:, None] * self.n_features
+
+        node = np.zeros((n_rows, self.n_trees), dtype=np.intp)
+        flat_X = X.ravel()
+        for _ in range(self.max_depth):
+            flat_node = tree_offsets + node
+            split_feature = feature[flat_node]
+            x = flat_X[row_offsets + np.maximum(split_feature, 0)]
+            go_left = np.where(np.isnan(x), default_left[flat_node], x < threshold[flat_node])
+            child = np.where(go_left, left[flat_node], right[flat_node])
+            node = np.where(split_feature < 0, node, child)
+        return node
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """Raw log-odds score per row (XGBoost's `output_margin=True`)."""
+        node = self.leaf_indices(X)
+        tree_offsets = np.arange(self.n_trees, dtype=np.intp) * self.feature.shape[1]
+        leaf_values = self.value.ravel()[tree_offsets + node]
+        return leaf_values.sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """(N, 2) class probabilities, same layout as `XGBClassifier.predict_proba`."""
+        positive = 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+
+def _max_depth(feature: np.ndarray, left: np.ndarray, right: np.ndarray) -> int:
+    """Deepest root-to-leaf edge count over all trees."""
+    deepest = 0
+    for t in range(feature.shape[0]):
+        stack = [(0, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if feature[t, node] < 0:
+                deepest = max(deepest, depth)
+            else:
+                stack.append((int(left[t, node]), depth + 1))
+                stack.append((int(right[t, node]), depth + 1))
+    return deepest
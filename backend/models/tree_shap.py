@@ -0,0 +1,183 @@
+"""
+Exact path-dependent TreeSHAP over the exported tree arrays, without the
+`shap` package.
+
+For one root-to-leaf path with unique split features P (|P| = d), feature
+i's share of the leaf value v is
+
+    v * (o_i - z_i) * sum_{S subset of P minus i}  |S|! (d - |S| - 1)! / d!
+                                  * prod_{j in S} o_j * prod_{j not in S, j != i} z_j
+
+where z_j is the fraction of training cover that follows the path's edges
+on feature j, and o_j is 1 if the row follows all of them, else 0. This is
+the same quantity `shap.TreeExplainer` computes for tree models by
+default ("tree_path_dependent").
+
+Because every o_j is 0 or 1, a path has only 2^d possible o-patterns. For
+a depth-5 model that is at most 32 patterns per path, so every path's
+per-feature contribution is precomputed once at load time for every
+pattern. Explaining N rows is then: test each row against each path's
+per-feature intervals, turn the pass/fail bits into a pattern index,
+gather the precomputed contributions and sum them per feature. All of it
+is vectorized over rows and paths.
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.tree_ensemble import TreeEnsemble, UnsupportedModelError
+
+# Precomputed tables grow as 2^depth per path; beyond this many unique
+# features on one path the `shap` package is the better tool.
+MAX_PATH_FEATURES = 10
+
+
+@dataclass(frozen=True)
+class PathTreeExplainer:
+    """
+    Precomputed TreeSHAP tables for every root-to-leaf path of an ensemble.
+
+    Per-path arrays have shape (n_paths, max_path_features); unused slots
+    are padded so they never match (`lower` = +inf) and contribute nothing.
+    """
+
+    feature: np.ndarray  # int32, slot's feature index
+    lower: np.ndarray  # float32, row follows the slot when lower <= x < upper
+    upper: np.ndarray  # float32
+    nan_follows: np.ndarray  # bool, whether a missing value follows the slot
+    contributions: np.ndarray  # float64, (n_paths, 2^max_path_features, max_path_features)
+    expected_value: float
+    n_features: int
+
+    @classmethod
+    def from_ensemble(cls, ensemble: TreeEnsemble) -> "PathTreeExplainer":
+        paths = [path for t in range(ensemble.n_trees) for path in _tree_paths(ensemble, t)]
+        width = max(len(features) for _, features in paths)
+        if width > MAX_PATH_FEATURES:
+            raise UnsupportedModelError(f"paths with {width} unique features are too deep to precompute")
+        width = max(width, 1)
+
+        n_paths = len(paths)
+        feature = np.zeros((n_paths, width), dtype=np.int32)
+        lower = np.full((n_paths, width), np.inf, dtype=np.float32)
+        upper = np.full((n_paths, width), np.inf, dtype=np.float32)
+        nan_follows = np.zeros((n_paths, width), dtype=bool)
+        zero_fraction = np.ones((n_paths, width), dtype=np.float64)
+        valid = np.zeros((n_paths, width), dtype=bool)
+        leaf_value = np.zeros(n_paths, dtype=np.float64)
+
+        for p, (value, features) in enumerate(paths):
+            leaf_value[p] = value
+            for slot, (f, (z, lo, hi, nan_ok)) in enumerate(features.items()):
+                feature[p, slot] = f
+                lower[p, slot], upper[p, slot] = lo, hi
+                nan_follows[p, slot] = nan_ok
+                zero_fraction[p, slot] = z
+                valid[p, slot] = True
+
+        expected_value = ensemble.base_margin + float(np.sum(leaf_value * zero_fraction.prod(axis=1)))
+        return cls(
+            feature=feature,
+            lower=lower,
+            upper=upper,
+            nan_follows=nan_follows,
+            contributions=_contribution_tables(leaf_value, zero_fraction, valid),
+            expected_value=expected_value,
+            n_features=ensemble.n_features,
+        )
+
+    def shap_values(self, X: np.ndarray, chunk_rows: int = 256) -> np.ndarray:
+        """(N, n_features) SHAP values in log-odds space, like `TreeExplainer.shap_values`."""
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features)
+        n_paths, width = self.feature.shape
+        path_index = np.arange(n_paths)[None, :]
+        bit_weights = (1 << np.arange(width)).astype(np.intp)
+        # Scatter matrix from (path, slot) to feature: contributions of padded
+        # slots are always zero, so their feature index doesn't matter.
+        to_feature = np.zeros((n_paths * width, self.n_features), dtype=np.float64)
+        to_feature[np.arange(n_paths * width), self.feature.ravel()] = 1.0
+
+        out = np.empty((len(X), self.n_features), dtype=np.float64)
+        for start in range(0, len(X), chunk_rows):
+            x = X[start : start + chunk_rows][:, self.feature]
+            follows = np.where(np.isnan(x), self.nan_follows, (x >= self.lower) & (x < self.upper))
+            pattern = follows.astype(np.intp) @ bit_weights
+            gathered = self.contributions[path_index, pattern]
+            out[start : start + chunk_rows] = gathered.reshape(len(x), -1) @ to_feature
+        return out
+
+
+def _tree_paths(ensemble: TreeEnsemble, t: int) -> list[tuple[float, dict]]:
+    """
+    Every root-to-leaf path of tree `t` as (leaf value, merged features).
+
+    Merged features map each split feature on the path (in first-seen
+    order) to [zero fraction, lower, upper, missing-follows], combining
+    repeated splits on the same feature into one interval.
+    """
+    feature, threshold = ensemble.feature[t], ensemble.threshold[t]
+    left, right = ensemble.left[t], ensemble.right[t]
+    default_left, cover, value = ensemble.default_left[t], ensemble.cover[t], ensemble.value[t]
+
+    paths = []
+    stack: list[tuple[int, dict]] = [(0, {})]
+    while stack:
+        node, features = stack.pop()
+        f = int(feature[node])
+        if f < 0:
+            paths.append((float(value[node]), features))
+            continue
+        for child, goes_left in ((int(left[node]), True), (int(right[node]), False)):
+            z, lo, hi, nan_ok = features.get(f, (1.0, -np.inf, np.inf, True))
+            z *= float(cover[child]) / float(cover[node])
+            if goes_left:
+                hi = min(hi, float(threshold[node]))
+            else:
+                lo = max(lo, float(threshold[node]))
+            nan_ok = nan_ok and bool(default_left[node]) == goes_left
+            stack.append((child, {**features, f: (z, lo, hi, nan_ok)}))
+    return paths
+
+
+def _contribution_tables(
+    leaf_value: np.ndarray, zero_fraction: np.ndarray, valid: np.ndarray, paths_per_step: int = 512
+) -> np.ndarray:
+    """
+    (n_paths, 2^width, width) contribution of each slot under every
+    follow-pattern, computed with the closed form in the module docstring.
+    """
+    n_paths, width = zero_fraction.shape
+    n_patterns = 1 << width
+    pattern_bits = ((np.arange(n_patterns)[:, None] >> np.arange(width)) & 1).astype(np.float64)
+    unique_counts = valid.sum(axis=1)
+
+    # shapley_weight[p, k] = k! (d - k - 1)! / d! for the path's d unique features.
+    shapley_weight = np.zeros((n_paths, width), dtype=np.float64)
+    for d in np.unique(unique_counts):
+        rows = unique_counts == d
+        for k in range(d):
+            shapley_weight[rows, k] = math.factorial(k) * math.factorial(d - k - 1) / math.factorial(d)
+
+    excluded = np.eye(width, dtype=bool)  # excluded[i, j]: slot j is the one being explained
+    tables = np.empty((n_paths, n_patterns, width), dtype=np.float64)
+    for start in range(0, n_paths, paths_per_step):
+        stop = min(start + paths_per_step, n_paths)
+        z = zero_fraction[start:stop, None, :]  # (P, 1, W)
+        one = pattern_bits[None, :, :] * valid[start:stop, None, :]  # (P, B, W); padded slots never follow
+
+        # poly[p, b, i, k]: coefficient of t^k in prod_{j != i} (z_j + o_j t)
+        poly = np.zeros((stop - start, n_patterns, width, width + 1), dtype=np.float64)
+        poly[..., 0] = 1.0
+        for j in range(width):
+            z_j = np.where(excluded[:, j], 1.0, z[..., j, None])  # (P, B or 1, W)
+            o_j = np.where(excluded[:, j], 0.0, one[..., j, None])
+            shifted = np.zeros_like(poly)
+            shifted[..., 1:] = poly[..., :-1]
+            poly = poly * z_j[..., None] + shifted * o_j[..., None]
+
+        weighted = np.einsum("pbik,pk->pbi", poly[..., :width], shapley_weight[start:stop])
+        tables[start:stop] = (
+            leaf_value[start:stop, None, None] * (one - z) * weighted * valid[start:stop, None, :]
+        )
+    return tables
@@ -0,0 +1,265 @@
+"""
+Persistent store of scored borrowers (SQLite, WAL mode).
+
+Every `/predict` and `/predict/batch` result is kept under its borrower ID
+(`utils.borrower_id.generate_borrower_id`), so later calls (the analytics
+dashboard, the PDF report) can send just the ID instead of the whole
+result.
+
+Writes never happen on the request path. `put_many` only appends to an
+in-memory queue; one writer thread drains it and commits up to
+`batch_rows` rows per transaction, waiting at most `flush_seconds` for a
+batch to fill. Rows still queued are served from memory by `get`, so a
+report requested right after its prediction finds it. If the queue is
+full (the disk can't keep up), new rows are dropped and counted rather
+than slowing scoring down.
+
+Readers use their own connection per thread; WAL lets them read while the
+writer commits. Besides the primary key, the table is indexed on risk
+category, segment, days past due and scoring time, the filters `find`
+offers.
+"""
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scored_borrowers (
+    borrower_id      TEXT PRIMARY KEY,
+    scored_at        REAL NOT NULL,
+    model_version    TEXT NOT NULL,
+    risk_score       REAL NOT NULL,
+    risk_category    TEXT NOT NULL,
+    segment_name     TEXT NOT NULL,
+    days_past_due    INTEGER NOT NULL,
+    outstanding_loan REAL NOT NULL,
+    result           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_scored_borrowers_risk_category ON scored_borrowers (risk_category, scored_at);
+CREATE INDEX IF NOT EXISTS ix_scored_borrowers_segment ON scored_borrowers (segment_name, scored_at);
+CREATE INDEX IF NOT EXISTS ix_scored_borrowers_days_past_due ON scored_borrowers (days_past_due);
+CREATE INDEX IF NOT EXISTS ix_scored_borrowers_scored_at ON scored_borrowers (scored_at);
+"""
+_INSERT = (
+    "INSERT OR REPLACE INTO scored_borrowers (borrower_id, scored_at, model_version, risk_score, "
+    "risk_category, segment_name, days_past_due, outstanding_loan, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Columns `find` returns: everything indexed, not the full result.
+_SUMMARY_COLUMNS = (
+    "borrower_id",
+    "scored_at",
+    "model_version",
+    "risk_score",
+    "risk_category",
+    "segment_name",
+    "days_past_due",
+    "outstanding_loan",
+)
+_STOP = object()
+
+
+def _row(scored_at: float, result: Mapping[str, Any]) -> tuple:
+    return (
+        result["borrower_id"],
+        scored_at,
+        result["model_version"],
+        result["risk_score"],
+        result["risk_category"],
+        result["segment"]["segment_name"],
+        result["calculated"]["days_past_due"],
+        result["input"]["outstanding_loan"],
+        json.dumps(result, separators=(",", ":")),
+    )
+
+
+class ResultStore:
+    """
+    Scored results keyed by borrower ID: `put_many` queues, a writer
+    thread commits, `get`/`find` read. Results are `PredictionResult`
+    shaped dicts (JSON-ready values).
+    """
+
+    def __init__(self, path: Path, batch_rows: int, flush_seconds: float, queue_size: int) -> None:
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        # Queued, not yet committed: borrower_id -> (scored_at, result).
+        self._unflushed: dict[str, tuple[float, Mapping[str, Any]]] = {}
+        self._unflushed_lock = threading.Lock()
+        self._readers = threading.local()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        # WAL only needs NORMAL to be durable against application crashes.
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def put_many(self, results: Iterable[Mapping[str, Any]]) -> None:
+        """Queue results for writing; never blocks. Later results replace earlier ones with the same ID."""
+        scored_at = time.time()
+        for result in results:
+            entry = (scored_at, result)
+            with self._unflushed_lock:
+                self._unflushed[result["borrower_id"]] = entry
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                with self._unflushed_lock:
+                    if self._unflushed.get(result["borrower_id"]) is entry:
+                        del self._unflushed[result["borrower_id"]]
+                self.dropped += 1
+
+    def get(self, borrower_id: str) -> dict | None:
+        """The latest stored result for `borrower_id`, or None."""
+        with self._unflushed_lock:
+            entry = self._unflushed.get(borrower_id)
+        if entry is not None:
+            return json.loads(json.dumps(entry[1]))
+        row = self._reader().execute(
+            "SELECT result FROM scored_borrowers WHERE borrower_id = ?", (borrower_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(
+        self,
+        *,
+        risk_category: str | None = None,
+        segment_name: str | None = None,
+        min_days_past_due: int | None = None,
+        since: float | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Summaries of committed results matching every given filter, newest first."""
+        clauses, params = [], []
+        for clause, value in (
+            ("risk_category = ?", risk_category),
+            ("segment_name = ?", segment_name),
+            ("days_past_due >= ?", min_days_past_due),
+            ("scored_at >= ?", since),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader().execute(
+            f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM scored_borrowers {where} ORDER BY scored_at DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [dict(zip(_SUMMARY_COLUMNS, row)) for row in rows]
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._readers.connection = self._connect()
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed (or failed)."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit what's queued and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                entry = self._queue.get()
+                if entry is _STOP:
+                    self._queue.task_done()
+                    return
+                batch = [entry]
+                deadline = time.monotonic() + self.flush_seconds
+                stop = False
+                while len(batch) < self.batch_rows:
+                    try:
+                        entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if entry is _STOP:
+                        stop = True
+                        break
+                    batch.append(entry)
+                self._write(connection, batch)
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection: sqlite3.Connection, batch: list[tuple[float, Mapping[str, Any]]]) -> None:
+        try:
+            with connection:
+                connection.executemany(_INSERT, [_row(scored_at, result) for scored_at, result in batch])
+            self.written += len(batch)
+        except Exception:
+            logger.exception("Failed to write %d scored borrowers to %s", len(batch), self.path)
+            self.failed += len(batch)
+        with self._unflushed_lock:
+            for entry in batch:
+                borrower_id = entry[1]["borrower_id"]
+                if self._unflushed.get(borrower_id) is entry:
+                    del self._unflushed[borrower_id]
+
+
+_store: ResultStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """The app-wide store, opened (and its writer started) on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(
+                    settings.result_store_path,
+                    batch_rows=settings.result_store_batch_rows,
+                    flush_seconds=settings.result_store_flush_ms / 1000,
+                    queue_size=settings.result_store_queue_size,
+                )
+    return _store
+
+
+def close_result_store() -> None:
+    """Flush and close the app-wide store if it was opened."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
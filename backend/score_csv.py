@@ -0,0 +1,46 @@
+"""
+Score a portfolio CSV from the command line.
+
+    python score_csv.py ../Dataset/loan-recovery.csv -o scored.csv
+    python score_csv.py portfolio.csv --format ndjson > scored.ndjson
+    cat portfolio.csv | python score_csv.py - > scored.csv
+
+Input is the `Dataset/loan-recovery.csv` schema. The file is streamed in
+fixed-size chunks through the same pipeline as POST /api/v1/predict/csv,
+so memory stays flat regardless of file size.
+"""
+import argparse
+import sys
+
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from services.csv_scoring_service import OUTPUT_FORMATS, CSVSchemaError, stream_scored_records
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Score a loan-recovery CSV in bounded memory.")
+    parser.add_argument("input", help="input CSV path, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output path, or '-' for stdout (default)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=settings.csv_chunk_rows)
+    args = parser.parse_args()
+
+    artifacts = get_ml_artifacts()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        for part in stream_scored_records(artifacts, source, args.format, args.chunk_rows):
+            sink.write(part)
+    except CSVSchemaError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
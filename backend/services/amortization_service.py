@@ -0,0 +1,55 @@
+"""
+Amortization schedules: how each EMI of a reducing-balance loan splits
+into principal and interest, and what remains owed after it.
+
+The schedule is carried forward month by month on paisa-rounded values,
+as a lender's ledger is: each month's interest is the rounded balance
+times the monthly rate, rounded, and the EMI pays that interest first
+and the balance with the rest. A closed form can't be used here: the
+EMI is rounded (`calculate_emi`, same rounding, same None guard), and
+the rounding error compounds by (1 + r)^k, which at high rates over
+long tenures swamps the loan itself.
+
+Every row's principal and interest add up to its payment, and no
+principal or balance is ever negative (the interest on a balance never
+exceeds the EMI). The final row is clamped to pay off exactly what is
+left: when the EMI was rounded up, the loan is cleared early and the
+schedule ends there; when it was rounded down, the last payment is a
+little larger than the EMI.
+"""
+from services.feature_engineering import calculate_emi
+
+
+def build_amortization_schedule(loan_amount: float, interest_rate: float, loan_tenure: int) -> dict | None:
+    """
+    Month-by-month schedule for a loan, as columns (`month`, `payment`,
+    `principal`, `interest`, `balance`) plus the EMI and totals. None
+    wherever `calculate_emi` returns None (a zero amount, rate or tenure).
+    """
+    emi = calculate_emi(loan_amount, interest_rate, loan_tenure)
+    if emi is None:
+        return None
+    r = interest_rate / (12 * 100)
+    columns = {"month": [], "payment": [], "principal": [], "interest": [], "balance": []}
+    balance = round(loan_amount, 2)
+    for month in range(1, int(loan_tenure) + 1):
+        interest = round(balance * r, 2)
+        principal = balance if month == loan_tenure else min(round(emi - interest, 2), balance)
+        balance = round(balance - principal, 2)
+        columns["month"].append(month)
+        columns["payment"].append(round(principal + interest, 2))
+        columns["principal"].append(principal)
+        columns["interest"].append(interest)
+        columns["balance"].append(balance)
+        if balance == 0:
+            break
+    total_payment = round(sum(columns["payment"]), 2)
+    return {
+        "loan_amount": loan_amount,
+        "interest_rate": interest_rate,
+        "loan_tenure": int(loan_tenure),
+        "monthly_emi": emi,
+        "total_payment": total_payment,
+        "total_interest": round(total_payment - loan_amount, 2),
+        "schedule": columns,
+    }
@@ -5,8 +5,35 @@ The original app computed Plotly figures server-side (inside Streamlit).
 Here the backend only computes the underlying numbers; the frontend owns
 all rendering (Recharts/D3/etc.), matching the brief's separation between
 analytics calculations and chart UI.
+
+Two dashboards: the single-borrower Recovery Insights charts
+(`build_analytics_bundle`), built from one prediction's numbers, and the
+portfolio view (`build_portfolio_analytics`), aggregated over many
+already-scored borrowers. The portfolio aggregates are NumPy passes over
+columns (`bincount`, `searchsorted`), so tens of thousands of
+borrowers cost about as much as the JSON that carries them.
+
+A Recovery Insights bundle is a pure function of its seven inputs, and
+the dashboard asks for the same borrower's again and again, so
+`memoized_analytics_bundle` keeps recent bundles under a hash of the
+inputs, along with a digest of the bundle itself for HTTP validators.
 """
-from repository.constants import DASHBOARD_HIGH_RISK_PCT, DASHBOARD_LOW_RISK_PCT
+import hashlib
+import json
+from collections import Counter
+from collections.abc import Sequence
+
+import numpy as np
+
+from config.settings import settings
+from repository.constants import (
+    CRITICAL_DPD_THRESHOLD,
+    DASHBOARD_HIGH_RISK_PCT,
+    DASHBOARD_LOW_RISK_PCT,
+    RECOVERY_STRATEGIES,
+)
+from services.prediction_service import STRATEGY_ORDER, assign_recovery_strategies
+from utils.lru_cache import LRUCache
 
 
 def build_feature_percentage_chart(emi_to_income_ratio: float, collateral_coverage: float) -> dict:
@@ -134,3 +161,192 @@ def build_analytics_bundle(
         "collateral_coverage_insight": collateral_coverage_insight(collateral_coverage),
         "risk_gauge": build_risk_gauge(risk_score),
     }
+
+
+# Same LRU as the prediction cache; bundles never go stale, so no TTL.
+_bundle_cache = LRUCache(
+    max_entries=settings.analytics_cache_max_entries,
+    max_bytes=settings.analytics_cache_max_bytes,
+    ttl_seconds=float("inf"),
+)
+
+
+def _content_hash(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def memoized_analytics_bundle(**inputs) -> tuple[dict, str]:
+    """
+    `build_analytics_bundle(**inputs)` and a content digest of it, from
+    the memo when these inputs were seen before. Inputs are hashed as
+    given, so `60` and `60.0` are separate entries. The bundle is shared:
+    don't mutate it.
+    """
+    key = _content_hash(inputs)
+    entry = _bundle_cache.get(key)
+    if entry is None:
+        bundle = build_analytics_bundle(**inputs)
+        entry = {"bundle": bundle, "digest": _content_hash(bundle)}
+        _bundle_cache.put(key, entry)
+    return entry["bundle"], entry["digest"]
+
+
+def analytics_cache_stats() -> dict:
+    """Hit/miss/eviction counters and current size of the bundle memo."""
+    return _bundle_cache.stats()
+
+
+# --- Portfolio dashboard ---
+
+# Strategy tiers as shown on the dashboard: both "high" strategies share the
+# "High Risk" label, so they're one tier.
+_TIER_LABELS = list(dict.fromkeys(RECOVERY_STRATEGIES[key]["label"] for key in STRATEGY_ORDER))
+_TIER_OF_STRATEGY = np.array([_TIER_LABELS.index(RECOVERY_STRATEGIES[key]["label"]) for key in STRATEGY_ORDER])
+_TIER_COLORS = {"Critical Risk": "#7f1d1d", "High Risk": "#d32f2f", "Medium Risk": "#D49B54", "Low Risk": "#388e3c"}
+
+# Days-past-due buckets: each edge starts a bucket. The last one starts at
+# CRITICAL_DPD_THRESHOLD, so "90+ days" is exactly the DPD half of the
+# critical tier.
+_DPD_BUCKET_EDGES = np.array([1, 30, 60, CRITICAL_DPD_THRESHOLD])
+_DPD_BUCKET_LABELS = ["Current", "1-29 days", "30-59 days", "60-89 days", f"{CRITICAL_DPD_THRESHOLD}+ days"]
+
+
+def assign_strategy_tiers(risk_score: np.ndarray, days_past_due: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `assign_recovery_strategy`: for each borrower, the index in
+    `_TIER_LABELS` of its strategy's label.
+    """
+    return _TIER_OF_STRATEGY[assign_recovery_strategies(risk_score, days_past_due)]
+
+
+def _dashboard_zone_color(risk_pct: float) -> str:
+    if risk_pct < DASHBOARD_LOW_RISK_PCT:
+        return "#388e3c"
+    if risk_pct < DASHBOARD_HIGH_RISK_PCT:
+        return "#D49B54"
+    return "#d32f2f"
+
+
+def build_risk_histogram(risk_score: np.ndarray, bins: int) -> dict:
+    """Bar chart data: borrowers per equal-width risk-score bin, colored by dashboard zone."""
+    # Bin i holds [i/bins, (i+1)/bins); a score of exactly 1 goes in the last bin.
+    counts = np.bincount(np.minimum((risk_score * bins).astype(np.intp), bins - 1), minlength=bins)
+    edges = np.linspace(0, 100, bins + 1).round(2).tolist()
+    return {
+        "type": "bar",
+        "data": [
+            {
+                "label": f"{edges[i]:g}-{edges[i + 1]:g}%",
+                "value": count,
+                "range": [edges[i], edges[i + 1]],
+                "color": _dashboard_zone_color(edges[i]),
+            }
+            for i, count in enumerate(counts.tolist())
+        ],
+        "caption": (
+            f"Predicted risk of default across {len(risk_score):,} borrowers. "
+            f"Median risk: {np.median(risk_score) * 100:.2f}%."
+        ),
+    }
+
+
+def build_tier_counts_chart(tier_counts: np.ndarray) -> dict:
+    """Donut chart data: borrowers per recovery strategy tier."""
+    total = int(tier_counts.sum())
+    escalated = int(tier_counts[:2].sum())
+    return {
+        "type": "donut",
+        "data": [
+            {"label": label, "value": count, "color": _TIER_COLORS[label]}
+            for label, count in zip(_TIER_LABELS, tier_counts.tolist())
+        ],
+        "caption": (
+            f"{escalated:,} of {total:,} borrowers ({escalated / total * 100:.2f}%) need "
+            "critical or high-risk recovery action."
+        ),
+    }
+
+
+def build_segment_mix_chart(segment_name: Sequence[str]) -> dict:
+    """Pie chart data: share of borrowers in each segment, largest first."""
+    # A handful of distinct names: hash-counting them beats sorting N strings for `np.unique`.
+    counts = Counter(segment_name).most_common()
+    total = len(segment_name)
+    return {
+        "type": "pie",
+        "data": [
+            {"label": name, "value": round(count / total * 100, 2), "count": count} for name, count in counts
+        ],
+        "caption": f"{len(counts)} borrower segments across {total:,} borrowers.",
+    }
+
+
+def build_exposure_by_tier_chart(tiers: np.ndarray, outstanding_loan: np.ndarray) -> dict:
+    """Bar chart data: total outstanding loan per recovery strategy tier."""
+    exposure = np.bincount(tiers, weights=outstanding_loan, minlength=len(_TIER_LABELS))
+    total = float(exposure.sum())
+    at_risk = float(exposure[:2].sum())
+    return {
+        "type": "bar",
+        "data": [
+            {"label": label, "value": round(value, 2), "color": _TIER_COLORS[label]}
+            for label, value in zip(_TIER_LABELS, exposure.tolist())
+        ],
+        "caption": (
+            f"Outstanding exposure: {total:,.2f}, of which {at_risk:,.2f} "
+            f"({at_risk / total * 100 if total else 0.0:.2f}%) sits in the critical and high-risk tiers."
+        ),
+    }
+
+
+def build_dpd_buckets_chart(days_past_due: np.ndarray) -> dict:
+    """Bar chart data: borrowers per days-past-due bucket."""
+    buckets = np.searchsorted(_DPD_BUCKET_EDGES, days_past_due, side="right")
+    counts = np.bincount(buckets, minlength=len(_DPD_BUCKET_LABELS))
+    overdue = int(counts[1:].sum())
+    return {
+        "type": "bar",
+        "data": [{"label": label, "value": count} for label, count in zip(_DPD_BUCKET_LABELS, counts.tolist())],
+        "caption": (
+            f"{overdue:,} borrowers are past due; {int(counts[-1]):,} are "
+            f"{CRITICAL_DPD_THRESHOLD} or more days past due."
+        ),
+    }
+
+
+def build_portfolio_analytics(
+    *,
+    risk_score: np.ndarray,
+    days_past_due: np.ndarray,
+    outstanding_loan: np.ndarray,
+    segment_name: Sequence[str],
+    histogram_bins: int = 20,
+) -> dict:
+    """
+    Assemble every chart the portfolio dashboard needs from N scored
+    borrowers, given as equal-length columns (at least one row).
+    """
+    risk_score = np.asarray(risk_score, dtype=np.float64)
+    days_past_due = np.asarray(days_past_due, dtype=np.int64)
+    outstanding_loan = np.asarray(outstanding_loan, dtype=np.float64)
+    tiers = assign_strategy_tiers(risk_score, days_past_due)
+    tier_counts = np.bincount(tiers, minlength=len(_TIER_LABELS))
+    total_exposure = float(outstanding_loan.sum())
+    return {
+        "summary": {
+            "borrowers": len(risk_score),
+            "total_outstanding_loan": round(total_exposure, 2),
+            "mean_risk_pct": round(float(risk_score.mean()) * 100, 2),
+            # Risk weighted by outstanding loan: the default risk of the
+            # average unit of money owed, rather than of the average borrower.
+            "exposure_weighted_risk_pct": round(
+                float(risk_score @ outstanding_loan) / total_exposure * 100 if total_exposure else 0.0, 2
+            ),
+        },
+        "risk_histogram": build_risk_histogram(risk_score, histogram_bins),
+        "tier_counts_chart": build_tier_counts_chart(tier_counts),
+        "segment_mix_chart": build_segment_mix_chart(segment_name),
+        "exposure_by_tier_chart": build_exposure_by_tier_chart(tiers, outstanding_loan),
+        "dpd_buckets_chart": build_dpd_buckets_chart(days_past_due),
+    }
@@ -0,0 +1,151 @@
+"""
+Compact response layout for batch and integration clients.
+
+The default JSON repeats the same long strings in every result: the
+recovery strategy text, the segment description, a plain-language
+sentence per SHAP feature, the collateral insight. It also echoes back
+the whole `BorrowerInput` the client just sent. In compact mode
+(negotiated by `Accept`, see api/negotiation.py) all of that text is
+replaced by an ID, and `text_dictionary()` maps the IDs back to the
+text. Clients fetch that once from `GET /dictionary`; every compact body
+carries the `dictionary_version` it was built against. `/predict/batch`
+results also switch from one object per row to columns.
+
+IDs:
+    strategy_id        a `RECOVERY_STRATEGIES` key ("critical", "high", ...)
+    segment_id         the model's cluster ID; the dictionary maps it to
+                       the segment name, and the name to its description
+    shap feature       the feature's display name
+    insight_id         the collateral insight level ("warning", ...)
+"""
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from models.loader import MLArtifacts
+from repository.constants import RECOVERY_STRATEGIES, SEGMENT_DESCRIPTIONS
+from services import analytics_service, shap_service
+
+_STRATEGY_ID = {entry["strategy"]: key for key, entry in RECOVERY_STRATEGIES.items()}
+_INSIGHT_COVERAGE = {"warning": 0.5, "info": 1.0, "success": 1.5}
+
+# (artifact version, dictionary) of the last build.
+_cached: tuple[str, dict] | None = None
+
+
+def text_dictionary(artifacts: MLArtifacts) -> dict:
+    """
+    Every text the compact layout refers to by ID, plus a `version` hash
+    of it. Segment names come from the model bundle, so it's built once
+    per artifact version.
+    """
+    global _cached
+    if _cached is None or _cached[0] != artifacts.version:
+        _cached = (artifacts.version, _build_dictionary(artifacts))
+    return _cached[1]
+
+
+def _build_dictionary(artifacts: MLArtifacts) -> dict:
+    content = {
+        "strategies": {key: {"label": e["label"], "strategy": e["strategy"]} for key, e in RECOVERY_STRATEGIES.items()},
+        "segment_names": {str(i): name for i, name in sorted(artifacts.segment_names.items())},
+        "segment_descriptions": dict(SEGMENT_DESCRIPTIONS),
+        "shap_feature_descriptions": {
+            name: shap_service.describe_feature(name) for name in shap_service.SHAP_DISPLAY_NAMES.values()
+        },
+        # For a feature missing above; "{feature}" stands for its name.
+        "shap_feature_fallback": shap_service.describe_feature("{feature}"),
+        "collateral_insights": {
+            level: analytics_service.collateral_coverage_insight(coverage)["message"]
+            for level, coverage in _INSIGHT_COVERAGE.items()
+        },
+    }
+    version = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:12]
+    return {"version": version, **content}
+
+
+def compact_prediction(borrower_id: str, scored: Mapping[str, Any], version: str) -> dict:
+    """One `scoring_pipeline` result in the compact layout: no input echo, text by ID."""
+    segment = scored["segment"]
+    return {
+        "dictionary_version": version,
+        "borrower_id": borrower_id,
+        "risk_score": scored["risk_score"],
+        "strategy_id": _STRATEGY_ID[scored["strategy"]],
+        "calculated": scored["calculated"],
+        "segment": {
+            "segment_id": segment["segment_id"],
+            "centroid_distance": segment["centroid_distance"],
+            "next_segment_margin": segment["next_segment_margin"],
+        },
+        "shap_top_features": [
+            {"feature": f["feature"], "value": f["value"], "shap_value": f["shap_value"]}
+            for f in scored["shap_top_features"]
+        ],
+        "model_version": scored["model_version"],
+    }
+
+
+def compact_batch(
+    results: Iterable[tuple[int, str, Mapping[str, Any]]],
+    errors: list[dict],
+    total: int,
+    version: str,
+) -> dict:
+    """
+    `/predict/batch` in the compact layout. `results` are `(index,
+    borrower_id, scored)` for the rows that scored, returned as columns
+    (the i-th entry of every list is the same borrower); SHAP columns
+    hold one list per borrower. `errors` are the failed rows' items.
+    """
+    columns: dict[str, list] = {
+        name: []
+        for name in (
+            "index", "borrower_id", "risk_score", "strategy_id", "segment_id", "centroid_distance",
+            "next_segment_margin", "shap_feature", "shap_value", "shap_feature_value",
+        )
+    }
+    calculated: dict[str, list] = {}
+    model_versions = set()
+    for index, borrower_id, scored in results:
+        segment = scored["segment"]
+        columns["index"].append(index)
+        columns["borrower_id"].append(borrower_id)
+        columns["risk_score"].append(scored["risk_score"])
+        columns["strategy_id"].append(_STRATEGY_ID[scored["strategy"]])
+        columns["segment_id"].append(segment["segment_id"])
+        columns["centroid_distance"].append(segment["centroid_distance"])
+        columns["next_segment_margin"].append(segment["next_segment_margin"])
+        columns["shap_feature"].append([f["feature"] for f in scored["shap_top_features"]])
+        columns["shap_value"].append([f["shap_value"] for f in scored["shap_top_features"]])
+        columns["shap_feature_value"].append([f["value"] for f in scored["shap_top_features"]])
+        for name, value in scored["calculated"].items():
+            calculated.setdefault(name, []).append(value)
+        model_versions.add(scored["model_version"])
+    return {
+        "dictionary_version": version,
+        "total": total,
+        "succeeded": len(columns["index"]),
+        "failed": len(errors),
+        "model_version": model_versions.pop() if len(model_versions) == 1 else None,
+        "results": {**columns, **calculated},
+        "errors": errors,
+    }
+
+
+def compact_analytics(bundle: Mapping[str, Any], version: str) -> dict:
+    """
+    A Recovery Insights bundle in the compact layout: chart captions are
+    dropped (they restate the chart data) and the collateral insight is
+    sent as its level, which is also its `collateral_insights` ID.
+    """
+    compact = {"dictionary_version": version}
+    for name, chart in bundle.items():
+        if name == "collateral_coverage_insight":
+            compact["collateral_insight_id"] = chart["level"]
+        elif chart is None:
+            compact[name] = None
+        else:
+            compact[name] = {key: value for key, value in chart.items() if key != "caption"}
+    return compact
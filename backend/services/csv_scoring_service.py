@@ -0,0 +1,341 @@
+"""
+Streaming CSV scoring: portfolio extracts in the `Dataset/loan-recovery.csv`
+schema in, scored CSV or NDJSON out.
+
+Everything here is a generator pipeline over fixed-size chunks of records:
+
+    text -> complete CSV records -> chunk of N records -> parse -> score -> serialize
+
+so memory stays bounded by the chunk size no matter how large the file is,
+and the first scored chunk can be emitted while the rest of the input is
+still being read. The file is never loaded into a DataFrame. Rows are held
+to the same limits as `BorrowerInput` (the loan types, finite numbers,
+whole numbers for counts, the same ge/le bounds); a row outside them gets
+a `Scoring_Error` instead of a score. Scoring goes through
+`scoring_pipeline.score_borrowers`, the same code `/predict` uses, so a
+row here gets exactly the score the form would show for that borrower.
+"""
+import codecs
+import csv
+import io
+import json
+import math
+import operator
+import re
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+
+from api.schemas.borrower import BorrowerInput, LoanType
+from models.loader import MLArtifacts
+from services import metrics, scoring_pipeline
+from services.worker_pool import WorkerPool, score_csv_chunk_job
+
+OUTPUT_FORMATS = ("csv", "ndjson")
+
+# Dataset column -> scoring pipeline field. Interest_Rate and Loan_Tenure may
+# be blank, in which case the loan type's default terms apply (same as
+# omitting them from `BorrowerInput`).
+CSV_INPUT_COLUMNS = {
+    "Age": "age",
+    "Monthly_Income": "monthly_income",
+    "Num_Dependents": "num_dependents",
+    "Loan_Type": "loan_type",
+    "Loan_Amount": "loan_amount",
+    "Collateral_Value": "collateral_value",
+    "Outstanding_Loan_Amount": "outstanding_loan",
+    "Num_Missed_Payments": "missed_payments",
+    "Days_Past_Due": "days_past_due",
+    "Collection_Attempts": "collection_attempts",
+    "Interest_Rate": "interest_rate",
+    "Loan_Tenure": "loan_tenure",
+}
+_OPTIONAL_INPUT_COLUMNS = {"Interest_Rate", "Loan_Tenure"}
+
+SCORE_COLUMNS = ["Risk_Score", "Risk_Category", "Borrower_Segment", "Top_Risk_Drivers", "Scoring_Error"]
+
+_LOAN_TYPES = {loan_type.value for loan_type in LoanType}
+_BOUND_KINDS = [
+    ("ge", operator.ge, ">="),
+    ("gt", operator.gt, ">"),
+    ("le", operator.le, "<="),
+    ("lt", operator.lt, "<"),
+]
+
+
+def _input_bounds(field: str) -> list[tuple[Callable[[float, float], bool], float, str]]:
+    """(comparison, bound, symbol) for each ge/gt/le/lt limit `BorrowerInput` puts on `field`."""
+    bounds = []
+    for constraint in BorrowerInput.model_fields[field].metadata:
+        for attribute, compare, symbol in _BOUND_KINDS:
+            bound = getattr(constraint, attribute, None)
+            if bound is not None:
+                bounds.append((compare, bound, symbol))
+    return bounds
+
+
+_NUMERIC_FIELDS = [field for field in CSV_INPUT_COLUMNS.values() if field != "loan_type"]
+_INPUT_BOUNDS = {field: _input_bounds(field) for field in _NUMERIC_FIELDS}
+_INTEGER_FIELDS = {
+    field for field in _NUMERIC_FIELDS if BorrowerInput.model_fields[field].annotation in (int, int | None)
+}
+
+
+class CSVSchemaError(ValueError):
+    """The upload's header is missing columns the model needs."""
+
+
+# Split after each line break, keeping it: "\n", "\r\n" or a lone "\r", the
+# only ones `csv` recognizes. (`str.splitlines` also breaks on form feeds,
+# "\x1c"-"\x1e", "\x85" and "\u2028", which `csv` keeps inside a field.)
+_LINE_BREAK = re.compile(r"(?<=\n)|(?<=\r)(?!\n)")
+
+
+class _RecordSplitter:
+    """
+    Incrementally splits decoded text into complete CSV records.
+
+    A line only ends a record when it closes every open quote, so quoted
+    fields containing newlines are never cut in half at a chunk boundary.
+    """
+
+    def __init__(self) -> None:
+        self._partial_line = ""
+        self._pending_record = ""
+
+    def feed(self, text: str) -> list[str]:
+        text = self._partial_line + text
+        lines = _LINE_BREAK.split(text)
+        # After the last line break: an unfinished line, or "".
+        self._partial_line = lines.pop()
+        if text.endswith("\r") and lines:
+            # Possibly the first half of a "\r\n" split across two parts.
+            self._partial_line = lines.pop()
+        records = []
+        for line in lines:
+            self._pending_record += line
+            if self._pending_record.count('"') % 2 == 0:
+                if self._pending_record.strip():
+                    records.append(self._pending_record)
+                self._pending_record = ""
+        return records
+
+    def flush(self) -> list[str]:
+        tail = self._pending_record + self._partial_line
+        self._partial_line = self._pending_record = ""
+        return [tail] if tail.strip() else []
+
+
+def iter_record_chunks(text_parts: Iterable[str], chunk_rows: int) -> Iterator[list[str]]:
+    """Group a stream of text into lists of at most `chunk_rows` CSV records."""
+    splitter = _RecordSplitter()
+    chunk: list[str] = []
+    for part in text_parts:
+        for record in splitter.feed(part):
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    chunk.extend(splitter.flush())
+    if chunk:
+        yield chunk
+
+
+async def aiter_record_chunks(byte_parts: AsyncIterator[bytes], chunk_rows: int) -> AsyncIterator[list[str]]:
+    """Async form of `iter_record_chunks` over a raw (UTF-8, optional BOM) byte stream."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    splitter = _RecordSplitter()
+    chunk: list[str] = []
+    async for part in byte_parts:
+        for record in splitter.feed(decoder.decode(part)):
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    chunk.extend(splitter.feed(decoder.decode(b"", final=True)))
+    chunk.extend(splitter.flush())
+    if chunk:
+        yield chunk
+
+
+def parse_header(record: str) -> list[str]:
+    """Parse the header record and check every model input column is present."""
+    header = next(csv.reader([record]))
+    missing = [column for column in CSV_INPUT_COLUMNS if column not in header]
+    if missing:
+        raise CSVSchemaError(f"CSV is missing required column(s): {', '.join(missing)}")
+    return header
+
+
+def _parse_row(raw: dict[str, str]) -> dict:
+    row = {}
+    for column, field in CSV_INPUT_COLUMNS.items():
+        value = (raw.get(column) or "").strip()
+        if field == "loan_type":
+            if value not in _LOAN_TYPES:
+                raise ValueError(f"Loan_Type must be one of {', '.join(sorted(_LOAN_TYPES))}: {value!r}")
+            row[field] = value
+        elif not value and column in _OPTIONAL_INPUT_COLUMNS:
+            row[field] = None
+        else:
+            try:
+                number = float(value)
+            except ValueError:
+                raise ValueError(f"{column} is not a number: {value!r}") from None
+            if not math.isfinite(number):
+                raise ValueError(f"{column} is not a finite number: {value!r}")
+            if field in _INTEGER_FIELDS and not number.is_integer():
+                raise ValueError(f"{column} is not a whole number: {value!r}")
+            for compare, bound, symbol in _INPUT_BOUNDS[field]:
+                if not compare(number, bound):
+                    raise ValueError(f"{column} must be {symbol} {bound:g}: {value!r}")
+            row[field] = number
+    return row
+
+
+def score_record_chunk(
+    artifacts: MLArtifacts,
+    header: list[str],
+    records: list[str],
+    output_format: str,
+    first_row_number: int,
+) -> str:
+    """
+    Parse, score and serialize one chunk of data records.
+
+    Rows that can't be parsed are emitted with `Scoring_Error` set instead
+    of failing the chunk. `first_row_number` is the 1-based data row number
+    of `records[0]`, used for the NDJSON `row` field.
+    """
+    raw_rows = [dict(zip(header, values)) for values in csv.reader(records)]
+    parsed: list[dict] = []
+    errors: dict[int, str] = {}
+    for i, raw in enumerate(raw_rows):
+        try:
+            parsed.append(_parse_row(raw))
+        except ValueError as exc:
+            errors[i] = str(exc)
+
+    scored_rows = scoring_pipeline.score_borrowers(artifacts, parsed) if parsed else []
+    metrics.record_served(scored_rows)
+    scored = iter(scored_rows)
+    output_rows = []
+    for i, raw in enumerate(raw_rows):
+        if i in errors:
+            output_rows.append((raw, None, errors[i]))
+        else:
+            output_rows.append((raw, next(scored), None))
+
+    if output_format == "ndjson":
+        return _serialize_ndjson(output_rows, first_row_number)
+    return _serialize_csv(output_rows, header)
+
+
+def _top_drivers_text(top_features: list[dict]) -> str:
+    return "; ".join(f"{f['feature']} ({f['shap_value']:+.4f})" for f in top_features)
+
+
+def _serialize_csv(output_rows: list[tuple[dict, dict | None, str | None]], header: list[str]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for raw, scored, error in output_rows:
+        values = [raw.get(column, "") for column in header]
+        if scored is None:
+            values.extend(["", "", "", "", error])
+        else:
+            values.extend(
+                [
+                    f"{scored['risk_score']:.6f}",
+                    scored["risk_category"],
+                    scored["segment"]["segment_name"],
+                    _top_drivers_text(scored["shap_top_features"]),
+                    "",
+                ]
+            )
+        writer.writerow(values)
+    return buffer.getvalue()
+
+
+def _serialize_ndjson(output_rows: list[tuple[dict, dict | None, str | None]], first_row_number: int) -> str:
+    lines = []
+    for offset, (raw, scored, error) in enumerate(output_rows):
+        record: dict = {"row": first_row_number + offset, **raw}
+        if scored is None:
+            record["error"] = error
+        else:
+            record.update(
+                {
+                    "risk_score": scored["risk_score"],
+                    "risk_category": scored["risk_category"],
+                    "segment": scored["segment"]["segment_name"],
+                    "top_features": [
+                        {"feature": f["feature"], "shap_value": f["shap_value"], "direction": f["direction"]}
+                        for f in scored["shap_top_features"]
+                    ],
+                }
+            )
+        lines.append(json.dumps(record))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def output_header(header: list[str], output_format: str) -> str:
+    """The leading output text: the scored CSV header, or nothing for NDJSON."""
+    if output_format == "ndjson":
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(header + SCORE_COLUMNS)
+    return buffer.getvalue()
+
+
+def stream_scored_records(
+    artifacts: MLArtifacts, text_parts: Iterable[str], output_format: str, chunk_rows: int
+) -> Iterator[str]:
+    """
+    Synchronous end-to-end pipeline (used by the `score_csv.py` CLI): yields
+    the scored output one chunk at a time. Raises `CSVSchemaError` for a
+    bad header or an empty input, as the upload endpoint does.
+    """
+    header: list[str] | None = None
+    rows_seen = 0
+    for chunk in iter_record_chunks(text_parts, chunk_rows):
+        if header is None:
+            header = parse_header(chunk[0])
+            chunk = chunk[1:]
+            yield output_header(header, output_format)
+        if chunk:
+            yield score_record_chunk(artifacts, header, chunk, output_format, rows_seen + 1)
+            rows_seen += len(chunk)
+    if header is None:
+        raise CSVSchemaError("CSV input is empty")
+
+
+async def astream_scored_records(
+    pool: WorkerPool, version: str, byte_parts: AsyncIterator[bytes], output_format: str, chunk_rows: int
+) -> AsyncIterator[str]:
+    """
+    Async pipeline for the upload endpoint: reads the request body chunk by
+    chunk and yields scored output as soon as each chunk is scored, so the
+    response starts before the upload has finished. Each chunk is parsed
+    and scored as a job on `pool`, with artifacts `version`, so uploads
+    share the pool's workers and limits with every other scoring request.
+
+    The first item is the output header (empty for NDJSON) followed by the
+    first chunk's output. A bad header raises `CSVSchemaError`, and a full
+    pool `PoolSaturatedError`, from there, before anything has been sent;
+    later chunks wait for room in the pool instead.
+    """
+    header: list[str] | None = None
+    rows_seen = 0
+    async for chunk in aiter_record_chunks(byte_parts, chunk_rows):
+        if header is None:
+            header = parse_header(chunk[0])
+            first_part = output_header(header, output_format)
+            if chunk[1:]:
+                first_part += await pool.run(score_csv_chunk_job, header, chunk[1:], output_format, 1, version)
+                rows_seen = len(chunk) - 1
+            yield first_part
+        else:
+            yield await pool.run_when_admitted(
+                score_csv_chunk_job, header, chunk, output_format, rows_seen + 1, version
+            )
+            rows_seen += len(chunk)
+    if header is None:
+        raise CSVSchemaError("CSV upload is empty")
@@ -0,0 +1,191 @@
+"""
+The app's metrics, exposed at `GET /metrics` (Prometheus text format).
+
+    http_requests_total / http_request_duration_seconds
+        per method, route template and status (api/middleware.py)
+    scoring_stage_duration_seconds
+        per pipeline stage, per `score_columns` call (whole batch)
+    scoring_rows_total
+    predict_microbatch_size
+        /predict calls coalesced per scoring call (services/predict_batcher.py)
+    pdf_render_duration_seconds / pdf_render_bytes
+        per kind: a single report or a merged multi-borrower PDF
+    predictions_served_total / segments_served_total
+        results returned to clients, by risk category and borrower segment
+    http_compression_input_bytes_total / http_compression_output_bytes_total
+        compressed response bodies, by encoding (api/middleware.py)
+    http_etag_responses_total
+        304s vs full bodies for ETag-validated resources (api/http_cache.py)
+    analytics_cache_*
+        Recovery Insights bundle memo, read from its counters at scrape time
+    prediction_cache_*
+        read from the cache's own counters at scrape time
+    result_store_*
+        scored-borrower store writer: rows queued, written, dropped, failed
+    worker_pool_jobs_in_flight, model_info
+
+Recording happens wherever the work runs, worker processes included
+(see `services.worker_pool`); everything lives in this process's
+`REGISTRY`, so there is no collector to run.
+"""
+import time
+from collections.abc import Iterable, Mapping
+
+from utils.metrics import BYTES_BUCKETS, LATENCY_BUCKETS, STAGE_BUCKETS, Registry
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte sent.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+SCORING_STAGE_SECONDS = REGISTRY.histogram(
+    "scoring_stage_duration_seconds",
+    "Time spent in each scoring pipeline stage, per batch.",
+    ("stage",),
+    STAGE_BUCKETS,
+)
+SCORING_ROWS = REGISTRY.counter("scoring_rows_total", "Borrower rows run through the scoring pipeline.")
+SCENARIO_VARIANTS = REGISTRY.counter("scenario_variants_total", "Restructuring variants scored by /predict/scenarios.")
+PREDICT_MICROBATCH_SIZE = REGISTRY.histogram(
+    "predict_microbatch_size",
+    "Concurrent /predict calls coalesced into one scoring call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+PDF_RENDER_SECONDS = REGISTRY.histogram(
+    "pdf_render_duration_seconds", "Time to render a PDF report.", ("kind",), LATENCY_BUCKETS
+)
+PDF_RENDER_BYTES = REGISTRY.histogram("pdf_render_bytes", "Size of rendered PDF reports.", ("kind",), BYTES_BUCKETS)
+PREDICTIONS_SERVED = REGISTRY.counter(
+    "predictions_served_total", "Scored borrowers returned to clients, by risk category.", ("risk_category",)
+)
+SEGMENTS_SERVED = REGISTRY.counter(
+    "segments_served_total", "Scored borrowers returned to clients, by borrower segment.", ("segment",)
+)
+ETAG_RESPONSES = REGISTRY.counter(
+    "http_etag_responses_total",
+    "Responses to ETag-validated resources: a 304 (not_modified) or the full body.",
+    ("resource", "outcome"),
+)
+COMPRESSION_INPUT_BYTES = REGISTRY.counter(
+    "http_compression_input_bytes_total", "Response bytes before compression, by encoding.", ("encoding",)
+)
+COMPRESSION_OUTPUT_BYTES = REGISTRY.counter(
+    "http_compression_output_bytes_total", "Response bytes after compression, by encoding.", ("encoding",)
+)
+
+
+class StageTimer:
+    """
+    Times consecutive pipeline stages: each `lap(stage)` records the time
+    since the previous lap (or since construction).
+    """
+
+    __slots__ = ("_last",)
+
+    def __init__(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        SCORING_STAGE_SECONDS.observe(now - self._last, stage)
+        self._last = now
+
+
+def record_pdf(kind: str, seconds: float, size: int) -> None:
+    PDF_RENDER_SECONDS.observe(seconds, kind)
+    PDF_RENDER_BYTES.observe(size, kind)
+
+
+def record_served(results: Iterable[Mapping]) -> None:
+    """Count scored results (`scoring_pipeline` dicts or `PredictionResult`s) being returned."""
+    for result in results:
+        if isinstance(result, Mapping):
+            category, segment = result["risk_category"], result["segment"]["segment_name"]
+        else:
+            category, segment = result.risk_category, result.segment.segment_name
+        PREDICTIONS_SERVED.inc(category)
+        SEGMENTS_SERVED.inc(segment)
+
+
+# --- Read at scrape time ---
+
+
+def _cache_stat(name: str):
+    def read():
+        from services.prediction_cache import get_prediction_cache
+
+        return [((), get_prediction_cache().stats()[name])]
+
+    return read
+
+
+for _stat, _metric, _type, _doc in (
+    ("hits", "prediction_cache_hits_total", "counter", "Prediction cache lookups that found a result."),
+    ("misses", "prediction_cache_misses_total", "counter", "Prediction cache lookups that found nothing."),
+    ("evictions", "prediction_cache_evictions_total", "counter", "Entries evicted to stay within the size bounds."),
+    ("expirations", "prediction_cache_expirations_total", "counter", "Entries dropped after their TTL."),
+    ("hit_rate", "prediction_cache_hit_ratio", "gauge", "Hits over lookups since startup."),
+    ("entries", "prediction_cache_entries", "gauge", "Results currently cached."),
+    ("approx_bytes", "prediction_cache_bytes", "gauge", "Approximate memory held by cached results."),
+):
+    REGISTRY.callback(_metric, _doc, _cache_stat(_stat), type_name=_type)
+
+
+def _analytics_cache_stat(name: str):
+    def read():
+        from services.analytics_service import analytics_cache_stats
+
+        return [((), analytics_cache_stats()[name])]
+
+    return read
+
+
+for _stat, _metric, _type, _doc in (
+    ("hits", "analytics_cache_hits_total", "counter", "Analytics bundles served from the memo."),
+    ("misses", "analytics_cache_misses_total", "counter", "Analytics bundles built because the memo had none."),
+    ("evictions", "analytics_cache_evictions_total", "counter", "Bundles evicted to stay within the size bounds."),
+    ("hit_rate", "analytics_cache_hit_ratio", "gauge", "Hits over lookups since startup."),
+    ("entries", "analytics_cache_entries", "gauge", "Bundles currently memoized."),
+):
+    REGISTRY.callback(_metric, _doc, _analytics_cache_stat(_stat), type_name=_type)
+
+
+def _store_stat(name: str):
+    def read():
+        from config.settings import settings
+        from repository.result_store import get_result_store
+
+        return [((), get_result_store().stats()[name])] if settings.result_store_enabled else []
+
+    return read
+
+
+for _stat, _metric, _type, _doc in (
+    ("queued", "result_store_queued_rows", "gauge", "Scored results waiting for the store's writer thread."),
+    ("written", "result_store_rows_written_total", "counter", "Scored results committed to the store."),
+    ("dropped", "result_store_rows_dropped_total", "counter", "Scored results dropped because the queue was full."),
+    ("failed", "result_store_rows_failed_total", "counter", "Scored results lost to a failed write."),
+):
+    REGISTRY.callback(_metric, _doc, _store_stat(_stat), type_name=_type)
+
+
+def _jobs_in_flight():
+    from services.worker_pool import get_worker_pool
+
+    return [((), get_worker_pool().in_flight)]
+
+
+def _model_info():
+    from models.loader import get_ml_artifacts
+
+    return [((get_ml_artifacts().version,), 1)]
+
+
+REGISTRY.callback("worker_pool_jobs_in_flight", "CPU-bound jobs running or queued.", _jobs_in_flight)
+REGISTRY.callback("model_info", "The active model bundle version.", _model_info, ("version",))
@@ -0,0 +1,149 @@
+"""
+Hot reload of the model bundle, without a restart.
+
+`reload_ml_artifacts` loads a bundle next to the active one, scores a
+handful of synthetic borrowers with it (which both warms its first-call
+paths and refuses a bundle that can't produce sane scores), and only then
+swaps it in (`models.loader.swap_ml_artifacts`). Requests already running
+keep the artifacts they started with; the next request gets the new ones.
+Worker processes switch on their first job for the new version, and are
+warmed with it straight after the swap.
+
+A reload is triggered by `POST /admin/model/reload`, or by `BundleWatcher`
+noticing that `CURRENT` now names a different bundle (e.g. right after
+`retrain.py` finished).
+"""
+import logging
+import math
+import threading
+
+from config.settings import settings
+from models.bundle import MANIFEST_NAME, BundleError, current_bundle_dir, version_dir
+from models.loader import MLArtifacts, get_ml_artifacts, load_ml_artifacts, swap_ml_artifacts
+from services.scoring_pipeline import MODEL_INPUT_FIELDS, score_borrowers
+from services.worker_pool import get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+# One borrower per loan type on default terms, plus a custom-terms and a
+# deep-delinquency case, so warm-up exercises every branch of the pipeline.
+# Columns follow scoring_pipeline.MODEL_INPUT_FIELDS.
+_WARMUP_ROWS = [
+    ("Personal", 35, 60_000, 1, 300_000, 0, 200_000, 0, 0, 0, None, None),
+    ("Auto", 42, 90_000, 2, 800_000, 600_000, 500_000, 2, 45, 2, None, None),
+    ("Business", 51, 250_000, 3, 3_000_000, 2_500_000, 2_000_000, 5, 150, 6, None, None),
+    ("Home", 29, 120_000, 0, 5_000_000, 6_000_000, 4_500_000, 1, 20, 1, 8.5, 240),
+    ("Personal", 63, 25_000, 4, 500_000, 0, 480_000, 12, 360, 10, 18.0, 36),
+]
+WARMUP_BORROWERS = [dict(zip(MODEL_INPUT_FIELDS, row)) for row in _WARMUP_ROWS]
+
+
+class ModelReloadError(RuntimeError):
+    """The new bundle couldn't be loaded or failed its warm-up; the old one stays active."""
+
+
+def warm_up(artifacts: MLArtifacts, include_booster: bool = True) -> None:
+    """
+    Score the synthetic borrowers one at a time (the native engine) and,
+    with `include_booster`, as a batch large enough to go to XGBoost,
+    raising `ModelReloadError` on any unusable output.
+    """
+    try:
+        results = [score_borrowers(artifacts, [borrower])[0] for borrower in WARMUP_BORROWERS]
+        if include_booster:
+            repeats = settings.native_inference_max_rows // len(WARMUP_BORROWERS) + 1
+            results += score_borrowers(artifacts, WARMUP_BORROWERS * repeats)
+    except Exception as exc:
+        raise ModelReloadError(f"bundle {artifacts.version} failed to score: {exc}") from exc
+    for result in results:
+        score = result["risk_score"]
+        if not (math.isfinite(score) and 0.0 <= score <= 1.0):
+            raise ModelReloadError(f"bundle {artifacts.version} produced risk score {score!r}")
+        if len(result["shap_top_features"]) == 0:
+            raise ModelReloadError(f"bundle {artifacts.version} produced no SHAP explanation")
+
+
+_reload_lock = threading.Lock()
+
+
+def reload_ml_artifacts(version: str | None = None) -> tuple[MLArtifacts, MLArtifacts | None]:
+    """
+    Load bundle `version` (default: whatever `CURRENT` names), warm it up
+    and make it active. Returns (active artifacts, replaced artifacts or
+    None if `version` was already active). One reload runs at a time.
+    """
+    with _reload_lock:
+        if version is None:
+            bundle_dir = current_bundle_dir(settings.model_bundles_dir)
+            if bundle_dir is None:
+                raise ModelReloadError(f"no CURRENT bundle in {settings.model_bundles_dir}")
+        else:
+            try:
+                bundle_dir = version_dir(settings.model_bundles_dir, version)
+            except BundleError as exc:
+                raise ModelReloadError(str(exc)) from exc
+            if not (bundle_dir / MANIFEST_NAME).is_file():
+                raise ModelReloadError(f"no bundle {version!r} in {settings.model_bundles_dir}")
+
+        active = get_ml_artifacts()
+        if bundle_dir.name == active.version:
+            return active, None
+
+        try:
+            candidate = load_ml_artifacts(bundle_dir)
+        except (BundleError, OSError, ValueError) as exc:
+            raise ModelReloadError(f"could not load bundle {bundle_dir.name}: {exc}") from exc
+        warm_up(candidate)
+        previous = swap_ml_artifacts(candidate)
+
+    logger.info("Model reloaded: %s -> %s", previous.version if previous else None, candidate.version)
+    get_worker_pool().warm_up(candidate.version)
+    return candidate, previous
+
+
+class BundleWatcher:
+    """Background thread that reloads whenever `CURRENT` names a new bundle."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._failed_version: str | None = None
+        self._thread = threading.Thread(target=self._run, name="bundle-watcher", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval_seconds + 5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            bundle_dir = current_bundle_dir(settings.model_bundles_dir)
+            if bundle_dir is None or bundle_dir.name in (get_ml_artifacts().version, self._failed_version):
+                continue
+            try:
+                reload_ml_artifacts()
+            except ModelReloadError as exc:
+                # Don't retry the same broken bundle every tick; a new CURRENT gets a fresh try.
+                self._failed_version = bundle_dir.name
+                logger.error("Model reload failed, keeping %s: %s", get_ml_artifacts().version, exc)
+
+
+_watcher: BundleWatcher | None = None
+
+
+def start_bundle_watcher() -> None:
+    """Start the watcher if `settings.model_watch_interval_seconds` is set; called at startup."""
+    global _watcher
+    if _watcher is None and settings.model_watch_interval_seconds > 0:
+        _watcher = BundleWatcher(settings.model_watch_interval_seconds)
+        _watcher.start()
+        logger.info("Watching %s for new model bundles", settings.model_bundles_dir)
+
+
+def stop_bundle_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
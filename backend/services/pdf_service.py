@@ -5,25 +5,88 @@ Structure, styling, and color logic are ported from the original
 `generate_pdf()` in slrs.py. One addition per product decision: a borrower
 segment row is now included, since segmentation is a new first-class
 feature of this app (see services/segmentation_service.py).
+
+Two renderers produce the same page:
+
+    platypus   ReportLab's flow layout: paragraphs, a table, page breaks.
+    template   The report's one-page layout is fixed, so the static
+               skeleton (title, table backgrounds, grid and labels,
+               headings) is laid out once, as PDF operators, and each
+               report only adds its own values at precomputed positions;
+               the body paragraphs are line-broken with platypus' own rule.
+               The file is written by utils/pdf_writer.py.
+
+`settings.pdf_renderer` picks one. The template draws the same content
+stream platypus does (benchmarks/bench_pdf_render.py checks this), at a
+fraction of the cost. Reports it can't lay out exactly as platypus would
+(text needing markup handling, a multi-line table cell, a page overflow,
+characters outside the fonts' WinAnsi encoding) go to platypus, as do
+reports with the optional EMI amortization schedule pages.
+
+Render time and size of every PDF are recorded in `pdf_render_*`
+(services/metrics.py).
 """
 import re
+import time
+from functools import lru_cache
 from io import BytesIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import fp_str
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
+from config.settings import settings
 from repository.constants import DISPLAY_HIGH_RISK_THRESHOLD, DISPLAY_MEDIUM_RISK_THRESHOLD
+from services import metrics
+from services.amortization_service import build_amortization_schedule
+from utils.pdf_writer import PdfWriter, pdf_text
 
 RISK_COLOR_RED = "#d32f2f"
 RISK_COLOR_AMBER = "#D49B54"
 RISK_COLOR_GREEN = "#388e3c"
 
+PAGE_MARGIN = 36
+TABLE_COL_WIDTH = 120
+REPORT_TITLE = "Smart Loan Recovery System - Borrower Risk Report"
+
+# The borrower table's look never changes, so its style is built once per
+# process rather than once per report.
+_BORROWER_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ]
+)
+
+_SCHEDULE_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ]
+)
+_NON_ASCII = re.compile(r"[^\x00-\x7F]+")
+
+
+@lru_cache
+def report_styles():
+    """ReportLab's sample stylesheet, built once per process and shared read-only."""
+    return getSampleStyleSheet()
+
 
 def _remove_emoji(text) -> str:
     """Strip non-ASCII symbols (emoji etc.) so ReportLab can render the text."""
-    return re.sub(r"[^\x00-\x7F]+", "", str(text))
+    return _NON_ASCII.sub("", str(text))
 
 
 def _risk_color(risk_score: float) -> str:
@@ -34,32 +97,9 @@ def _risk_color(risk_score: float) -> str:
     return RISK_COLOR_GREEN
 
 
-def generate_borrower_report_pdf(report_data: dict) -> bytes:
-    """
-    Build the borrower risk report PDF and return it as raw bytes.
-
-    `report_data` is expected to contain all the same keys the original
-    function relied on, plus `segment_name` and `segment_description`.
-    """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36
-    )
-    styles = getSampleStyleSheet()
-    elements = []
-
-    borrower_id = report_data["borrower_id"]
-    risk_score = report_data["risk_score"]
-    risk_category_clean = _remove_emoji(report_data["risk_category"])
-    strategy_clean = _remove_emoji(report_data["strategy"])
-    risk_color = _risk_color(risk_score)
-
-    elements.append(Paragraph("<b>Smart Loan Recovery System - Borrower Risk Report</b>", styles["Title"]))
-    elements.append(Spacer(1, 18))
-    elements.append(Paragraph(f"<b>Borrower ID:</b> {borrower_id}", styles["Normal"]))
-    elements.append(Spacer(1, 8))
-
-    table_data = [
+def _table_rows(report_data: dict) -> list[list]:
+    """The borrower table's cells, shared by both renderers."""
+    return [
         ["Full Name", f"{report_data['first_name']} {report_data['last_name']}", "Age", report_data["age"]],
         ["Gender", report_data["gender"], "Loan Type", report_data.get("loan_type", "\u2014")],
         [
@@ -96,20 +136,75 @@ def generate_borrower_report_pdf(report_data: dict) -> bytes:
         ],
         ["Borrower Segment", report_data.get("segment_name", "\u2014"), "", ""],
     ]
-    t = Table(table_data, colWidths=[120, 120, 120, 120])
-    t.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-        )
+
+
+def generate_borrower_report_pdf(report_data: dict) -> bytes:
+    """
+    Build the borrower risk report PDF and return it as raw bytes.
+
+    `report_data` is expected to contain all the same keys the original
+    function relied on, plus `segment_name` and `segment_description`.
+    """
+    start = time.perf_counter()
+    pdf_bytes = report_template().render([report_data]) if settings.pdf_renderer == "template" else None
+    if pdf_bytes is None:
+        pdf_bytes = _build_pdf(_report_elements(report_data))
+    metrics.record_pdf("single", time.perf_counter() - start, len(pdf_bytes))
+    return pdf_bytes
+
+
+def generate_merged_report_pdf(reports: list[dict]) -> bytes:
+    """One PDF holding every borrower's report, each starting on a new page."""
+    start = time.perf_counter()
+    pdf_bytes = report_template().render(reports) if settings.pdf_renderer == "template" else None
+    if pdf_bytes is None:
+        elements = []
+        for i, report_data in enumerate(reports):
+            if i:
+                elements.append(PageBreak())
+            elements.extend(_report_elements(report_data))
+        pdf_bytes = _build_pdf(elements)
+    metrics.record_pdf("merged", time.perf_counter() - start, len(pdf_bytes))
+    return pdf_bytes
+
+
+# --- platypus renderer ---
+
+
+def _build_pdf(elements: list) -> bytes:
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=PAGE_MARGIN,
+        leftMargin=PAGE_MARGIN,
+        topMargin=PAGE_MARGIN,
+        bottomMargin=PAGE_MARGIN,
     )
+    doc.build(elements)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def _report_elements(report_data: dict) -> list:
+    """Every flowable of one borrower's report, in page order."""
+    styles = report_styles()
+    elements = []
+
+    borrower_id = report_data["borrower_id"]
+    risk_score = report_data["risk_score"]
+    risk_category_clean = _remove_emoji(report_data["risk_category"])
+    strategy_clean = _remove_emoji(report_data["strategy"])
+    risk_color = _risk_color(risk_score)
+
+    elements.append(Paragraph(f"<b>{REPORT_TITLE}</b>", styles["Title"]))
+    elements.append(Spacer(1, 18))
+    elements.append(Paragraph(f"<b>Borrower ID:</b> {borrower_id}", styles["Normal"]))
+    elements.append(Spacer(1, 8))
+
+    t = Table(_table_rows(report_data), colWidths=[TABLE_COL_WIDTH] * 4)
+    t.setStyle(_BORROWER_TABLE_STYLE)
     elements.append(t)
     elements.append(Spacer(1, 16))
 
@@ -141,7 +236,274 @@ def generate_borrower_report_pdf(report_data: dict) -> bytes:
         )
     )
 
-    doc.build(elements)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+    if report_data.get("include_amortization"):
+        elements.extend(_amortization_elements(report_data))
+
+    return elements
+
+
+def _amortization_elements(report_data: dict) -> list:
+    """The EMI schedule pages: a summary line and a month-by-month table."""
+    schedule = build_amortization_schedule(
+        report_data["loan_amount"], report_data["interest_rate"], report_data["loan_tenure"]
+    )
+    if schedule is None:
+        return []
+    styles = report_styles()
+    columns = schedule["schedule"]
+    rows = [["Month", "EMI (INR)", "Principal (INR)", "Interest (INR)", "Balance (INR)"]]
+    rows += [
+        [month, f"{payment:,.2f}", f"{principal:,.2f}", f"{interest:,.2f}", f"{balance:,.2f}"]
+        for month, payment, principal, interest, balance in zip(
+            columns["month"], columns["payment"], columns["principal"], columns["interest"], columns["balance"]
+        )
+    ]
+    table = Table(rows, colWidths=[60] + [TABLE_COL_WIDTH - 15] * 4, repeatRows=1)
+    table.setStyle(_SCHEDULE_TABLE_STYLE)
+    return [
+        PageBreak(),
+        Paragraph("<b>EMI Amortization Schedule</b>", styles["Heading2"]),
+        Paragraph(
+            f"INR {schedule['loan_amount']:,.0f} at {schedule['interest_rate']}% over {schedule['loan_tenure']} "
+            f"months: EMI INR {schedule['monthly_emi']:,.2f}, total interest INR {schedule['total_interest']:,.2f}, "
+            f"total paid INR {schedule['total_payment']:,.2f}.",
+            styles["BodyText"],
+        ),
+        Spacer(1, 8),
+        table,
+    ]
+
+
+# --- template renderer ---
+
+
+class _NeedsPlatypus(Exception):
+    """This report can't be drawn exactly as platypus would by the template."""
+
+
+# Markup, and whitespace platypus treats specially (no-break space, soft hyphen).
+_PARAGRAPH_SPECIAL = re.compile("[<>&\xa0\xad]")
+_BOLD = "Helvetica-Bold"
+_REGULAR = "Helvetica"
+
+
+def _fill(color) -> str:
+    return f"{fp_str(color.red, color.green, color.blue)} rg"
+
+
+class ReportTemplate:
+    """
+    The borrower report page, precompiled. Positions, fonts and static
+    operators are derived once from the same styles, margins and table
+    geometry `_report_elements` uses, so every value lands where platypus
+    would put it.
+    """
+
+    _FONTS = (_REGULAR, _BOLD)  # /F1, /F2
+
+    def __init__(self) -> None:
+        styles = report_styles()
+        self._normal, self._body = styles["Normal"], styles["BodyText"]
+        self._writer = PdfWriter(A4, self._FONTS)
+        self._font_ids = {name: f"F{i}" for i, name in enumerate(self._FONTS, start=1)}
+        self._fills = {
+            hex_color: _fill(colors.HexColor(hex_color))
+            for hex_color in (RISK_COLOR_RED, RISK_COLOR_AMBER, RISK_COLOR_GREEN)
+        }
+        self._black = _fill(colors.black)
+        self._grey = _fill(colors.grey)
+
+        # SimpleDocTemplate's one frame, inside its default 6pt padding.
+        self._x = PAGE_MARGIN + 6
+        self._width = A4[0] - 2 * PAGE_MARGIN - 12
+        self._bottom = PAGE_MARGIN + 6
+        y = A4[1] - PAGE_MARGIN - 6
+
+        title = styles["Title"]
+        title_width = stringWidth(REPORT_TITLE, title.fontName, title.fontSize)
+        if title_width > self._width:
+            raise ValueError("the report title no longer fits on one line")
+        offset = fp_str((self._width - title_width) / 2)
+        y -= title.leading
+        head = [
+            "1 0 0 1 0 0 cm  BT /F1 12 Tf 14.4 TL ET\n",
+            self._block(
+                y,
+                f"q\n{_fill(title.textColor)}\nBT 1 0 0 1 0 {fp_str(title.leading - title.fontSize)} Tm "
+                f"/{self._font_ids[title.fontName]} {fp_str(title.fontSize)} Tf {fp_str(title.leading)} TL "
+                f"{offset} 0 Td ({pdf_text(REPORT_TITLE)}) Tj T* -{offset} 0 Td ET\nQ\n",
+            ),
+        ]
+        y -= title.spaceAfter + 18
+        head.append(self._block(y, ""))
+        self._head = "".join(head)
+        self._id_y = y = y - self._normal.leading
+        y -= 8
+        self._after_id = self._block(y, "")
+
+        # Ten single-line rows of a fixed height; labels are static, values
+        # go in columns 1 and 3.
+        n_rows, row_height = 10, 21
+        table_width, table_height = 4 * TABLE_COL_WIDTH, n_rows * row_height
+        y -= table_height
+        self._table_open = (
+            f"q\n1 0 0 1 {fp_str(self._x + (self._width - table_width) / 2)} {fp_str(y)} cm\nq\n"
+            f"{_fill(colors.lightgrey)}\nn 0 {table_height} {table_width} -{row_height} re f*\n"
+            f"{_fill(colors.whitesmoke)}\nn 0 {table_height} {table_width} -{row_height} re f*\n"
+            f"{self._black}\nBT /F1 9 Tf 12 TL ET\n"
+        )
+        self._cell_origins = [
+            [f"BT 1 0 0 1 {TABLE_COL_WIDTH * col + 6} {row_height * (n_rows - 1 - row) + 9} Tm " for col in range(4)]
+            for row in range(n_rows)
+        ]
+        grid = [
+            f"n 0 {table_height} m {table_width} {table_height} l S",
+            f"n 0 0 m {table_width} 0 l S",
+            f"n 0 0 m 0 {table_height} l S",
+            f"n {table_width} 0 m {table_width} {table_height} l S",
+            *(f"n 0 {row_height * row} m {table_width} {row_height * row} l S" for row in range(n_rows - 1, 0, -1)),
+            *(f"n {TABLE_COL_WIDTH * col} 0 m {TABLE_COL_WIDTH * col} {table_height} l S" for col in range(1, 4)),
+        ]
+        self._table_close = (
+            f"q\n1 J\n1 j\n{self._grey[:-2]}RG\n.5 w\n" + "\n".join(grid) + "\nQ\nQ\nQ\n"
+        )
+
+        y -= 16
+        self._after_table = self._block(y, "")
+        self._score_y = y = y - self._normal.leading
+        self._category_y = y = y - self._normal.leading
+        y -= 8
+        self._after_scores = self._block(y, "")
+        self._strategy_heading_y = y = y - self._normal.leading
+        self._strategy_heading = self._paragraph(y, ["Recommended Strategy:"], _BOLD, 10, self._black)
+        self._insight_heading = ["Borrower Segment Insight:"]
+
+    def _block(self, y: float, body: str) -> str:
+        """One flowable: `body` drawn with the frame's left edge and `y` as origin."""
+        return f"q\n1 0 0 1 {fp_str(self._x)} {fp_str(y)} cm\n{body}Q\n"
+
+    def _paragraph(self, y: float, lines: list[str], font: str, size: float, fill: str) -> str:
+        """A single-font paragraph already broken into `lines`, bottom edge at `y`."""
+        leading = self._normal.leading
+        shown = " T* ".join(f"({pdf_text(line)}) Tj" for line in lines)
+        return self._block(
+            y,
+            f"q\n{fill}\nBT 1 0 0 1 0 {fp_str(len(lines) * leading - size)} Tm /{self._font_ids[font]} "
+            f"{fp_str(size)} Tf {fp_str(leading)} TL {shown} T* ET\nQ\n",
+        )
+
+    def _labelled_line(self, y: float, label: str, value: str, value_fill: str | None = None) -> str:
+        """A one-line Normal paragraph: bold label, then the value in regular weight."""
+        width = stringWidth(label, _BOLD, 10) + stringWidth(f" {value}", _REGULAR, 10)
+        if width > self._width:
+            raise _NeedsPlatypus
+        # Platypus emits the separating space with the value, or on its own
+        # when the value starts a differently coloured fragment.
+        shown = f"( {pdf_text(value)}) Tj" if value_fill is None else f"( ) Tj {value_fill} ({pdf_text(value)}) Tj"
+        return self._block(
+            y,
+            f"q\nBT 1 0 0 1 0 {fp_str(self._normal.leading - 10)} Tm {fp_str(self._normal.leading)} TL "
+            f"/F2 10 Tf {self._black} ({pdf_text(label)}) Tj /F1 10 Tf {shown} T* ET\nQ\n",
+        )
+
+    def _break_lines(self, text: str, style) -> list[str]:
+        """Platypus' greedy line breaking of a plain, single-font paragraph."""
+        words = text.split()
+        if not words or _PARAGRAPH_SPECIAL.search(text):
+            raise _NeedsPlatypus
+        space = stringWidth(" ", style.fontName, style.fontSize)
+        shrink = style.spaceShrinkage * space
+        lines: list[list[str]] = []
+        line: list[str] = []
+        width = -space
+        for word in words:
+            word_width = stringWidth(word, style.fontName, style.fontSize)
+            if word_width > self._width:
+                raise _NeedsPlatypus  # platypus splits long words
+            new_width = width + space + word_width
+            if line and new_width > self._width + shrink * len(line):
+                lines.append(line)
+                line, width = [word], word_width
+            else:
+                line.append(word)
+                width = new_width
+        lines.append(line)
+        return [" ".join(line) for line in lines]
+
+    @staticmethod
+    def _inline(text) -> str:
+        """`text` as platypus shows it inside a paragraph: whitespace collapsed."""
+        collapsed = " ".join(str(text).split())
+        if not collapsed or _PARAGRAPH_SPECIAL.search(collapsed):
+            raise _NeedsPlatypus
+        return collapsed
+
+    def _page(self, report_data: dict) -> bytes:
+        """The content stream of one report's page."""
+        if report_data.get("include_amortization"):
+            raise _NeedsPlatypus  # the schedule flows over extra pages
+        borrower_id = self._inline(report_data["borrower_id"])
+        risk_score = report_data["risk_score"]
+        fill = self._fills[_risk_color(risk_score)]
+
+        parts = [
+            self._head,
+            self._labelled_line(self._id_y, "Borrower ID:", borrower_id),
+            self._after_id,
+            self._table_open,
+        ]
+        for origins, row in zip(self._cell_origins, _table_rows(report_data)):
+            for origin, value in zip(origins, row):
+                text = str(value)
+                if "\n" in text:
+                    raise _NeedsPlatypus
+                parts.append(f"{origin}({pdf_text(text)}) Tj T* ET\n" if text else f"{origin} T* ET\n")
+        parts += [
+            self._table_close,
+            self._after_table,
+            self._labelled_line(self._score_y, "Predicted Risk Score:", f"{risk_score * 100:.2f}%", fill),
+            self._labelled_line(
+                self._category_y, "Risk Category:", self._inline(_remove_emoji(report_data["risk_category"])), fill
+            ),
+            self._after_scores,
+            self._strategy_heading,
+        ]
+
+        body = self._body
+        lines = self._break_lines(_remove_emoji(report_data["strategy"]), body)
+        y = self._strategy_heading_y - body.spaceBefore - len(lines) * body.leading
+        parts.append(self._paragraph(y, lines, body.fontName, body.fontSize, fill))
+        y -= 8
+        parts.append(self._block(y, ""))
+
+        if report_data.get("segment_description"):
+            y -= self._normal.leading
+            parts.append(self._paragraph(y, self._insight_heading, _BOLD, 10, self._black))
+            lines = self._break_lines(report_data["segment_description"], body)
+            y -= body.spaceBefore + len(lines) * body.leading
+            parts.append(self._paragraph(y, lines, body.fontName, body.fontSize, self._black))
+        y -= 12
+        parts.append(self._block(y, ""))
+
+        footer = f"Generated by Smart Loan Recovery System | {borrower_id}"
+        y -= self._normal.leading
+        # Anything close to the frame's bottom edge is left to platypus' own fit test.
+        if stringWidth(footer, _REGULAR, 8) > self._width or y < self._bottom + self._normal.leading:
+            raise _NeedsPlatypus
+        parts.append(self._paragraph(y, [footer], _REGULAR, 8, self._grey))
+        parts.append(" \n")
+        return "".join(parts).encode("ascii")
+
+    def render(self, reports: list[dict]) -> bytes | None:
+        """A PDF with one page per report, or None if any of them needs platypus."""
+        try:
+            pages = [self._page(report_data) for report_data in reports]
+        except (_NeedsPlatypus, UnicodeEncodeError):
+            return None
+        return self._writer.render(pages)
+
+
+@lru_cache
+def report_template() -> ReportTemplate:
+    """The report template, compiled once per process."""
+    return ReportTemplate()
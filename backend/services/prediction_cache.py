@@ -0,0 +1,47 @@
+"""
+Cache of single-borrower scoring results.
+
+Recovery officers re-submit the same borrower many times while editing
+fields the model never sees (name, gender) or re-opening the dashboard.
+The scored result depends only on the model inputs and the loaded
+artifacts, so it is cached under a hash of exactly those: the borrower's
+`scoring_pipeline.MODEL_INPUT_FIELDS` plus `MLArtifacts.version`. A new
+model therefore never serves a stale score; old entries just age out.
+
+The cache is a `utils.lru_cache.LRUCache`, bounded three ways: entry
+count, approximate memory, and a per-entry TTL.
+"""
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from config.settings import settings
+from services.scoring_pipeline import MODEL_INPUT_FIELDS
+from utils.lru_cache import LRUCache
+
+
+def cache_key(borrower: Mapping[str, Any], artifact_version: str) -> str:
+    """
+    Hash of the model-relevant inputs and the artifact version.
+
+    Numbers are normalized to float so `5000` and `5000.0` share an entry.
+    """
+    normalized = [
+        value if value is None or isinstance(value, str) else float(value)
+        for value in (borrower.get(field) for field in MODEL_INPUT_FIELDS)
+    ]
+    encoded = json.dumps([artifact_version, normalized], separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+_cache = LRUCache(
+    max_entries=settings.prediction_cache_max_entries,
+    max_bytes=settings.prediction_cache_max_bytes,
+    ttl_seconds=settings.prediction_cache_ttl_seconds,
+)
+
+
+def get_prediction_cache() -> LRUCache:
+    """The app-wide cache."""
+    return _cache
@@ -9,6 +9,7 @@ thresholds and the 3-band display-color thresholds as two distinct schemes
 """
 import numpy as np
 
+from config.settings import settings
 from models.loader import MLArtifacts
 from repository.constants import (
     CRITICAL_DPD_THRESHOLD,
@@ -55,10 +56,57 @@ def build_model_feature_vector(
     return np.array(ordered, dtype=float).reshape(1, -1)
 
 
+def build_model_feature_matrix(
+    *,
+    age: np.ndarray,
+    monthly_income: np.ndarray,
+    num_dependents: np.ndarray,
+    engineered: dict[str, np.ndarray],
+    outstanding_loan: np.ndarray,
+) -> np.ndarray:
+    """
+    Columnar form of `build_model_feature_vector`: an N x 10 matrix in
+    MODEL_FEATURE_ORDER from the arrays returned by
+    `engineer_features_batch`. Missing ratios become 0.0, exactly like the
+    `or 0.0` in the single-row builder.
+    """
+    feature_map = {
+        "Age": age,
+        "Monthly_Income": monthly_income,
+        "Num_Dependents": num_dependents,
+        "Loan_Tenure": engineered["loan_tenure_used"],
+        "Interest_Rate": engineered["interest_rate_used"],
+        "Outstanding_Loan_Amount": outstanding_loan,
+        "Collection_Attempts": engineered["collection_attempts"],
+        "EMI_to_Income_Ratio": np.nan_to_num(engineered["emi_to_income_ratio"], nan=0.0),
+        "Collateral_Coverage": np.nan_to_num(engineered["collateral_coverage"], nan=0.0),
+        "Default_Severity": engineered["default_severity"],
+    }
+    return np.column_stack([np.asarray(feature_map[name], dtype=float) for name in MODEL_FEATURE_ORDER])
+
+
 def predict_risk_score(artifacts: MLArtifacts, feature_vector: np.ndarray) -> float:
-    """Run the XGBoost classifier and return P(default) as a float in [0, 1]."""
-    proba = artifacts.xgb_model.predict_proba(feature_vector)
-    return float(proba[0][1])
+    """Run the risk model and return P(default) as a float in [0, 1]."""
+    return float(predict_risk_scores(artifacts, feature_vector)[0])
+
+
+def predict_risk_scores(artifacts: MLArtifacts, feature_matrix: np.ndarray) -> np.ndarray:
+    """
+    Score an N x 10 feature matrix in a single `predict_proba` call.
+
+    Returns a 1-D array of P(default), one per row, in input order. Small
+    matrices use the native NumPy engine when `settings.inference_backend`
+    is "native" and the model could be exported; everything else goes to
+    XGBoost.
+    """
+    if (
+        settings.inference_backend == "native"
+        and artifacts.tree_ensemble is not None
+        and len(feature_matrix) <= settings.native_inference_max_rows
+    ):
+        return artifacts.tree_ensemble.predict_proba(feature_matrix)[:, 1]
+    proba = artifacts.xgb_model.predict_proba(feature_matrix)
+    return proba[:, 1]
 
 
 def assign_recovery_strategy(risk_score: float, days_past_due: int) -> dict:
@@ -78,6 +126,29 @@ def assign_recovery_strategy(risk_score: float, days_past_due: int) -> dict:
     return RECOVERY_STRATEGIES["low"]
 
 
+# `assign_recovery_strategy`'s branches in its order; the first matching
+# condition wins, as in the scalar version.
+STRATEGY_ORDER = ("critical", "high_no_dpd", "high", "medium", "low")
+
+
+def assign_recovery_strategies(risk_score: np.ndarray, days_past_due: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `assign_recovery_strategy`: for each row, the index in
+    `STRATEGY_ORDER` of its `RECOVERY_STRATEGIES` key.
+    """
+    above_critical = risk_score > CRITICAL_RISK_THRESHOLD
+    return np.select(
+        [
+            above_critical & (days_past_due >= CRITICAL_DPD_THRESHOLD),
+            above_critical,
+            risk_score > HIGH_RISK_THRESHOLD,
+            risk_score > MEDIUM_RISK_THRESHOLD,
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+
 def get_display_risk_band(risk_score: float) -> str:
     """
     3-band scheme used purely for UI color coding on the predictor results
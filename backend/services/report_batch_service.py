@@ -0,0 +1,69 @@
+"""
+Bulk PDF reports: many borrowers' reports as one streamed ZIP, or as one
+merged PDF.
+
+For the ZIP, reports are rendered on the worker pool a few at a time and
+each one is added to the archive (and sent) as soon as it is ready, in
+request order, while the next ones are still rendering. Only a small
+window of renders is ever in flight, so one large request neither holds
+every PDF in memory nor crowds other requests out of the pool.
+"""
+import asyncio
+import re
+from collections import deque
+from collections.abc import AsyncIterator
+
+from services.worker_pool import WorkerPool, render_merged_report_pdf_job, render_report_pdf_job
+from utils.zip_stream import ZipStreamWriter
+
+
+def report_filename(borrower_id: str) -> str:
+    """The single-report download name, made safe for use inside an archive."""
+    return f"borrower_report_{re.sub(r'[^A-Za-z0-9_.-]', '_', borrower_id)}.pdf"
+
+
+def _archive_names(reports: list[dict]) -> list[str]:
+    """One member name per report; repeated borrower IDs get a numeric suffix."""
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for report in reports:
+        name = report_filename(report["borrower_id"])
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name[:-4]}_{count + 1}.pdf")
+    return names
+
+
+async def stream_reports_zip(pool: WorkerPool, reports: list[dict]) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP archive of every report's PDF, piece by piece.
+
+    The first report is submitted directly, so a saturated pool raises
+    `PoolSaturatedError` from the first `anext` — before anything has been
+    sent and while the caller can still answer 503.
+    """
+    window = max(pool.processes, 1) * 2
+    names = _archive_names(reports)
+    writer = ZipStreamWriter()
+    pending: deque[asyncio.Task] = deque()
+    try:
+        first_pdf = await pool.run(render_report_pdf_job, reports[0])
+        next_index = 1
+        yield writer.add(names[0], first_pdf)
+
+        for i in range(1, len(reports)):
+            while next_index < len(reports) and len(pending) < window:
+                render = pool.run_when_admitted(render_report_pdf_job, reports[next_index])
+                pending.append(asyncio.create_task(render))
+                next_index += 1
+            yield writer.add(names[i], await pending.popleft())
+        yield writer.close()
+    finally:
+        # Client went away (or a render failed): stop the renders still queued.
+        for task in pending:
+            task.cancel()
+
+
+async def render_merged_pdf(pool: WorkerPool, reports: list[dict]) -> bytes:
+    """Every report in one PDF, rendered as a single job."""
+    return await pool.run(render_merged_report_pdf_job, reports)
@@ -0,0 +1,143 @@
+"""
+What-if scenarios: score many restructuring offers for one borrower at once.
+
+A recovery officer trying offers (a lower rate, a longer tenure, a
+principal write-down) used to send one `/predict` per offer. Here the
+base borrower and every variant are laid out as one (N + 1)-row column
+batch (row 0 is the base, unchanged) and run once through
+`engineer_features_batch`, the risk model and the vectorized
+`assign_recovery_strategies`. Segmentation and SHAP don't depend on the
+questions being asked, so they're skipped.
+
+A variant's `restructuring_cost` is what the lender concedes against the
+base terms, in INR: principal written off (lower `outstanding_loan`)
+plus the modification loss on the EMI schedule, i.e. how much less the
+variant's payments are worth than the base schedule's when both are
+discounted at the base rate. Stretching the tenure at the same rate
+costs nothing by this measure; cutting the rate does, however long the
+new tenure. Each part is floored at zero.
+"""
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from models.loader import MLArtifacts
+from repository.constants import HIGH_RISK_THRESHOLD, RECOVERY_STRATEGIES
+from services import feature_engineering, metrics, prediction_service
+from services.scoring_pipeline import borrower_columns
+
+# The terms a scenario may change, in grid-axis order.
+SCENARIO_TERMS = ("interest_rate", "loan_tenure", "outstanding_loan")
+_STRATEGIES = [RECOVERY_STRATEGIES[key] for key in prediction_service.STRATEGY_ORDER]
+
+
+def expand_scenarios(
+    grid: Mapping[str, Sequence[float] | None] | None, variants: Sequence[Mapping[str, Any]]
+) -> tuple[dict[str, np.ndarray], list[tuple[str, list]]]:
+    """
+    Override columns for every variant (NaN where a variant keeps the base
+    value) and the grid axes used. Grid combinations come first, the
+    first axis varying slowest, then `variants` in order.
+    """
+    axes = [(term, list(grid[term])) for term in SCENARIO_TERMS if grid and grid.get(term) is not None]
+    mesh = np.meshgrid(*[np.asarray(values, dtype=float) for _, values in axes], indexing="ij") if axes else []
+    grid_columns = {term: points.ravel() for (term, _), points in zip(axes, mesh)}
+    grid_size = mesh[0].size if axes else 0
+    columns = {}
+    for term in SCENARIO_TERMS:
+        listed = np.array([np.nan if v.get(term) is None else v[term] for v in variants], dtype=float)
+        columns[term] = np.concatenate([grid_columns.get(term, np.full(grid_size, np.nan)), listed])
+    return columns, axes
+
+
+def score_scenarios(
+    artifacts: MLArtifacts,
+    base: Mapping[str, Any],
+    grid: Mapping[str, Sequence[float] | None] | None,
+    variants: Sequence[Mapping[str, Any]],
+) -> dict:
+    """
+    Score the base borrower and every variant in one pass. Takes plain
+    values (`model_dump(mode="json")` of the request parts) and returns a
+    dict shaped like `ScenarioResponse`.
+    """
+    overrides, axes = expand_scenarios(grid, variants)
+    n_variants = len(overrides["interest_rate"])
+    columns = {name: np.repeat(column, n_variants + 1) for name, column in borrower_columns([base]).items()}
+    for term in SCENARIO_TERMS:
+        changed = ~np.isnan(overrides[term])
+        columns[term][1:][changed] = overrides[term][changed]
+
+    engineered = feature_engineering.engineer_features_batch(columns)
+    model_matrix = prediction_service.build_model_feature_matrix(
+        age=columns["age"],
+        monthly_income=columns["monthly_income"],
+        num_dependents=columns["num_dependents"],
+        engineered=engineered,
+        outstanding_loan=columns["outstanding_loan"],
+    )
+    risk_score = prediction_service.predict_risk_scores(artifacts, model_matrix)
+    strategy = prediction_service.assign_recovery_strategies(risk_score, engineered["days_past_due"])
+    metrics.SCENARIO_VARIANTS.inc(amount=n_variants)
+
+    monthly_emi = np.nan_to_num(engineered["monthly_emi"], nan=0.0)
+    emi_to_income = np.nan_to_num(engineered["emi_to_income_ratio"], nan=0.0)
+    rate_used = engineered["interest_rate_used"]
+    tenure_used = engineered["loan_tenure_used"]
+    outstanding = columns["outstanding_loan"]
+    # Present value of each schedule at the base rate, as a fraction of the
+    # principal (the base schedule's is 1): the variant's EMI over the EMI
+    # that would repay the principal at the base rate over the same tenure.
+    monthly_rate = rate_used / 1200
+    base_factor = feature_engineering.emi_factor(monthly_rate[0], tenure_used)
+    schedule_value = feature_engineering.emi_factor(monthly_rate, tenure_used) / base_factor
+    modification_loss = columns["loan_amount"] * (1.0 - schedule_value)
+    cost = np.round(np.maximum(modification_loss, 0.0) + np.maximum(outstanding[0] - outstanding, 0.0), 2)
+    category = [_STRATEGIES[k]["label"] for k in strategy.tolist()]
+
+    def outcome(row: int) -> dict:
+        return {
+            "index": row - 1 if row else None,
+            "interest_rate": float(rate_used[row]),
+            "loan_tenure": int(tenure_used[row]),
+            "outstanding_loan": float(outstanding[row]),
+            "monthly_emi": float(monthly_emi[row]),
+            "emi_to_income_ratio": float(emi_to_income[row]),
+            "risk_score": float(risk_score[row]),
+            "risk_category": category[row],
+            "strategy": _STRATEGIES[strategy[row]]["strategy"],
+            "restructuring_cost": float(cost[row]),
+        }
+
+    surface = None
+    if axes:
+        shape = [len(values) for _, values in axes]
+        surface = {
+            "axes": [{"field": term, "values": values} for term, values in axes],
+            "risk_score": risk_score[1 : 1 + int(np.prod(shape))].reshape(shape).tolist(),
+        }
+
+    # Cheapest offer out of the high-risk tiers: lowest cost, then lowest risk, then first listed.
+    below = np.flatnonzero(risk_score[1:] <= HIGH_RISK_THRESHOLD) + 1
+    cheapest = None
+    if len(below):
+        cheapest = outcome(int(below[np.lexsort((below, risk_score[below], cost[below]))[0]]))
+
+    return {
+        "model_version": artifacts.version,
+        "high_risk_threshold": HIGH_RISK_THRESHOLD,
+        "base": outcome(0),
+        "variants": {
+            "interest_rate": rate_used[1:].tolist(),
+            "loan_tenure": tenure_used[1:].astype(int).tolist(),
+            "outstanding_loan": outstanding[1:].tolist(),
+            "monthly_emi": monthly_emi[1:].tolist(),
+            "emi_to_income_ratio": emi_to_income[1:].tolist(),
+            "risk_score": risk_score[1:].tolist(),
+            "risk_category": category[1:],
+            "restructuring_cost": cost[1:].tolist(),
+        },
+        "surface": surface,
+        "cheapest_below_threshold": cheapest,
+    }
@@ -0,0 +1,91 @@
+"""
+Scored-borrower lookups: persist prediction results and rebuild the
+analytics and report inputs from a borrower ID.
+
+The dashboard and the PDF used to need the client to send the whole
+prediction back. With the result store (repository/result_store.py) the
+server already has it: these helpers map a stored `PredictionResult`
+onto exactly the fields `AnalyticsRequest` and `ReportRequest` take, the
+same mapping the frontend does.
+"""
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from config.settings import settings
+from repository.result_store import get_result_store
+
+
+class BorrowerNotFoundError(LookupError):
+    """No stored result for the borrower ID (never scored, or the store is off)."""
+
+
+def save_results(results: Iterable[tuple[str, Mapping[str, Any], Mapping[str, Any]]]) -> None:
+    """
+    Queue `(borrower_id, borrower, scored)` triples for the store, where
+    `borrower` is the JSON-mode `BorrowerInput` and `scored` the
+    `scoring_pipeline` dict. Returns at once; the write happens in the
+    background.
+    """
+    if settings.result_store_enabled:
+        get_result_store().put_many(
+            {**scored, "borrower_id": borrower_id, "input": borrower} for borrower_id, borrower, scored in results
+        )
+
+
+def load_result(borrower_id: str) -> dict:
+    """The stored `PredictionResult` for `borrower_id`, as a dict."""
+    result = get_result_store().get(borrower_id) if settings.result_store_enabled else None
+    if result is None:
+        raise BorrowerNotFoundError(f"No scored borrower with ID {borrower_id!r}")
+    return result
+
+
+def analytics_inputs(result: Mapping[str, Any]) -> dict:
+    """`build_analytics_bundle` keyword arguments for a stored result."""
+    calculated, borrower = result["calculated"], result["input"]
+    return {
+        "emi_to_income_ratio": calculated["emi_to_income_ratio"],
+        "collateral_coverage": calculated["collateral_coverage"],
+        "loan_tenure": calculated["loan_tenure_used"],
+        "missed_payments": borrower["missed_payments"],
+        "loan_amount": borrower["loan_amount"],
+        "collateral_value": borrower["collateral_value"],
+        "risk_score": result["risk_score"],
+    }
+
+
+def report_inputs(result: Mapping[str, Any]) -> dict:
+    """A `ReportRequest`-shaped dict for a stored result."""
+    calculated, borrower = result["calculated"], result["input"]
+    return {
+        "borrower_id": result["borrower_id"],
+        "first_name": borrower["first_name"],
+        "last_name": borrower["last_name"],
+        "gender": borrower["gender"],
+        "age": borrower["age"],
+        "loan_type": borrower["loan_type"],
+        "custom_scheme": borrower["interest_rate"] is not None,
+        "monthly_income": borrower["monthly_income"],
+        "loan_amount": borrower["loan_amount"],
+        "outstanding_loan": borrower["outstanding_loan"],
+        "loan_tenure": calculated["loan_tenure_used"],
+        "interest_rate": calculated["interest_rate_used"],
+        "collateral_value": borrower["collateral_value"],
+        "missed_payments": borrower["missed_payments"],
+        "days_past_due": calculated["days_past_due"],
+        "collection_attempts": calculated["collection_attempts"],
+        "monthly_emi": calculated["monthly_emi"],
+        "emi_to_income": calculated["emi_to_income_ratio"],
+        "collateral_coverage": calculated["collateral_coverage"],
+        "default_severity": calculated["default_severity"],
+        "risk_score": result["risk_score"],
+        "risk_category": result["risk_category"],
+        "strategy": result["strategy"],
+        "segment_name": result["segment"]["segment_name"],
+        "segment_description": result["segment"]["description"],
+    }
+
+
+def find_borrowers(**filters: Any) -> list[dict]:
+    """Summaries of stored results (see `ResultStore.find`); empty if the store is off."""
+    return get_result_store().find(**filters) if settings.result_store_enabled else []
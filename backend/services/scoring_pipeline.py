@@ -0,0 +1,129 @@
+"""
+Scoring pipeline: the full feature engineering -> risk model -> strategy ->
+segmentation -> SHAP chain, run over N borrowers at once.
+
+Both `/predict` (N = 1) and `/predict/batch` go through `score_borrowers`,
+so the single-borrower and portfolio paths can never drift apart. Inputs
+are pivoted to columns once; feature engineering, XGBoost, scaler/KMeans
+and SHAP each run once over the whole N-row batch, and only result
+shaping is per row. Each stage's time is recorded in
+`scoring_stage_duration_seconds` (services/metrics.py).
+"""
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from models.loader import MLArtifacts
+from services import feature_engineering, metrics, prediction_service, segmentation_service, shap_service
+
+_NUMERIC_INPUT_FIELDS = (
+    "age",
+    "monthly_income",
+    "num_dependents",
+    "loan_amount",
+    "collateral_value",
+    "outstanding_loan",
+    "missed_payments",
+    "days_past_due",
+    "collection_attempts",
+    "interest_rate",
+    "loan_tenure",
+)
+# Every input field the pipeline reads; anything else a borrower carries
+# (names, gender) never changes the result.
+MODEL_INPUT_FIELDS = ("loan_type", *_NUMERIC_INPUT_FIELDS)
+
+
+def borrower_columns(borrowers: Sequence[Mapping]) -> dict[str, np.ndarray]:
+    """Pivot row-shaped borrower mappings into the columns the batch services take."""
+    return {
+        "loan_type": np.array([b["loan_type"] for b in borrowers], dtype=object),
+        **{
+            name: np.array([b.get(name) for b in borrowers], dtype=float)
+            for name in _NUMERIC_INPUT_FIELDS
+        },
+    }
+
+
+def score_borrowers(artifacts: MLArtifacts, borrowers: Sequence[Mapping]) -> list[dict]:
+    """
+    Score already-validated borrowers and return one result dict per row,
+    in input order.
+
+    Each borrower is a mapping with `BorrowerInput` field names and plain
+    values (enum fields as their string value, e.g. `payload.model_dump(mode="json")`).
+    The returned dicts carry everything in `PredictionResult` (including
+    the `model_version` that scored them) except the per-request
+    `borrower_id` and `input` echo, which the route adds.
+    """
+    if not borrowers:
+        return []
+    return score_columns(artifacts, borrower_columns(borrowers))
+
+
+def score_columns(artifacts: MLArtifacts, columns: Mapping[str, np.ndarray]) -> list[dict]:
+    """`score_borrowers` over columnar input (see `borrower_columns`)."""
+    timer = metrics.StageTimer()
+    engineered = feature_engineering.engineer_features_batch(columns)
+    timer.lap("engineer_features")
+
+    model_matrix = prediction_service.build_model_feature_matrix(
+        age=columns["age"],
+        monthly_income=columns["monthly_income"],
+        num_dependents=columns["num_dependents"],
+        engineered=engineered,
+        outstanding_loan=columns["outstanding_loan"],
+    )
+    segmentation_matrix = segmentation_service.build_segmentation_feature_matrix(
+        age=columns["age"],
+        monthly_income=columns["monthly_income"],
+        num_dependents=columns["num_dependents"],
+        outstanding_loan=columns["outstanding_loan"],
+        engineered=engineered,
+    )
+    timer.lap("build_feature_matrices")
+
+    risk_scores = prediction_service.predict_risk_scores(artifacts, model_matrix)
+    timer.lap("predict_risk_scores")
+    segments = segmentation_service.assign_segments(artifacts, segmentation_matrix)
+    timer.lap("assign_segments")
+    shap_top_features = shap_service.compute_shap_top_features_batch(artifacts, model_matrix)
+    timer.lap("compute_shap_top_features")
+
+    monthly_emi = np.nan_to_num(engineered["monthly_emi"], nan=0.0).tolist()
+    emi_to_income = np.nan_to_num(engineered["emi_to_income_ratio"], nan=0.0).tolist()
+    coverage = np.nan_to_num(engineered["collateral_coverage"], nan=0.0).tolist()
+    days_past_due = engineered["days_past_due"].astype(int).tolist()
+    collection_attempts = engineered["collection_attempts"].astype(int).tolist()
+    default_severity = engineered["default_severity"].tolist()
+    rate_used = engineered["interest_rate_used"].tolist()
+    tenure_used = engineered["loan_tenure_used"].astype(int).tolist()
+
+    results = []
+    for i, (risk_score, segment, top_features) in enumerate(
+        zip(risk_scores.tolist(), segments, shap_top_features)
+    ):
+        strategy_info = prediction_service.assign_recovery_strategy(risk_score, days_past_due[i])
+        results.append(
+            {
+                "risk_score": risk_score,
+                "risk_category": strategy_info["label"],
+                "strategy": strategy_info["strategy"],
+                "calculated": {
+                    "monthly_emi": monthly_emi[i],
+                    "days_past_due": days_past_due[i],
+                    "collection_attempts": collection_attempts[i],
+                    "emi_to_income_ratio": emi_to_income[i],
+                    "collateral_coverage": coverage[i],
+                    "default_severity": default_severity[i],
+                    "interest_rate_used": rate_used[i],
+                    "loan_tenure_used": tenure_used[i],
+                },
+                "segment": segment,
+                "shap_top_features": top_features,
+                "model_version": artifacts.version,
+            }
+        )
+    timer.lap("shape_results")
+    metrics.SCORING_ROWS.inc(amount=len(results))
+    return results
@@ -45,15 +45,63 @@ def build_segmentation_feature_vector(
     return np.array(ordered, dtype=float).reshape(1, -1)
 
 
+def build_segmentation_feature_matrix(
+    *,
+    age: np.ndarray,
+    monthly_income: np.ndarray,
+    num_dependents: np.ndarray,
+    outstanding_loan: np.ndarray,
+    engineered: dict[str, np.ndarray],
+) -> np.ndarray:
+    """Columnar form of `build_segmentation_feature_vector` for N borrowers."""
+    feature_map = {
+        "Age": age,
+        "Monthly_Income": monthly_income,
+        "Num_Dependents": num_dependents,
+        "Loan_Tenure": engineered["loan_tenure_used"],
+        "Interest_Rate": engineered["interest_rate_used"],
+        "Outstanding_Loan_Amount": outstanding_loan,
+        "Collection_Attempts": engineered["collection_attempts"],
+        "EMI_to_Income_Ratio": np.nan_to_num(engineered["emi_to_income_ratio"], nan=0.0),
+        "Collateral_Coverage": np.nan_to_num(engineered["collateral_coverage"], nan=0.0),
+        "Default_Severity": engineered["default_severity"],
+    }
+    return np.column_stack([np.asarray(feature_map[name], dtype=float) for name in SEGMENTATION_FEATURE_ORDER])
+
+
 def assign_segment(artifacts: MLArtifacts, raw_feature_vector: np.ndarray) -> dict:
     """
-    Scale the raw 14-feature vector and predict its KMeans cluster.
+    Assign the raw 14-feature vector to its nearest KMeans segment.
 
     Returns a dict with segment_id, segment_name, and a plain-language
-    business description suitable for display in the dashboard and PDF.
+    business description suitable for display in the dashboard and PDF,
+    plus how confidently the borrower belongs there: the distance to the
+    segment's centroid and the margin by which the next-nearest segment
+    lost (both in scaled feature units).
+    """
+    return assign_segments(artifacts, raw_feature_vector)[0]
+
+
+def assign_segments(artifacts: MLArtifacts, raw_feature_matrix: np.ndarray) -> list[dict]:
+    """
+    Batch form of `assign_segment`: one fused scale-and-nearest-centroid
+    computation for all N rows (models/centroid_segmenter.py), results in
+    input order. Same segments as `kmeans.predict(scaler.transform(X))`.
     """
-    scaled = artifacts.scaler.transform(raw_feature_vector)
-    cluster_id = int(artifacts.kmeans.predict(scaled)[0])
+    assignments = artifacts.segmenter.assign(raw_feature_matrix)
+    return [
+        {
+            **_describe_segment(artifacts, cluster_id),
+            "centroid_distance": distance,
+            "next_segment_margin": margin,
+        }
+        for cluster_id, distance, margin in zip(
+            assignments.segment_ids.tolist(), assignments.distances.tolist(), assignments.margins.tolist()
+        )
+    ]
+
+
+def _describe_segment(artifacts: MLArtifacts, cluster_id: int) -> dict:
     segment_name = artifacts.segment_names.get(cluster_id, f"Segment {cluster_id}")
     description = SEGMENT_DESCRIPTIONS.get(
         segment_name,
@@ -9,7 +9,7 @@ directional wording are ported verbatim from the original.
 """
 import numpy as np
 
-from models.loader import MLArtifacts
+from models.loader import MLArtifacts, get_shap_explainer
 from repository.constants import MODEL_FEATURE_ORDER
 
 # Human-readable labels for the SHAP chart axis — matches the original
@@ -42,7 +42,7 @@ _PLAIN_LANGUAGE_DESCRIPTIONS = {
 }
 
 
-def _describe_feature(display_name: str) -> str:
+def describe_feature(display_name: str) -> str:
     return _PLAIN_LANGUAGE_DESCRIPTIONS.get(
         display_name, f"Feature '{display_name}' has a notable impact on risk."
     )
@@ -56,32 +56,41 @@ def compute_shap_top_features(
     impactful features as plain dicts (feature, value, shap_value,
     direction, description), ready to serialize as JSON.
     """
-    import shap  # imported lazily — heavy dependency, only needed here
-
-    explainer = shap.TreeExplainer(artifacts.xgb_model)
-    shap_values = explainer.shap_values(feature_vector)
-
-    row_values = shap_values[0]
-    abs_impact = np.abs(row_values)
-    top_idx = np.argsort(abs_impact)[::-1][:top_n]
-
-    results = []
-    for idx in top_idx:
-        internal_name = MODEL_FEATURE_ORDER[idx]
-        display_name = SHAP_DISPLAY_NAMES[internal_name]
-        value = float(feature_vector[0][idx])
-        impact = float(row_values[idx])
-        direction = "increased" if impact > 0 else "decreased"
-        results.append(
-            {
-                "feature": display_name,
-                "value": value,
-                "shap_value": impact,
-                "direction": direction,
-                "description": _describe_feature(display_name),
-            }
-        )
-    return results
+    return compute_shap_top_features_batch(artifacts, feature_vector, top_n=top_n)[0]
+
+
+def compute_shap_top_features_batch(
+    artifacts: MLArtifacts, feature_matrix: np.ndarray, top_n: int = 3
+) -> list[list[dict]]:
+    """
+    Batch form of `compute_shap_top_features`: explains all N rows with a
+    single `shap_values` call and returns one top-N list per row, in input
+    order.
+    """
+    explainer = get_shap_explainer(artifacts)
+    shap_values = np.asarray(explainer.shap_values(feature_matrix)).reshape(feature_matrix.shape)
+
+    top_idx = np.argsort(np.abs(shap_values), axis=1)[:, ::-1][:, :top_n]
+
+    batch_results = []
+    for row, row_values, row_top_idx in zip(feature_matrix, shap_values, top_idx):
+        results = []
+        for idx in row_top_idx:
+            internal_name = MODEL_FEATURE_ORDER[idx]
+            display_name = SHAP_DISPLAY_NAMES[internal_name]
+            impact = float(row_values[idx])
+            direction = "increased" if impact > 0 else "decreased"
+            results.append(
+                {
+                    "feature": display_name,
+                    "value": float(row[idx]),
+                    "shap_value": impact,
+                    "direction": direction,
+                    "description": describe_feature(display_name),
+                }
+            )
+        batch_results.append(results)
+    return batch_results
 
 
 def build_non_shap_insights(
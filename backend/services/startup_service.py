@@ -0,0 +1,133 @@
+"""
+Startup sequence, and a timing breakdown of it.
+
+On a scale-to-zero host every cold start is user-facing, so startup does
+only what the first request needs, in this order:
+
+    load_artifacts     current bundle: manifest, checksums, mmap'd arrays
+                       (the precompiled native engine; no `import xgboost`)
+    start_worker_pool  plus each worker process's own artifact load
+    warmup             a synthetic prediction through the whole pipeline, so
+                       first-call costs aren't paid by the first real request
+
+What only some requests need — the XGBoost booster (large batches) and
+ReportLab (PDFs) — is imported afterwards, on a background thread once the
+app is already serving (`startup_mode = "fast"`), or inline before it
+starts serving (`"eager"`).
+
+Every phase is timed into `profile`, served at GET /health/startup.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from config.settings import settings
+from models.loader import get_ml_artifacts
+from services.model_lifecycle import start_bundle_watcher, warm_up
+from services.worker_pool import get_worker_pool, start_worker_pool
+
+logger = logging.getLogger(__name__)
+
+# Modules worth knowing about when reading a cold-start profile.
+_HEAVY_MODULES = ("xgboost", "sklearn", "scipy", "pandas", "reportlab", "shap")
+
+
+def _process_age_seconds() -> float | None:
+    """Seconds since this process was exec'd (Linux only; None elsewhere)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (after the parenthesised command name) is the start time in clock ticks.
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+class StartupProfile:
+    """Phase durations of the startup sequence (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.phases: dict[str, float] = {}
+        self.background: dict[str, float] = {}
+        self.boot_seconds: float | None = None
+        self.ready_seconds: float | None = None
+        self.modules_at_ready: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str, background: bool = False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                (self.background if background else self.phases)[name] = time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        def ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        with self._lock:
+            return {
+                "mode": settings.startup_mode,
+                "process_boot_to_startup_ms": ms(self.boot_seconds),
+                "phases_ms": {name: ms(s) for name, s in self.phases.items()},
+                "process_start_to_ready_ms": ms(self.ready_seconds),
+                "background_ms": {name: ms(s) for name, s in self.background.items()},
+                "heavy_modules_at_ready": self.modules_at_ready,
+            }
+
+
+profile = StartupProfile()
+
+
+def _preload_booster() -> None:
+    # With worker processes the booster is only ever used inside them.
+    if settings.worker_processes > 0:
+        get_worker_pool().warm_up(include_booster=True)
+    else:
+        warm_up(get_ml_artifacts(), include_booster=True)
+
+
+def _preload_reportlab() -> None:
+    from services.pdf_service import report_styles
+
+    report_styles()
+
+
+_DEFERRED = (("import_xgboost_and_load_booster", _preload_booster), ("import_reportlab", _preload_reportlab))
+
+
+def _run_deferred(background: bool) -> None:
+    for name, preload in _DEFERRED:
+        try:
+            with profile.phase(name, background=background):
+                preload()
+        except Exception:
+            logger.exception("Preload step %s failed; it will be retried on first use", name)
+
+
+def run_startup() -> None:
+    """The app's startup hook: load, warm, and schedule or run the deferred imports."""
+    profile.boot_seconds = _process_age_seconds()
+    with profile.phase("load_artifacts"):
+        artifacts = get_ml_artifacts()
+    with profile.phase("start_worker_pool"):
+        start_worker_pool()
+    with profile.phase("warmup"):
+        warm_up(artifacts, include_booster=False)
+    start_bundle_watcher()
+
+    if settings.startup_mode == "eager":
+        _run_deferred(background=False)
+    profile.modules_at_ready = [name for name in _HEAVY_MODULES if name in sys.modules]
+    profile.ready_seconds = _process_age_seconds()
+    if settings.startup_mode != "eager":
+        threading.Thread(target=_run_deferred, args=(True,), name="startup-preload", daemon=True).start()
+
+    logger.info("Startup phases (ms): %s", profile.as_dict()["phases_ms"])
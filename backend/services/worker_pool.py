@@ -0,0 +1,207 @@
+"""
+Executor layer for CPU-bound work: scoring, SHAP and PDF rendering.
+
+XGBoost, SHAP and ReportLab hold the GIL for most of their work, so in a
+plain `def` route one uvicorn worker barely uses more than a core. With
+`settings.worker_processes > 0`, jobs run in a `ProcessPoolExecutor` whose
+workers each load `MLArtifacts` once, in their initializer. With 0 (the
+default, sized for a single-core free-tier box) the same jobs run in the
+event loop's thread pool, in-process.
+
+Either way the number of jobs admitted at once is bounded: busy workers
+plus `settings.worker_queue_size` waiting jobs. Past that, `run` raises
+`PoolSaturatedError` straight away (the app maps it to a 503 with
+Retry-After), so a burst gets a clear "busy" answer instead of an
+ever-growing queue and timeouts.
+
+Jobs are plain top-level functions taking and returning picklable values,
+so they can cross the process boundary. Scoring jobs carry the artifact
+version the app routed them to, so worker processes follow a hot reload
+(services/model_lifecycle.py) without being restarted. Metrics a job
+records inside a worker process are handed back with its result and
+merged into the app's registry.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from config.settings import settings
+from models.loader import follow_routed_versions, get_ml_artifacts, get_ml_artifacts_version
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(RuntimeError):
+    """Every worker is busy and the waiting queue is full."""
+
+
+# Wait between retries in `WorkerPool.run_when_admitted` (seconds).
+_SATURATED_RETRY_DELAY = 0.05
+
+
+# --- Jobs (run inside a worker process, or a thread when in-process) ---
+
+
+def _start_worker() -> None:
+    """Process pool initializer: runs once in each new worker process."""
+    follow_routed_versions()
+    _init_worker()
+
+
+def _init_worker(version: str | None = None, include_booster: bool = False) -> None:
+    artifacts = get_ml_artifacts() if version is None else get_ml_artifacts_version(version)
+    if include_booster:
+        artifacts.xgb_model_source.get()
+
+
+def score_borrowers_job(borrowers: list[dict], version: str | None = None) -> list[dict]:
+    """
+    Run `scoring_pipeline.score_borrowers` on the worker's own copy of the
+    artifacts `version` (the active version if None).
+    """
+    from services.scoring_pipeline import score_borrowers
+
+    artifacts = get_ml_artifacts() if version is None else get_ml_artifacts_version(version)
+    return score_borrowers(artifacts, borrowers)
+
+
+def score_scenarios_job(base: dict, grid: dict | None, variants: list[dict], version: str | None = None) -> dict:
+    """Run `scenario_service.score_scenarios` on the worker's copy of the artifacts `version`."""
+    from services.scenario_service import score_scenarios
+
+    artifacts = get_ml_artifacts() if version is None else get_ml_artifacts_version(version)
+    return score_scenarios(artifacts, base, grid, variants)
+
+
+def score_csv_chunk_job(
+    header: list[str], records: list[str], output_format: str, first_row_number: int, version: str | None = None
+) -> str:
+    """Run `csv_scoring_service.score_record_chunk` on the worker's copy of the artifacts `version`."""
+    from services.csv_scoring_service import score_record_chunk
+
+    artifacts = get_ml_artifacts() if version is None else get_ml_artifacts_version(version)
+    return score_record_chunk(artifacts, header, records, output_format, first_row_number)
+
+
+def render_report_pdf_job(report_data: dict) -> bytes:
+    """Render one borrower PDF report."""
+    from services.pdf_service import generate_borrower_report_pdf
+
+    return generate_borrower_report_pdf(report_data)
+
+
+def render_merged_report_pdf_job(reports: list[dict]) -> bytes:
+    """Render several borrowers' reports into one PDF."""
+    from services.pdf_service import generate_merged_report_pdf
+
+    return generate_merged_report_pdf(reports)
+
+
+def _run_reporting_metrics(fn: Callable[..., Any], *args: Any) -> tuple[Any, dict]:
+    """Run a job in a worker process and return its result with the metrics it recorded."""
+    return fn(*args), REGISTRY.drain()
+
+
+# --- Pool ---
+
+
+class WorkerPool:
+    """Bounded async front-end over a process pool (or the thread pool)."""
+
+    def __init__(self, processes: int, queue_size: int) -> None:
+        self.processes = processes
+        self.capacity = max(processes, 1) + queue_size
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        if processes > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_start_worker,
+            )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def warm_up(self, version: str | None = None, include_booster: bool = False) -> None:
+        """
+        Start every worker process now, with artifacts `version` loaded
+        (and the XGBoost booster too, with `include_booster`), so the first
+        requests don't pay for it. Best effort: the executor picks which
+        process runs each warm-up job.
+        """
+        if self._executor is not None:
+            futures = [
+                self._executor.submit(_init_worker, version, include_booster) for _ in range(self.processes)
+            ]
+            for future in futures:
+                future.result()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` off the event loop, or raise `PoolSaturatedError` if full."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise PoolSaturatedError(f"{self._in_flight} jobs in flight (capacity {self.capacity})")
+            self._in_flight += 1
+        try:
+            if self._executor is None:
+                return await asyncio.to_thread(fn, *args)
+            result, recorded = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_reporting_metrics, fn, *args
+            )
+            REGISTRY.merge(recorded)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def run_when_admitted(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        `run`, but wait for room instead of raising `PoolSaturatedError`:
+        for streamed responses, where once the response has started there's
+        no status code left to send.
+        """
+        while True:
+            try:
+                return await self.run(fn, *args)
+            except PoolSaturatedError:
+                await asyncio.sleep(_SATURATED_RETRY_DELAY)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: WorkerPool | None = None
+
+
+def start_worker_pool() -> WorkerPool:
+    """Create (and warm) the app-wide pool from settings; called from the startup hook."""
+    global _pool
+    if _pool is None:
+        _pool = WorkerPool(settings.worker_processes, settings.worker_queue_size)
+        _pool.warm_up()
+        logger.info(
+            "Worker pool ready: %s, capacity %d jobs",
+            f"{_pool.processes} processes" if _pool.processes else "in-process threads",
+            _pool.capacity,
+        )
+    return _pool
+
+
+def get_worker_pool() -> WorkerPool:
+    """The app-wide pool, created on first use if the startup hook hasn't run."""
+    return _pool if _pool is not None else start_worker_pool()
+
+
+def shutdown_worker_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
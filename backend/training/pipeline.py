@@ -0,0 +1,308 @@
+"""
+Model retraining pipeline: dataset -> features -> tuned XGBoost + KMeans
+segmentation -> model bundle.
+
+Trains against `Recovery_Status`, the actual observed loan outcome. The
+original notebook trained on `High_Risk_Flag`, a label derived from
+KMeans clusters over the same features the classifier used, so the
+model only reconstructed its own clustering rule.
+
+Features come from the same columnar engine the API serves with
+(services/feature_engineering.engineer_features_batch), so training and
+serving share one implementation. The engineered matrix is cached on
+disk under a key covering the dataset bytes and that feature code, so
+reruns skip the CSV parse and feature engineering until either changes.
+
+`retrain.py` is the command-line entry point; `run_retraining` is the
+same pipeline for use from Python.
+"""
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import KMeans
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from config.settings import settings
+from models.bundle import write_bundle
+from models.loader import MLArtifacts, get_ml_artifacts
+from repository import constants
+from repository.constants import MODEL_FEATURE_ORDER
+from services import feature_engineering, prediction_service
+from training.search import SearchResult, randomized_search
+
+logger = logging.getLogger(__name__)
+
+FEATURES = MODEL_FEATURE_ORDER
+# Same search space as the original notebook.
+XGB_PARAM_GRID = {
+    "n_estimators": [100, 200, 300],
+    "max_depth": [3, 5, 7, 10],
+    "learning_rate": [0.01, 0.05, 0.1, 0.2],
+    "subsample": [0.7, 0.8, 1.0],
+    "colsample_bytree": [0.7, 0.8, 1.0],
+}
+# Written Off or Partially Recovered = at risk (1); Fully Recovered = 0.
+AT_RISK_STATUSES = ("Written Off", "Partially Recovered")
+# The source files whose code decides the feature values; editing any of
+# them invalidates cached feature matrices.
+_FEATURE_CODE = (feature_engineering, prediction_service, constants)
+_CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class RetrainConfig:
+    dataset_path: Path = settings.training_dataset_path
+    cache_dir: Path | None = settings.training_cache_dir  # None: no feature cache, no checkpoints
+    bundles_dir: Path = settings.model_bundles_dir
+    metrics_path: Path | None = Path("metrics_report.json")
+    activate: bool = True  # point CURRENT at the new bundle
+    random_state: int = 42
+    n_iter: int = 15
+    cv_splits: int = 3
+    # CPU cores for the search, shared between parallel trials and XGBoost threads.
+    n_jobs: int = field(default_factory=lambda: os.cpu_count() or 1)
+    resume: bool = True
+
+
+@dataclass(frozen=True)
+class TrainingData:
+    X: np.ndarray  # N x len(FEATURES) model features
+    y: np.ndarray  # at-risk target, 0/1
+    cache_hit: bool
+
+
+@dataclass(frozen=True)
+class RetrainResult:
+    bundle_path: Path
+    search: SearchResult
+    metrics: dict[str, dict]
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def feature_cache_key(dataset_path: Path) -> str:
+    """Hash of the dataset bytes, the feature list and the feature engineering code."""
+    digest = hashlib.sha256(f"{_CACHE_FORMAT}:{FEATURES}:{_sha256_file(dataset_path)}".encode())
+    for module in _FEATURE_CODE:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def engineer_training_data(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Model feature matrix and at-risk target for a dataset frame."""
+    engineered = feature_engineering.engineer_features_batch(
+        {
+            "loan_type": df["Loan_Type"],
+            "loan_amount": df["Loan_Amount"],
+            "collateral_value": df["Collateral_Value"],
+            "monthly_income": df["Monthly_Income"],
+            "missed_payments": df["Num_Missed_Payments"],
+            "days_past_due": df["Days_Past_Due"],
+            "collection_attempts": df["Collection_Attempts"],
+            "interest_rate": df["Interest_Rate"],
+            "loan_tenure": df["Loan_Tenure"],
+            # The loan book's recorded EMI is used as-is rather than recomputed.
+            "monthly_emi": df["Monthly_EMI"],
+        }
+    )
+    X = prediction_service.build_model_feature_matrix(
+        age=df["Age"],
+        monthly_income=df["Monthly_Income"],
+        num_dependents=df["Num_Dependents"],
+        engineered=engineered,
+        outstanding_loan=df["Outstanding_Loan_Amount"],
+    )
+    y = df["Recovery_Status"].isin(AT_RISK_STATUSES).to_numpy(dtype=np.int64)
+    return np.asarray(X, dtype=np.float64), y
+
+
+def load_training_data(dataset_path: Path, cache_dir: Path | None = None) -> TrainingData:
+    """The engineered training data, from the feature cache when it's current."""
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"features-{feature_cache_key(dataset_path)}.npz"
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                logger.info("Loaded %d engineered rows from %s", len(cached["y"]), cache_path)
+                return TrainingData(X=cached["X"], y=cached["y"], cache_hit=True)
+
+    df = pd.read_csv(dataset_path)
+    logger.info("Loaded %d rows, %d columns from %s", df.shape[0], df.shape[1], dataset_path)
+    X, y = engineer_training_data(df)
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        staging = cache_path.with_suffix(".tmp.npz")
+        np.savez(staging, X=X, y=y)
+        os.replace(staging, cache_path)
+    return TrainingData(X=X, y=y, cache_hit=False)
+
+
+def _frame(X: np.ndarray) -> pd.DataFrame:
+    # Fitting on named columns stores the feature names in the saved booster.
+    # Column-major like a DataFrame built column by column, so the scaler's
+    # column sums run in the same order (bit-identical statistics).
+    return pd.DataFrame(np.asfortranarray(X), columns=FEATURES)
+
+
+def evaluate(model: Any, X: np.ndarray, y: np.ndarray, label: str) -> dict:
+    pred = model.predict(_frame(X))
+    proba = model.predict_proba(_frame(X))[:, 1]
+    auc = roc_auc_score(y, proba)
+    logger.info(
+        "=== %s ===\n%s\n%s\nROC AUC: %.4f",
+        label, confusion_matrix(y, pred), classification_report(y, pred), auc,
+    )
+    return {
+        "accuracy": accuracy_score(y, pred),
+        "precision": precision_score(y, pred),
+        "recall": recall_score(y, pred),
+        "f1": f1_score(y, pred),
+        "roc_auc": auc,
+        "n": len(y),
+    }
+
+
+def align_with_previous_segments(kmeans: Any, scaler: StandardScaler, previous: MLArtifacts) -> None:
+    """
+    Renumber `kmeans`'s clusters in place so each takes the ID of the
+    previous bundle's cluster nearest to it (one to one, minimizing the
+    total squared distance between centroids in the previous bundle's
+    scaled units). A new bundle reuses the previous segment names by ID,
+    and (MiniBatch)KMeans numbers its clusters arbitrarily, so without
+    this the names could land on the wrong borrowers.
+    """
+    if previous.segmenter is None or previous.segmenter.n_clusters != kmeans.n_clusters:
+        logger.warning(
+            "Previous bundle has %s segments, not %d; segment names may not fit the new clusters.",
+            previous.segmenter.n_clusters if previous.segmenter is not None else "no",
+            kmeans.n_clusters,
+        )
+        return
+    raw_centers = kmeans.cluster_centers_ * scaler.scale_ + scaler.mean_
+    # Rows: previous IDs (0..k-1, in order); columns: the new cluster matched to each.
+    _, new_ids = linear_sum_assignment(previous.segmenter.squared_distances(raw_centers).T)
+    kmeans.cluster_centers_ = kmeans.cluster_centers_[new_ids]
+    logger.info("Matched new clusters %s to previous segments %s", new_ids.tolist(), list(range(len(new_ids))))
+
+
+def fit_segmentation(
+    X: np.ndarray, random_state: int, n_clusters: int = 4, previous: MLArtifacts | None = None
+) -> tuple[StandardScaler, KMeans]:
+    """
+    StandardScaler -> KMeans over the model features (unsupervised, so not
+    circular). With `previous`, clusters are numbered to match its
+    segments (see `align_with_previous_segments`).
+    """
+    scaler = StandardScaler()
+    scaled = scaler.fit_transform(_frame(X))
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10).fit(scaled)
+    if previous is not None:
+        align_with_previous_segments(kmeans, scaler, previous)
+    segments = kmeans.predict(scaled)
+    profile = _frame(X).groupby(segments).mean().round(2)
+    logger.info("=== Segment profiles (for manual naming) ===\n%s", profile)
+    return scaler, kmeans
+
+
+def run_retraining(config: RetrainConfig = RetrainConfig()) -> RetrainResult:
+    """Run the whole pipeline and write (and by default activate) a new model bundle."""
+    data = load_training_data(config.dataset_path, config.cache_dir)
+    positives = int(data.y.sum())
+    logger.info("At-risk target: %d of %d (%.3f)", positives, len(data.y), positives / len(data.y))
+
+    # 70/30 train/test, then 80/20 train/valid within train — same splits as the original.
+    indices = np.arange(len(data.y))
+    train_index, test_index = train_test_split(
+        indices, test_size=0.3, random_state=config.random_state, stratify=data.y
+    )
+    fit_index, valid_index = train_test_split(
+        train_index, test_size=0.2, random_state=config.random_state, stratify=data.y[train_index]
+    )
+    X, y = data.X, data.y
+    logger.info("Train: %d | Valid: %d | Test: %d", len(fit_index), len(valid_index), len(test_index))
+
+    base_params = {"random_state": config.random_state, "eval_metric": "logloss"}
+    baseline = XGBClassifier(**base_params, n_jobs=config.n_jobs)
+    baseline.fit(_frame(X[fit_index]), y[fit_index])
+    evaluate(baseline, X[valid_index], y[valid_index], "Baseline XGBoost — Validation")
+
+    checkpoint_path = None
+    if config.cache_dir is not None:
+        search_key = hashlib.sha256(
+            json.dumps(
+                [feature_cache_key(config.dataset_path), XGB_PARAM_GRID, config.n_iter, config.cv_splits,
+                 config.random_state, base_params],
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()[:16]
+        checkpoint_path = Path(config.cache_dir) / f"search-{search_key}.jsonl"
+        if not config.resume and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    search = randomized_search(
+        X[fit_index],
+        y[fit_index],
+        param_grid=XGB_PARAM_GRID,
+        n_iter=config.n_iter,
+        cv_splits=config.cv_splits,
+        random_state=config.random_state,
+        base_params=base_params,
+        n_jobs=config.n_jobs,
+        checkpoint_path=checkpoint_path,
+    )
+    logger.info("Best params: %s (CV ROC AUC %.4f)", search.best_params, search.best_score)
+
+    best = XGBClassifier(**base_params, **search.best_params, n_jobs=config.n_jobs)
+    best.fit(_frame(X[fit_index]), y[fit_index])
+    metrics = {
+        "validation": evaluate(best, X[valid_index], y[valid_index], "Tuned XGBoost — Validation"),
+        "test": evaluate(best, X[test_index], y[test_index], "Tuned XGBoost — Held-Out Test"),
+    }
+
+    # Segment names and the gender map aren't learned here, so they carry
+    # over from the bundle currently in use; the clusters are numbered to
+    # match its segments so the names still fit.
+    previous = get_ml_artifacts()
+    scaler, kmeans = fit_segmentation(X[train_index], config.random_state, previous=previous)
+    bundle_path = write_bundle(
+        config.bundles_dir,
+        xgb_model=best,
+        scaler_mean=scaler.mean_,
+        scaler_scale=scaler.scale_,
+        kmeans_centers=kmeans.cluster_centers_,
+        segment_names=previous.segment_names,
+        gender_map=previous.gender_map,
+        model_features=FEATURES,
+        segmentation_features=FEATURES,
+        make_current=config.activate,
+    )
+    if config.metrics_path is not None:
+        with open(config.metrics_path, "w") as f:
+            json.dump(metrics, f, indent=2)
+    logger.info("Saved model bundle %s (%s)", bundle_path.name, bundle_path)
+    return RetrainResult(bundle_path=bundle_path, search=search, metrics=metrics)
@@ -0,0 +1,161 @@
+"""
+Checkpointed, thread-coordinated randomized hyperparameter search.
+
+Same search as `RandomizedSearchCV(XGBClassifier(...), grid, n_iter,
+scoring="roc_auc", cv)` followed by a refit of the best candidate: the
+candidates come from the same `ParameterSampler`, each is scored by mean
+ROC AUC over the same folds, and ties go to the earlier candidate. Two
+things differ:
+
+* Threads. `RandomizedSearchCV(n_jobs=-1)` starts a worker per core and
+  each XGBoost fit inside it starts a thread per core too, so a search
+  runs cores^2 threads. Here one budget of `n_jobs` cores is split:
+  `plan_threads` picks how many trials run side by side and gives each
+  fit `n_jobs // workers` XGBoost threads.
+* Checkpoints. Each finished trial is appended (and fsynced) to a JSONL
+  file named after everything that determines the search, so rerunning
+  an interrupted search only runs the trials that are missing.
+
+Each trial's wall-clock time is logged and kept in its record.
+"""
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+from xgboost import XGBClassifier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    best_params: dict[str, Any]
+    best_score: float
+    # One record per candidate, in candidate order:
+    # {"trial", "params", "fold_scores", "mean_score", "wall_seconds", "resumed"}.
+    trials: list[dict]
+
+
+def plan_threads(n_jobs: int, pending_trials: int) -> tuple[int, int]:
+    """(trials run side by side, XGBoost threads per fit) within `n_jobs` cores."""
+    workers = max(1, min(n_jobs, pending_trials))
+    return workers, max(1, n_jobs // workers)
+
+
+def _run_trial(
+    trial: int,
+    params: dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    folds: list[tuple[np.ndarray, np.ndarray]],
+    base_params: dict[str, Any],
+    xgb_threads: int,
+) -> dict:
+    start = time.perf_counter()
+    fold_scores = []
+    for train_index, valid_index in folds:
+        model = XGBClassifier(**base_params, **params, n_jobs=xgb_threads)
+        model.fit(X[train_index], y[train_index])
+        fold_scores.append(float(roc_auc_score(y[valid_index], model.predict_proba(X[valid_index])[:, 1])))
+    return {
+        "trial": trial,
+        "params": params,
+        "fold_scores": fold_scores,
+        "mean_score": float(np.mean(fold_scores)),
+        "wall_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _read_checkpoint(path: Path) -> dict[int, dict]:
+    done: dict[int, dict] = {}
+    if not path.exists():
+        return done
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line) if line.endswith(b"\n") else None
+            except json.JSONDecodeError:
+                record = None
+            if record is None:
+                break  # a trial cut off mid-write; it reruns
+            done[record["trial"]] = record
+            valid_bytes += len(line)
+    if valid_bytes < path.stat().st_size:
+        os.truncate(path, valid_bytes)
+    return done
+
+
+def _append_checkpoint(path: Path, record: dict) -> None:
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _jsonable(params: dict[str, Any]) -> dict[str, Any]:
+    return {k: v.item() if isinstance(v, np.generic) else v for k, v in params.items()}
+
+
+def randomized_search(
+    X: np.ndarray,
+    y: np.ndarray,
+    *,
+    param_grid: dict[str, list],
+    n_iter: int,
+    cv_splits: int,
+    random_state: int,
+    base_params: dict[str, Any],
+    n_jobs: int,
+    checkpoint_path: Path | None = None,
+) -> SearchResult:
+    """
+    Score `n_iter` sampled candidates by cross-validated ROC AUC and return
+    the best. Trials already in `checkpoint_path` are reused, not rerun.
+    """
+    X, y = np.asarray(X), np.asarray(y)
+    candidates = [_jsonable(p) for p in ParameterSampler(param_grid, n_iter, random_state=random_state)]
+    cv = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=random_state)
+    folds = list(cv.split(X, y))
+
+    done = _read_checkpoint(checkpoint_path) if checkpoint_path is not None else {}
+    done = {t: r for t, r in done.items() if t < len(candidates) and r["params"] == candidates[t]}
+    for record in done.values():
+        record["resumed"] = True
+    pending = [t for t in range(len(candidates)) if t not in done]
+    if done:
+        logger.info(
+            "Resuming search from %s: %d of %d trials already done", checkpoint_path, len(done), len(candidates)
+        )
+
+    if pending:
+        workers, xgb_threads = plan_threads(n_jobs, len(pending))
+        logger.info(
+            "Running %d trials x %d folds: %d at a time, %d XGBoost thread(s) each",
+            len(pending), cv_splits, workers, xgb_threads,
+        )
+        results = Parallel(n_jobs=workers, return_as="generator_unordered")(
+            delayed(_run_trial)(t, candidates[t], X, y, folds, base_params, xgb_threads) for t in pending
+        )
+        for record in results:
+            if checkpoint_path is not None:
+                _append_checkpoint(checkpoint_path, record)
+            record["resumed"] = False
+            done[record["trial"]] = record
+            logger.info(
+                "Trial %d/%d: ROC AUC %.4f (folds %s) in %.2fs  %s",
+                record["trial"] + 1, len(candidates), record["mean_score"],
+                ", ".join(f"{s:.4f}" for s in record["fold_scores"]), record["wall_seconds"], record["params"],
+            )
+
+    trials = [done[t] for t in range(len(candidates))]
+    best = max(trials, key=lambda r: (r["mean_score"], -r["trial"]))
+    return SearchResult(best_params=best["params"], best_score=best["mean_score"], trials=trials)
@@ -0,0 +1,257 @@
+"""
+Out-of-core retraining, for collection histories too large to load.
+
+The in-memory pipeline (training/pipeline.py) reads the whole CSV,
+splits it with `train_test_split` and searches hyperparameters over the
+full matrix. This path makes the same artifact set (XGBoost booster,
+StandardScaler, KMeans centroids, in one model bundle) while only ever
+holding one chunk of rows:
+
+1. One pass over the CSV in `chunk_rows` chunks: engineer features with
+   the serving code, assign each row to train / valid / test by a seeded
+   hash of its `Borrower_ID` (70/30, then 80/20 within train, the same
+   proportions as the in-memory split), spill each part to `.npy` files,
+   and `StandardScaler.partial_fit` the train+valid rows.
+2. `MiniBatchKMeans.partial_fit` over the scaled train+valid chunks, then
+   its clusters are renumbered to match the current bundle's nearest
+   centroids, so the segment names carried over still fit.
+3. XGBoost trains from an `ExtMemQuantileDMatrix` fed by a `DataIter`
+   over the spilled train chunks; its quantized pages live on disk.
+4. Validation and test metrics are accumulated chunk by chunk. ROC AUC
+   comes from per-class score histograms (`_AUC_BINS` bins), so it needs
+   no per-row storage either.
+
+There is no hyperparameter search here: the booster uses `xgb_params`,
+by default `STREAMING_XGB_PARAMS`. That is a fixed set (what the
+in-memory search picked on the sample dataset), not read back from later
+searches, so pass tuned values explicitly after a new search. Memory that
+still grows with the row count is XGBoost's own per-row training state
+(gradients and the prediction cache, a few dozen bytes per row), not
+the data itself.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import xgboost
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from config.settings import settings
+from models.bundle import write_bundle
+from models.loader import get_ml_artifacts
+from training.pipeline import FEATURES, align_with_previous_segments, engineer_training_data
+
+logger = logging.getLogger(__name__)
+
+# What the in-memory search picked on the sample dataset; sklearn names.
+STREAMING_XGB_PARAMS = {
+    "n_estimators": 100,
+    "max_depth": 5,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 1.0,
+}
+_SPLITS = ("train", "valid", "test")
+_TEST_FRACTION = 0.3
+_VALID_FRACTION = 0.2  # of the non-test rows
+_AUC_BINS = 1 << 16
+
+
+@dataclass(frozen=True)
+class StreamingConfig:
+    dataset_path: Path = settings.training_dataset_path
+    # Spilled chunks and XGBoost's page cache go in a temporary directory here.
+    work_dir: Path = settings.training_cache_dir
+    bundles_dir: Path = settings.model_bundles_dir
+    metrics_path: Path | None = Path("metrics_report.json")
+    activate: bool = True
+    chunk_rows: int = settings.training_chunk_rows
+    random_state: int = 42
+    xgb_params: dict[str, Any] = field(default_factory=lambda: dict(STREAMING_XGB_PARAMS))
+    n_clusters: int = 4
+    kmeans_epochs: int = 3
+    n_jobs: int = field(default_factory=lambda: os.cpu_count() or 1)
+
+
+def assign_splits(borrower_ids: pd.Series, random_state: int) -> np.ndarray:
+    """0 (train), 1 (valid) or 2 (test) per row, from a seeded hash of its ID."""
+    hashed = pd.util.hash_pandas_object(borrower_ids, index=False, hash_key=f"{random_state:016d}"[:16])
+    uniform = (hashed.to_numpy() >> np.uint64(11)).astype(np.float64) * 2.0**-53
+    valid_cut = _TEST_FRACTION + (1 - _TEST_FRACTION) * _VALID_FRACTION
+    return np.where(uniform < _TEST_FRACTION, 2, np.where(uniform < valid_cut, 1, 0))
+
+
+class _SpilledChunks:
+    """The per-split chunk files written in the first pass."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.paths: dict[str, list[tuple[Path, Path]]] = {name: [] for name in _SPLITS}
+
+    def add(self, split: str, X: np.ndarray, y: np.ndarray) -> None:
+        if not len(y):
+            return
+        stem = self.directory / f"{split}-{len(self.paths[split]):06d}"
+        np.save(f"{stem}-X.npy", X)
+        np.save(f"{stem}-y.npy", y)
+        self.paths[split].append((Path(f"{stem}-X.npy"), Path(f"{stem}-y.npy")))
+
+    def iterate(self, *splits: str):
+        for split in splits:
+            for x_path, y_path in self.paths[split]:
+                yield np.load(x_path), np.load(y_path)
+
+
+class _ChunkIter(xgboost.DataIter):
+    """Feeds spilled chunks to XGBoost's external-memory DMatrix, one at a time."""
+
+    def __init__(self, chunks: _SpilledChunks, split: str, cache_prefix: str) -> None:
+        self._files = chunks.paths[split]
+        self._next = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._next == len(self._files):
+            return False
+        x_path, y_path = self._files[self._next]
+        input_data(data=np.load(x_path), label=np.load(y_path))
+        self._next += 1
+        return True
+
+    def reset(self) -> None:
+        self._next = 0
+
+
+class _StreamingBinaryMetrics:
+    """Accuracy/precision/recall/F1 at 0.5 and binned ROC AUC, accumulated chunk by chunk."""
+
+    def __init__(self) -> None:
+        self.confusion = np.zeros((2, 2), dtype=np.int64)  # [actual, predicted]
+        self.histograms = np.zeros((2, _AUC_BINS), dtype=np.int64)  # [actual, score bin]
+
+    def update(self, y: np.ndarray, proba: np.ndarray) -> None:
+        y = y.astype(np.intp)
+        np.add.at(self.confusion, (y, (proba > 0.5).astype(np.intp)), 1)
+        bins = np.minimum((proba * _AUC_BINS).astype(np.intp), _AUC_BINS - 1)
+        np.add.at(self.histograms, (y, bins), 1)
+
+    def result(self) -> dict:
+        (tn, fp), (fn, tp) = self.confusion.tolist()
+        n = tn + fp + fn + tp
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        negatives, positives = self.histograms
+        # P(positive scores above negative), counting same-bin pairs as ties.
+        negatives_below = np.cumsum(negatives) - negatives
+        pairs = positives.sum() * negatives.sum()
+        auc = float((positives * (negatives_below + 0.5 * negatives)).sum() / pairs) if pairs else float("nan")
+        return {
+            "accuracy": (tp + tn) / n if n else 0.0,
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "roc_auc": auc,
+            "n": n,
+        }
+
+
+def _booster_params(config: StreamingConfig) -> tuple[dict, int]:
+    params = dict(config.xgb_params)
+    rounds = params.pop("n_estimators")
+    native = {
+        "objective": "binary:logistic",
+        "eval_metric": "logloss",
+        "tree_method": "hist",
+        "seed": config.random_state,
+        "nthread": config.n_jobs,
+        "eta": params.pop("learning_rate"),
+        **params,
+    }
+    return native, rounds
+
+
+def run_streaming_retraining(config: StreamingConfig = StreamingConfig()) -> Path:
+    """Train from `config.dataset_path` in bounded memory and write a model bundle; returns its path."""
+    config.work_dir.mkdir(parents=True, exist_ok=True)
+    work = Path(tempfile.mkdtemp(prefix="streaming-", dir=config.work_dir))
+    try:
+        chunks = _SpilledChunks(work)
+        scaler = StandardScaler()
+        rows = positives = 0
+        for frame in pd.read_csv(config.dataset_path, chunksize=config.chunk_rows):
+            X, y = engineer_training_data(frame)
+            splits = assign_splits(frame["Borrower_ID"], config.random_state)
+            for index, name in enumerate(_SPLITS):
+                chunks.add(name, X[splits == index], y[splits == index])
+            fit_rows = splits != 2
+            if fit_rows.any():
+                scaler.partial_fit(X[fit_rows])
+            rows += len(y)
+            positives += int(y.sum())
+        sizes = {name: sum(len(np.load(y_path, mmap_mode="r")) for _, y_path in chunks.paths[name]) for name in _SPLITS}
+        logger.info(
+            "Streamed %d rows from %s (at-risk rate %.3f): train %d | valid %d | test %d",
+            rows, config.dataset_path, positives / rows, sizes["train"], sizes["valid"], sizes["test"],
+        )
+
+        kmeans = MiniBatchKMeans(n_clusters=config.n_clusters, random_state=config.random_state, n_init=3)
+        for epoch in range(config.kmeans_epochs):
+            for X, _ in chunks.iterate("train", "valid"):
+                if len(X) >= config.n_clusters:
+                    kmeans.partial_fit(scaler.transform(X))
+        previous = get_ml_artifacts()
+        align_with_previous_segments(kmeans, scaler, previous)
+        sums = np.zeros((config.n_clusters, len(FEATURES)))
+        counts = np.zeros(config.n_clusters)
+        for X, _ in chunks.iterate("train", "valid"):
+            segments = kmeans.predict(scaler.transform(X))
+            np.add.at(sums, segments, X)
+            counts += np.bincount(segments, minlength=config.n_clusters)
+        profile = pd.DataFrame(sums / np.maximum(counts, 1)[:, None], columns=FEATURES).round(2)
+        logger.info("=== Segment profiles (for manual naming) ===\n%s", profile)
+
+        params, rounds = _booster_params(config)
+        train_matrix = xgboost.ExtMemQuantileDMatrix(_ChunkIter(chunks, "train", str(work / "xgb-train")))
+        booster = xgboost.train(params, train_matrix, num_boost_round=rounds)
+        booster.feature_names = list(FEATURES)
+        del train_matrix
+        xgb_model = XGBClassifier()
+        xgb_model.load_model(bytearray(booster.save_raw("ubj")))
+
+        metrics = {}
+        for name, label in (("valid", "validation"), ("test", "test")):
+            accumulated = _StreamingBinaryMetrics()
+            for X, y in chunks.iterate(name):
+                accumulated.update(y, booster.inplace_predict(X))
+            metrics[label] = accumulated.result()
+            logger.info("%s: %s", label, json.dumps(metrics[label]))
+
+        bundle_path = write_bundle(
+            config.bundles_dir,
+            xgb_model=xgb_model,
+            scaler_mean=scaler.mean_,
+            scaler_scale=scaler.scale_,
+            kmeans_centers=kmeans.cluster_centers_,
+            segment_names=previous.segment_names,
+            gender_map=previous.gender_map,
+            model_features=FEATURES,
+            segmentation_features=FEATURES,
+            make_current=config.activate,
+        )
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if config.metrics_path is not None:
+        with open(config.metrics_path, "w") as f:
+            json.dump(metrics, f, indent=2)
+    logger.info("Saved model bundle %s (%s)", bundle_path.name, bundle_path)
+    return bundle_path
@@ -1,18 +1,23 @@
-"""Unique borrower ID generation, ported verbatim from the original app."""
-import random
-import string
+"""Unique borrower ID generation, ported from the original app."""
+import secrets
 import time
 
 
 def generate_borrower_id(loan_type: str | None, first_name: str | None, last_name: str | None) -> str:
     """
-    Build a borrower ID in the form `{LOANCODE}-{INITIALS}-{TIMESTAMP}-{HEX4}`.
+    Build a borrower ID in the form `{LOANCODE}-{INITIALS}-{TIMESTAMP}-{HEX12}`.
 
-    Matches the original `generate_borrower_id()` in slrs.py exactly, including
-    its fallbacks ('GEN' for unknown loan type, 'X' for missing name parts).
+    Matches the original `generate_borrower_id()` in slrs.py, including its
+    fallbacks ('GEN' for unknown loan type, 'X' for missing name parts),
+    except for the random suffix. The original's 4 hex digits (65,536
+    values) collide about 8 times in 1,000 IDs minted in the same second,
+    which a batch does, and the result store keeps one result per ID, so
+    a collision overwrote another borrower's result. 12 digits from
+    `secrets` (2^48 values) make that about 1 in 500 million for the same
+    1,000 IDs; `/predict/batch` also regenerates any repeat within a call.
     """
     loan_code = loan_type[:3].upper() if loan_type else "GEN"
     initials = (first_name[0].upper() if first_name else "X") + (last_name[0].upper() if last_name else "X")
     timestamp = str(int(time.time()))
-    random_hex = "".join(random.choices(string.hexdigits.upper(), k=4))
+    random_hex = secrets.token_hex(6).upper()
     return f"{loan_code}-{initials}-{timestamp}-{random_hex}"
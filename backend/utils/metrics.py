@@ -0,0 +1,227 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A deliberately small subset of what `prometheus_client` offers (counters,
+cumulative histograms, scrape-time gauges), so the app needs no extra
+dependency and no metrics service: `Registry.render()` is served as-is at
+`GET /metrics` and any Prometheus-compatible scraper can read it.
+
+Recording is a dict lookup, a `bisect` and a few additions under a lock,
+i.e. around a microsecond. Label values must come from a small fixed set
+(route templates, risk tiers, segment names), never from raw user input.
+
+Worker processes record into their own copy of the registry; after each job
+`Registry.drain()` hands the delta back and the parent `merge`s it, so
+metrics are complete whichever process did the work.
+"""
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+
+# Seconds. Pipeline stages run in tens of microseconds per row; whole
+# requests up to seconds for large batches and merged PDFs.
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1_024, 2_048, 4_096, 8_192, 16_384, 32_768, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], object] = {}
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, per label combination."""
+
+    type_name = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._series[labelvalues] = self._series.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._series.get(labelvalues, 0.0)
+
+    def _drain(self) -> dict:
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def _merge(self, series: dict) -> None:
+        with self._lock:
+            for labelvalues, amount in series.items():
+                self._series[labelvalues] = self._series.get(labelvalues, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        lines = self._header()
+        for labelvalues, value in series:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus their sum and count."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._series.get(labelvalues)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the +Inf bucket last, then the sum.
+                state = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            state = self._series.get(labelvalues)
+            return sum(state[:-1]) if state else 0
+
+    def _drain(self) -> dict:
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def _merge(self, series: dict) -> None:
+        with self._lock:
+            for labelvalues, incoming in series.items():
+                state = self._series.get(labelvalues)
+                if state is None:
+                    self._series[labelvalues] = list(incoming)
+                else:
+                    for i, amount in enumerate(incoming):
+                        state[i] += amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted((labelvalues, list(state)) for labelvalues, state in self._series.items())
+        lines = self._header()
+        for labelvalues, state in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), state[:-1]):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Values read at scrape time from state owned elsewhere (e.g. a cache's
+    own counters), so nothing has to be recorded on the hot path.
+    `read()` returns (label values, value) pairs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Iterable[tuple[Sequence[str], float]]],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.type_name = type_name
+        self._read = read
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for labelvalues, value in self._read():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    """The set of metrics one process exposes."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Iterable[tuple[Sequence[str], float]]],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, read, labelnames, type_name))
+
+    def drain(self) -> dict[str, dict]:
+        """Everything recorded since the last drain, reset to zero (for a worker to hand back)."""
+        drained = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, (Counter, Histogram)):
+                series = metric._drain()
+                if series:
+                    drained[name] = series
+        return drained
+
+    def merge(self, drained: dict[str, dict]) -> None:
+        """Add another process's `drain()` output into this registry."""
+        for name, series in drained.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric._merge(series)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,84 @@
+"""
+Async micro-batching: coalesce concurrent single-item calls into one
+batch call.
+
+Callers `await batcher.submit(key, item)`. While no batch is running, an
+item is dispatched at once, so a lone caller never waits. Otherwise,
+items with the same key are collected until `max_items` have arrived or
+`max_wait_seconds` have passed since the first one. Then
+`run_batch(key, items)` is called once and each caller gets its own
+element of the returned list. Batches run as separate tasks, so the next
+one starts collecting straight away. If the batch call raises, every
+caller in that batch gets the exception.
+
+All state is touched from the event loop thread only, so no locks.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class MicroBatcher:
+    """Batches `submit` calls per key; `on_batch(size)` is told each batch's size."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, list[Any]], Awaitable[list[Any]]],
+        max_items: int,
+        max_wait_seconds: float,
+        on_batch: Callable[[int], None] | None = None,
+    ) -> None:
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        self.max_items = max_items
+        self.max_wait_seconds = max_wait_seconds
+        self._run_batch = run_batch
+        self._on_batch = on_batch
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """Queue `item` for the next batch under `key` and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.max_items or not self._running:
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: Hashable, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        # Callers that gave up (client disconnects) don't need their row scored.
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        if self._on_batch is not None:
+            self._on_batch(len(batch))
+        try:
+            results = await self._run_batch(key, [item for item, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
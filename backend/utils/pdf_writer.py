@@ -0,0 +1,101 @@
+"""
+Minimal PDF serializer for pages whose content streams are already built.
+
+ReportLab's canvas spends most of a one-page document's render time
+serializing its object tree. When the content stream of every page is
+produced directly (see `services.pdf_service`'s report template), the rest
+of the file (fonts, page tree, catalog, cross-reference table) only
+varies in object offsets and lengths, so it is written here with plain
+byte formatting. Only the standard Type 1 fonts are supported, which is
+all ReportLab uses for the reports.
+"""
+import hashlib
+import time
+import zlib
+from collections.abc import Sequence
+
+from reportlab import rl_config
+from reportlab.lib.rl_accel import escapePDF, fp_str
+
+_PRODUCER = b"ReportLab PDF Library - www.reportlab.com"
+
+
+def pdf_text(text: str) -> str:
+    """
+    `text` as the body of a PDF string literal for a WinAnsi-encoded
+    standard font, escaped exactly as ReportLab's canvas does. Raises
+    `UnicodeEncodeError` for characters those fonts can't show.
+    """
+    return escapePDF(text.encode("cp1252"))
+
+
+def _pdf_date() -> bytes:
+    if rl_config.invariant:
+        return b"D:20000101000000+00'00'"
+    return time.strftime("D:%Y%m%d%H%M%S+00'00'", time.gmtime()).encode()
+
+
+class PdfWriter:
+    """
+    Serializes documents of same-sized pages drawn with the given standard
+    fonts, which content streams refer to as /F1, /F2, ... in order.
+    """
+
+    def __init__(self, page_size: tuple[float, float], fonts: Sequence[str]) -> None:
+        self._media_box = f"[ 0 0 {fp_str(*page_size)} ]".encode()
+        self._font_objects = [
+            f"<< /BaseFont /{name} /Encoding /WinAnsiEncoding /Name /F{i} /Subtype /Type1 /Type /Font >>".encode()
+            for i, name in enumerate(fonts, start=1)
+        ]
+
+    def render(self, page_streams: Sequence[bytes]) -> bytes:
+        """One PDF with a page per content stream (uncompressed PDF operators)."""
+        # Object numbers: fonts, font resource dict, catalog, info, page tree, then page/contents pairs.
+        n_fonts = len(self._font_objects)
+        font_dict_id = n_fonts + 1
+        catalog_id, info_id, pages_id = font_dict_id + 1, font_dict_id + 2, font_dict_id + 3
+        page_ids = [pages_id + 1 + 2 * i for i in range(len(page_streams))]
+
+        date = _pdf_date()
+        objects = list(self._font_objects)
+        objects.append(
+            b"<< " + b" ".join(b"/F%d %d 0 R" % (i, i) for i in range(1, n_fonts + 1)) + b" >>"
+        )
+        objects.append(b"<< /PageMode /UseNone /Pages %d 0 R /Type /Catalog >>" % pages_id)
+        objects.append(
+            b"<< /CreationDate (" + date + b") /ModDate (" + date + b") /Producer (" + _PRODUCER + b") >>"
+        )
+        objects.append(
+            b"<< /Count %d /Kids [ %s ] /Type /Pages >>"
+            % (len(page_ids), b" ".join(b"%d 0 R" % page_id for page_id in page_ids))
+        )
+        digest = hashlib.md5(date)
+        for page_id, stream in zip(page_ids, page_streams):
+            objects.append(
+                b"<< /Contents %d 0 R /MediaBox %s /Parent %d 0 R /Resources << /Font %d 0 R "
+                b"/ProcSet [ /PDF /Text ] >> /Rotate 0 /Type /Page >>"
+                % (page_id + 1, self._media_box, pages_id, font_dict_id)
+            )
+            compressed = zlib.compress(stream)
+            digest.update(compressed)
+            objects.append(
+                b"<< /Filter /FlateDecode /Length %d >>\nstream\n" % len(compressed) + compressed + b"\nendstream"
+            )
+
+        parts = [b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n"]
+        offsets = []
+        position = len(parts[0])
+        for object_id, body in enumerate(objects, start=1):
+            offsets.append(position)
+            chunk = b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+            parts.append(chunk)
+            position += len(chunk)
+
+        file_id = digest.hexdigest().encode()
+        parts.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        parts.append(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+        parts.append(
+            b"trailer\n<< /ID [<%s><%s>] /Info %d 0 R /Root %d 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n"
+            % (file_id, file_id, info_id, catalog_id, len(objects) + 1, position)
+        )
+        return b"".join(parts)
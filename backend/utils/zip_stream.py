@@ -0,0 +1,52 @@
+"""
+Incremental ZIP writer for streamed downloads.
+
+`zipfile` normally seeks back to patch each member's header once its size
+is known. Given a sink that can `tell` but not `seek`, it instead writes a
+data descriptor after each member, so every member's bytes are final as
+soon as it is added and can be sent right away. Only the central
+directory has to wait for `close`.
+"""
+import zipfile
+
+
+class _DrainableSink:
+    """Write-only, non-seekable byte sink that hands back what was written."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """Build a ZIP archive member by member, returning the new bytes after each step."""
+
+    def __init__(self, compression: int = zipfile.ZIP_STORED) -> None:
+        self._sink = _DrainableSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """Append one member; returns the archive bytes it produced."""
+        self._zip.writestr(name, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory; returns the archive's final bytes."""
+        self._zip.close()
+        return self._sink.drain()